@@ -0,0 +1,9 @@
+# benchmarks/__init__.py
+"""
+Offline benchmark harness for the strmgen pipeline.
+
+A synthetic catalog is served by local stand-ins for Dispatcharr, TMDb,
+Emby and OpenSubtitles, the real pipeline runs against them in a child
+process, and throughput figures are appended to a results file so runs
+can be compared over time. Entry point: ``python -m benchmarks.run``.
+"""
@@ -0,0 +1,121 @@
+# benchmarks/_child.py
+"""
+Runs one pipeline pass against the mocks; started by ``benchmarks.run``.
+
+Usage: STRMGEN_CONFIG=<workdir>/config.json python -m benchmarks._child <workdir>
+
+Reads ``bench.json`` from the work directory and writes ``child.json``
+with timings, stream outcomes and peak RSS next to it.
+"""
+import asyncio
+import json
+import resource
+import sys
+import time
+
+from pathlib import Path
+from typing import Any, Dict
+
+# tables holding per-run state; emptied before a cold run
+_STATE_TABLES = (
+    "skipped_streams",
+    "stream_state",
+    "pipeline_runs",
+    "run_checkpoints",
+    "run_completed_streams",
+    "tmdb_cache",
+    "tmdb_not_found",
+)
+
+
+def _point_clients_at_mocks(bench: Dict[str, Any]) -> None:
+    from strmgen.core import clients
+
+    # TMDb endpoints are constants in strmgen.core.clients, not settings
+    clients.tmdb_client.base_url = f"{bench['tmdb']}/3"
+    clients.tmdb_image_client.base_url = f"{bench['tmdb_image']}/t/p"
+
+    if bench.get("opensubtitles"):
+        from opensubtitlescom import OpenSubtitles
+        from strmgen.services import subtitles
+
+        client = OpenSubtitles("strmgen-bench", "bench")
+        client.base_url = f"{bench['opensubtitles']}/api/v1"
+        client.login("bench", "bench")
+        subtitles.sub_client = client
+
+
+async def _reset_state() -> None:
+    from strmgen.core.db import get_pg_pool
+
+    pool = await get_pg_pool()
+    await pool.execute(f"TRUNCATE {', '.join(_STATE_TABLES)}")
+
+
+async def _drain(baseline: set, timeout: float) -> bool:
+    """Wait for fire-and-forget tasks (artwork, subtitles) started by the run."""
+    deadline = time.monotonic() + timeout
+    me = asyncio.current_task()
+    while True:
+        pending = [t for t in asyncio.all_tasks() if t is not me and t not in baseline and not t.done()]
+        remaining = deadline - time.monotonic()
+        if not pending:
+            return True
+        if remaining <= 0:
+            return False
+        await asyncio.wait(pending, timeout=remaining)
+
+
+def _stream_outcomes() -> Dict[str, Dict[str, int]]:
+    from strmgen.core.metrics import STREAMS
+
+    out: Dict[str, Dict[str, int]] = {}
+    for metric in STREAMS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_total"):
+                cat = sample.labels["category"]
+                out.setdefault(cat, {})[sample.labels["outcome"]] = int(sample.value)
+    return out
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _run(workdir: Path) -> Dict[str, Any]:
+    bench = json.loads((workdir / "bench.json").read_text())
+    _point_clients_at_mocks(bench)
+
+    from strmgen.main import app, lifespan
+    from strmgen.pipeline import runner
+
+    async with lifespan(app):
+        if bench.get("cold", True):
+            await _reset_state()
+        baseline = set(asyncio.all_tasks())
+        started = time.perf_counter()
+        runner.start_background_run()
+        await runner.processor_task
+        pipeline_s = time.perf_counter() - started
+        drained = await _drain(baseline, bench.get("drain_timeout", 300))
+        total_s = time.perf_counter() - started
+
+    return {
+        "pipeline_seconds": round(pipeline_s, 3),
+        "total_seconds": round(total_s, 3),
+        "drained": drained,
+        "streams": _stream_outcomes(),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    workdir = Path(sys.argv[1])
+    result = asyncio.run(_run(workdir))
+    (workdir / "child.json").write_text(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+# benchmarks/catalog.py
+"""
+Synthetic catalog generator.
+
+Builds a deterministic set of Dispatcharr groups/streams (movies, TV
+episodes, 24/7 channels) together with the TMDb records they should match.
+A fraction of the stream names is distorted the way real IPTV playlists
+are (language prefixes, quality tags, dotted names, upper case, typos,
+missing years) so that matching cost and miss rate look realistic.
+"""
+import hashlib
+import random
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+# Tags added as name noise; the benchmark config lists them in
+# ``remove_strings`` like a real deployment would
+NOISE_PREFIXES = ["EN - ", "UK| ", "[4K] "]
+NOISE_SUFFIXES = [" 1080p", " HD", " MULTI"]
+NOISE_TAGS = [*NOISE_PREFIXES, *NOISE_SUFFIXES]
+
+_ADJECTIVES = [
+    "Silent", "Broken", "Golden", "Hidden", "Last", "Dark", "Crimson", "Frozen",
+    "Lost", "Wild", "Bright", "Hollow", "Iron", "Savage", "Quiet", "Burning",
+    "Endless", "Secret", "Shattered", "Distant", "Electric", "Final", "Fallen",
+    "Northern", "Scarlet", "Wicked", "Lonely", "Midnight", "Eternal", "Velvet",
+]
+_NOUNS = [
+    "River", "Kingdom", "Signal", "Harbor", "Empire", "Garden", "Protocol",
+    "Horizon", "Witness", "Machine", "Legacy", "Frontier", "Orchard", "Voyage",
+    "Shadow", "Station", "Mirror", "Covenant", "Summit", "Tide", "Circuit",
+    "Lantern", "Archive", "Canyon", "Paradox", "Citadel", "Meridian", "Ember",
+    "Outpost", "Sanctuary",
+]
+_SEQUELS = ["II", "III", "Returns", "Reborn", "Rising", "Origins"]
+_CHANNEL_THEMES = ["Classics", "Comedy", "Cartoons", "Sitcoms", "Westerns", "Sci-Fi", "Docs"]
+
+
+@dataclass(frozen=True)
+class CatalogSpec:
+    movies:        int   = 1000
+    shows:         int   = 50
+    seasons:       int   = 3
+    episodes:      int   = 10
+    channels_24_7: int   = 20
+    movie_groups:  int   = 2
+    tv_groups:     int   = 1
+    name_noise:    float = 0.2    # fraction of names that get distorted
+    decoys:        float = 0.5    # extra TMDb-only titles per real title
+    seed:          int   = 42
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Catalog:
+    spec:    CatalogSpec
+    # group name → raw Dispatcharr stream dicts, ordered by name
+    streams: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    # TMDb records keyed by id (movies and shows are separate id spaces)
+    movies:  Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    shows:   Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    seasons: Dict[Tuple[int, int], Dict[str, Any]] = field(default_factory=dict)
+    # stream id → id of the TMDb movie or show it should match
+    matches: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def groups(self) -> List[str]:
+        return list(self.streams)
+
+    @property
+    def stream_count(self) -> int:
+        return sum(len(v) for v in self.streams.values())
+
+    def streams_by_id(self) -> Dict[int, Dict[str, Any]]:
+        return {s["id"]: s for items in self.streams.values() for s in items}
+
+
+# ─── Name noise ───────────────────────────────────────────────────────────────
+def _typo(rng: random.Random, title: str) -> str:
+    words = title.split(" ")
+    idx = [i for i, w in enumerate(words) if len(w) > 3]
+    if not idx:
+        return title
+    i = rng.choice(idx)
+    w = words[i]
+    j = rng.randrange(1, len(w) - 2)
+    words[i] = w[:j] + w[j + 1] + w[j] + w[j + 2:]
+    return " ".join(words)
+
+
+_NOISES: List[Callable[[random.Random, str], str]] = [
+    lambda rng, t: rng.choice(NOISE_PREFIXES) + t,
+    lambda rng, t: t + rng.choice(NOISE_SUFFIXES),
+    lambda rng, t: t.replace(" ", "."),
+    lambda rng, t: t.upper(),
+    _typo,
+]
+
+
+def _noisy(rng: random.Random, title: str, rate: float) -> str:
+    if rng.random() >= rate:
+        return title
+    for fn in rng.sample(_NOISES, k=rng.choice((1, 1, 2))):
+        title = fn(rng, title)
+    return title
+
+
+# ─── Builders ─────────────────────────────────────────────────────────────────
+class _Titles:
+    """Unique, readable titles drawn from a seeded RNG."""
+
+    def __init__(self, rng: random.Random):
+        self._rng = rng
+        self._seen: set[str] = set()
+
+    def next(self) -> str:
+        rng = self._rng
+        for _ in range(50):
+            shape = rng.randrange(3)
+            if shape == 0:
+                title = f"The {rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)}"
+            elif shape == 1:
+                title = f"{rng.choice(_NOUNS)} of the {rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)}"
+            else:
+                title = f"{rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)}"
+            if title not in self._seen:
+                break
+            title = f"{title} {rng.choice(_SEQUELS)}"
+            if title not in self._seen:
+                break
+        else:
+            title = f"{title} {len(self._seen)}"
+        self._seen.add(title)
+        return title
+
+
+def _stream(sid: int, name: str, group_id: int, updated: str) -> Dict[str, Any]:
+    digest = hashlib.sha1(str(sid).encode()).hexdigest()
+    return {
+        "id":                sid,
+        "name":              name,
+        "url":               f"http://upstream.invalid/live/{sid}.ts",
+        "m3u_account":       1,
+        "logo_url":          "",
+        "tvg_id":            "",
+        "local_file":        None,
+        "current_viewers":   0,
+        "updated_at":        updated,
+        "stream_profile_id": None,
+        "is_custom":         False,
+        "channel_group":     group_id,
+        "stream_hash":       digest[:32],
+    }
+
+
+def _ratings(rng: random.Random) -> Dict[str, Any]:
+    # roughly one in five titles falls below the default thresholds
+    return {
+        "popularity":   round(rng.lognormvariate(2.0, 1.0), 3),
+        "vote_average": round(rng.uniform(3.0, 9.0), 1),
+        "vote_count":   int(rng.lognormvariate(5.0, 1.5)),
+    }
+
+
+def generate_catalog(spec: CatalogSpec) -> Catalog:
+    rng = random.Random(spec.seed)
+    titles = _Titles(rng)
+    cat = Catalog(spec=spec)
+    updated = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    next_sid = 1
+    next_gid = 1
+
+    # ── Movies ──
+    movie_groups = [f"Movies-{i + 1:02d}" for i in range(spec.movie_groups if spec.movies else 0)]
+    for g in movie_groups:
+        cat.streams[g] = []
+    next_mid = 100
+    for i in range(spec.movies):
+        title = titles.next()
+        year = rng.randint(1985, 2024)
+        mid = next_mid
+        next_mid += 1
+        cat.movies[mid] = _movie(mid, title, year, rng)
+        # TMDb-only look-alikes the matcher has to rank below the real one
+        while rng.random() < spec.decoys:
+            alt_year = year + rng.choice((-30, -12, -3, 4, 9))
+            alt_title = title if rng.random() < 0.5 else f"{title} {rng.choice(_SEQUELS)}"
+            cat.movies[next_mid] = _movie(next_mid, alt_title, alt_year, rng)
+            next_mid += 1
+
+        name = _noisy(rng, title, spec.name_noise)
+        if rng.random() < spec.name_noise / 4:
+            display = name                     # year missing
+        else:
+            display = f"{name} ({year})"
+        group = movie_groups[i % len(movie_groups)]
+        cat.streams[group].append(_stream(next_sid, display, next_gid + movie_groups.index(group), updated))
+        cat.matches[next_sid] = mid
+        next_sid += 1
+    next_gid += len(movie_groups)
+
+    # ── TV ──
+    tv_groups = [f"Series-{i + 1:02d}" for i in range(spec.tv_groups if spec.shows else 0)]
+    for g in tv_groups:
+        cat.streams[g] = []
+    next_tid = 100
+    for i in range(spec.shows):
+        title = titles.next()
+        tid = next_tid
+        next_tid += 1
+        first_air = rng.randint(1990, 2022)
+        cat.shows[tid] = _show(tid, title, first_air, spec.seasons, rng)
+        while rng.random() < spec.decoys:
+            cat.shows[next_tid] = _show(next_tid, f"{title} {rng.choice(_SEQUELS)}", first_air + rng.randint(1, 15), 1, rng)
+            next_tid += 1
+        for season in range(1, spec.seasons + 1):
+            cat.seasons[(tid, season)] = _season(tid, season, spec.episodes, first_air + season - 1, rng)
+
+        # noise is per show so every episode of a show carries the same name
+        name = _noisy(rng, title, spec.name_noise)
+        group = tv_groups[i % len(tv_groups)]
+        gid = next_gid + tv_groups.index(group)
+        for season in range(1, spec.seasons + 1):
+            for ep in range(1, spec.episodes + 1):
+                cat.streams[group].append(_stream(next_sid, f"{name} S{season:02d}E{ep:02d}", gid, updated))
+                cat.matches[next_sid] = tid
+                next_sid += 1
+    next_gid += len(tv_groups)
+
+    # ── 24/7 ──
+    if spec.channels_24_7:
+        group = "24/7 Channels"
+        cat.streams[group] = []
+        for i in range(spec.channels_24_7):
+            name = f"24/7 {rng.choice(_CHANNEL_THEMES)} {titles.next()}"
+            cat.streams[group].append(_stream(next_sid, name, next_gid, updated))
+            next_sid += 1
+
+    for items in cat.streams.values():
+        items.sort(key=lambda s: s["name"])
+    return cat
+
+
+def _movie(mid: int, title: str, year: int, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id":                mid,
+        "title":             title,
+        "original_title":    title,
+        "overview":          f"{title} is a synthetic benchmark film.",
+        "release_date":      f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "adult":             False,
+        "video":             False,
+        "original_language": "en",
+        "genres":            [{"id": 18, "name": "Drama"}],
+        "poster_path":       f"/m{mid}p.jpg",
+        "backdrop_path":     f"/m{mid}b.jpg",
+        "imdb_id":           f"tt{mid:07d}",
+        **_ratings(rng),
+    }
+
+
+def _show(tid: int, title: str, first_air: int, seasons: int, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id":                tid,
+        "name":              title,
+        "original_name":     title,
+        "overview":          f"{title} is a synthetic benchmark series.",
+        "first_air_date":    f"{first_air}-{rng.randint(1, 12):02d}-01",
+        "adult":             False,
+        "original_language": "en",
+        "origin_country":    ["US"],
+        "genres":            [{"id": 18, "name": "Drama"}],
+        "poster_path":       f"/t{tid}p.jpg",
+        "backdrop_path":     f"/t{tid}b.jpg",
+        "number_of_seasons": seasons,
+        "seasons":           [{"season_number": n, "name": f"Season {n}"} for n in range(1, seasons + 1)],
+        "external_ids":      {"imdb_id": f"tt9{tid:06d}"},
+        **_ratings(rng),
+    }
+
+
+def _season(tid: int, season: int, episodes: int, year: int, rng: random.Random) -> Dict[str, Any]:
+    sid = tid * 1000 + season
+    return {
+        "id":            sid,
+        "name":          f"Season {season}",
+        "overview":      "",
+        "air_date":      f"{year}-09-01",
+        "season_number": season,
+        "poster_path":   f"/s{sid}.jpg",
+        "vote_average":  round(rng.uniform(5.0, 9.0), 1),
+        "episodes": [
+            {
+                "id":              sid * 100 + ep,
+                "name":            f"Episode {ep}",
+                "overview":        "",
+                "air_date":        f"{year}-09-{min(ep, 28):02d}",
+                "season_number":   season,
+                "episode_number":  ep,
+                "production_code": "",
+                "runtime":         45,
+                "still_path":      f"/e{sid * 100 + ep}.jpg",
+                "vote_average":    round(rng.uniform(5.0, 9.0), 1),
+                "vote_count":      rng.randint(1, 500),
+                "crew":            [],
+                "guest_stars":     [],
+            }
+            for ep in range(1, episodes + 1)
+        ],
+    }
+
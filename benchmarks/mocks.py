@@ -0,0 +1,441 @@
+# benchmarks/mocks.py
+"""
+Local stand-ins for the upstream services the pipeline talks to.
+
+Each mock is a small FastAPI app served by uvicorn on a background thread.
+Every mock counts the calls it receives per route. You can configure
+latency, and for data endpoints you can inject 429 responses.
+"""
+import asyncio
+import json
+import random
+import re
+import socket
+import threading
+import time
+import zlib
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from starlette.routing import Match
+
+from benchmarks.catalog import Catalog
+
+_NOT_FOUND = {
+    "success": False,
+    "status_code": 34,
+    "status_message": "The resource you requested could not be found.",
+}
+
+
+@dataclass(frozen=True)
+class MockProfile:
+    latency_ms:    float = 20.0
+    jitter_ms:     float = 10.0
+    throttle_rate: float = 0.0    # share of data requests answered with 429
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latency_ms": self.latency_ms,
+            "jitter_ms": self.jitter_ms,
+            "throttle_rate": self.throttle_rate,
+        }
+
+
+class CallStats:
+    """Per-route request and status counters of one mock."""
+
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+
+    def record(self, route: str, status: int) -> None:
+        self.calls[route] += 1
+        self.statuses[status] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "throttled": self.statuses.get(429, 0),
+            "calls": dict(self.calls.most_common()),
+        }
+
+
+def _json(payload: Any, status_code: int = 200) -> Response:
+    # json.dumps is several times faster than FastAPI's encoder on large pages
+    return Response(json.dumps(payload), status_code=status_code, media_type="application/json")
+
+
+def _etagged(request: Request, payload: Any) -> Response:
+    """200 with an ETag, or 304 when the client already holds this body."""
+    body = json.dumps(payload)
+    etag = f'"{zlib.crc32(body.encode()):08x}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+def _instrument(app: FastAPI, profile: MockProfile, stats: CallStats, exempt: Iterable[str] = ()) -> None:
+    """Add latency, 429 injection and call counting to every route of ``app``."""
+    exempt = set(exempt)
+
+    def _route_path(scope: Dict[str, Any]) -> str:
+        for route in app.router.routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return getattr(route, "path", scope["path"])
+        return scope["path"]
+
+    @app.middleware("http")
+    async def _behaviour(request: Request, call_next):
+        route = _route_path(request.scope)
+        delay = profile.latency_ms + random.uniform(-profile.jitter_ms, profile.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if route not in exempt and profile.throttle_rate and random.random() < profile.throttle_rate:
+            response = _json({"status_message": "Request count over limit."}, 429)
+            response.headers["Retry-After"] = "1"
+        else:
+            response = await call_next(request)
+        stats.record(route, response.status_code)
+        return response
+
+
+# ─── Dispatcharr ──────────────────────────────────────────────────────────────
+def dispatcharr_app(cat: Catalog, profile: MockProfile, stats: CallStats) -> FastAPI:
+    app = FastAPI(openapi_url=None)
+    by_id = cat.streams_by_id()
+    everything = [s for items in cat.streams.values() for s in items]
+
+    @app.post("/api/accounts/token/")
+    async def token():
+        return _json({"access": "bench-access", "refresh": "bench-refresh", "expires_in": 3600})
+
+    @app.get("/api/channels/streams/groups/")
+    async def groups():
+        return _json(cat.groups)
+
+    @app.get("/api/channels/streams/")
+    async def streams(
+        request: Request,
+        page: int = 1,
+        page_size: int = 100,
+        channel_group: Optional[str] = None,
+    ):
+        items = cat.streams.get(channel_group, []) if channel_group else everything
+        start = (page - 1) * page_size
+        if page < 1 or (page > 1 and start >= len(items)):
+            return _json({"detail": "Invalid page."}, 404)
+        end = start + page_size
+        return _json({
+            "count": len(items),
+            "next": str(request.url.include_query_params(page=page + 1)) if end < len(items) else None,
+            "previous": str(request.url.include_query_params(page=page - 1)) if page > 1 else None,
+            "results": items[start:end],
+        })
+
+    @app.get("/api/channels/streams/{stream_id}/")
+    async def stream(stream_id: int):
+        item = by_id.get(stream_id)
+        return _json(item) if item else _json({"detail": "Not found."}, 404)
+
+    _instrument(app, profile, stats, exempt={"/api/accounts/token/"})
+    return app
+
+
+# ─── TMDb ─────────────────────────────────────────────────────────────────────
+_TOKEN_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.split(text.lower()) if t]
+
+
+class _SearchIndex:
+    """Token → ids index answering TMDb-style title searches."""
+
+    def __init__(self, records: Dict[int, Dict[str, Any]], title_key: str, date_key: str):
+        self._records = records
+        self._title_key = title_key
+        self._date_key = date_key
+        self._index: Dict[str, set[int]] = {}
+        for rid, rec in records.items():
+            for tok in set(_tokens(rec[title_key])):
+                self._index.setdefault(tok, set()).add(rid)
+
+    def search(self, query: str, year: Optional[int] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        toks = _tokens(query)
+        if not toks:
+            return []
+        sets = sorted((self._index.get(t, set()) for t in set(toks)), key=len)
+        ids = set(sets[0]).intersection(*sets[1:])
+        wanted = " ".join(toks)
+        hits = []
+        for rid in ids:
+            rec = self._records[rid]
+            if year and not rec[self._date_key].startswith(str(year)):
+                continue
+            exact = " ".join(_tokens(rec[self._title_key])) == wanted
+            hits.append((not exact, -rec["popularity"], rid))
+        hits.sort()
+        return [_summary(self._records[rid]) for _, _, rid in hits[:limit]]
+
+
+_SUMMARY_KEYS = (
+    "id", "title", "original_title", "name", "original_name", "overview",
+    "release_date", "first_air_date", "poster_path", "backdrop_path",
+    "popularity", "vote_average", "vote_count", "adult", "original_language",
+)
+
+
+def _summary(rec: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: rec[k] for k in _SUMMARY_KEYS if k in rec}
+
+
+def _appendix(section: str, rid: int) -> Any:
+    """Filler for ``append_to_response`` sections, sized like typical TMDb replies."""
+    if section == "credits":
+        return {
+            "cast": [
+                {"id": rid * 100 + i, "name": f"Actor {i}", "character": f"Role {i}",
+                 "order": i, "profile_path": f"/p{rid}_{i}.jpg"}
+                for i in range(15)
+            ],
+            "crew": [
+                {"id": rid * 100 + 50 + i, "name": f"Crew {i}", "job": "Producer",
+                 "department": "Production", "profile_path": None}
+                for i in range(10)
+            ],
+        }
+    if section == "images":
+        return {
+            kind: [{"file_path": f"/{kind[0]}{rid}_{i}.jpg", "width": 1920, "height": 1080,
+                    "vote_average": 5.0, "iso_639_1": "en"} for i in range(8)]
+            for kind in ("backdrops", "posters", "logos")
+        }
+    if section == "external_ids":
+        return {"imdb_id": f"tt{rid:07d}", "wikidata_id": None, "facebook_id": None}
+    return {
+        "results": [
+            {"id": rid * 10 + i, "name": f"{section} {i}", "iso_639_1": "en"}
+            for i in range(5)
+        ]
+    }
+
+
+def tmdb_app(cat: Catalog, profile: MockProfile, stats: CallStats) -> FastAPI:
+    app = FastAPI(openapi_url=None)
+    movies = _SearchIndex(cat.movies, "title", "release_date")
+    shows = _SearchIndex(cat.shows, "name", "first_air_date")
+
+    def _page(request: Request, results: List[Dict[str, Any]]) -> Response:
+        return _etagged(request, {"page": 1, "results": results, "total_pages": 1, "total_results": len(results)})
+
+    def _detail(request: Request, rec: Optional[Dict[str, Any]], append_to_response: str) -> Response:
+        if not rec:
+            return _json(_NOT_FOUND, 404)
+        out = dict(rec)
+        for section in filter(None, append_to_response.split(",")):
+            out.setdefault(section, _appendix(section, rec["id"]))
+        return _etagged(request, out)
+
+    @app.get("/3/search/movie")
+    async def search_movie(request: Request, query: str = "", year: Optional[int] = None):
+        return _page(request, movies.search(query, year))
+
+    @app.get("/3/search/tv")
+    async def search_tv(request: Request, query: str = ""):
+        return _page(request, shows.search(query))
+
+    @app.get("/3/search/multi")
+    async def search_multi(request: Request, query: str = ""):
+        results = [{**r, "media_type": "movie"} for r in movies.search(query, limit=10)]
+        results += [{**r, "media_type": "tv"} for r in shows.search(query, limit=10)]
+        return _page(request, results)
+
+    @app.get("/3/movie/{movie_id}")
+    async def movie(request: Request, movie_id: int, append_to_response: str = ""):
+        return _detail(request, cat.movies.get(movie_id), append_to_response)
+
+    @app.get("/3/tv/{tv_id}")
+    async def tv(request: Request, tv_id: int, append_to_response: str = ""):
+        rec = cat.shows.get(tv_id)
+        if rec:
+            # like TMDb: "season/N" sections embed whole seasons, 20 sections at most
+            sections = append_to_response.split(",")[:20]
+            append_to_response = ",".join(sections)
+            seasons = {
+                s: cat.seasons[(tv_id, int(s.split("/", 1)[1]))]
+                for s in sections
+                if s.startswith("season/") and s[7:].isdigit() and (tv_id, int(s[7:])) in cat.seasons
+            }
+            rec = {**rec, **seasons}
+        return _detail(request, rec, append_to_response)
+
+    @app.get("/3/tv/{tv_id}/season/{season}")
+    async def season(request: Request, tv_id: int, season: int, append_to_response: str = ""):
+        return _detail(request, cat.seasons.get((tv_id, season)), append_to_response)
+
+    @app.get("/3/tv/{tv_id}/season/{season}/episode/{episode}")
+    async def episode(request: Request, tv_id: int, season: int, episode: int):
+        data = cat.seasons.get((tv_id, season))
+        for ep in (data or {}).get("episodes", []):
+            if ep["episode_number"] == episode:
+                return _etagged(request, ep)
+        return _json(_NOT_FOUND, 404)
+
+    _instrument(app, profile, stats)
+    return app
+
+
+def tmdb_image_app(profile: MockProfile, stats: CallStats, image_kb: int = 32) -> FastAPI:
+    app = FastAPI(openapi_url=None)
+    # a JPEG SOI marker followed by filler is enough for the pipeline
+    body = b"\xff\xd8\xff\xe0" + bytes(image_kb * 1024 - 4)
+
+    @app.get("/t/p/{size}/{image}")
+    async def image(size: str, image: str):
+        return Response(body, media_type="image/jpeg")
+
+    _instrument(app, profile, stats)
+    return app
+
+
+# ─── Emby ─────────────────────────────────────────────────────────────────────
+def emby_app(profile: MockProfile, stats: CallStats, hit_rate: float = 0.0) -> FastAPI:
+    app = FastAPI(openapi_url=None)
+
+    @app.get("/emby/Items")
+    async def items(SearchTerm: str = "", IncludeItemTypes: str = "Movie"):
+        # deterministic per title so repeated runs see the same library
+        digest = zlib.crc32(SearchTerm.encode())
+        owned = digest % 1000 < hit_rate * 1000
+        found = [{"Id": str(digest), "Name": SearchTerm, "Type": IncludeItemTypes}] if owned else []
+        return _json({"Items": found, "TotalRecordCount": len(found)})
+
+    @app.post("/emby/Items/{item_id}/Refresh")
+    async def refresh(item_id: str):
+        return Response(status_code=204)
+
+    _instrument(app, profile, stats)
+    return app
+
+
+# ─── OpenSubtitles ────────────────────────────────────────────────────────────
+_SRT = b"1\n00:00:01,000 --> 00:00:04,000\nSynthetic benchmark subtitle.\n\n"
+
+
+def opensubtitles_app(profile: MockProfile, stats: CallStats) -> FastAPI:
+    app = FastAPI(openapi_url=None)
+
+    @app.post("/api/v1/login")
+    async def login():
+        return _json({"token": "bench-token", "status": 200, "user": {"allowed_downloads": 10**9}})
+
+    @app.get("/api/v1/subtitles")
+    async def subtitles(request: Request):
+        file_id = zlib.crc32(str(request.query_params).encode()) % 10**8
+        return _json({
+            "total_pages": 1, "total_count": 1, "per_page": 60, "page": 1,
+            "data": [{
+                "id": str(file_id),
+                "type": "subtitle",
+                "attributes": {
+                    "language": "en",
+                    "download_count": 100,
+                    "files": [{"file_id": file_id, "file_name": f"{file_id}.srt"}],
+                },
+            }],
+        })
+
+    @app.post("/api/v1/download")
+    async def download(request: Request):
+        body = await request.json()
+        file_id = body.get("file_id")
+        link = str(request.url_for("subtitle_file", file_id=file_id))
+        return _json({"link": link, "file_name": f"{file_id}.srt", "remaining": 10**9, "requests": 1})
+
+    @app.get("/api/v1/files/{file_id}", name="subtitle_file")
+    async def subtitle_file(file_id: int):
+        return Response(_SRT, media_type="application/x-subrip")
+
+    _instrument(app, profile, stats, exempt={"/api/v1/login"})
+    return app
+
+
+# ─── Serving ──────────────────────────────────────────────────────────────────
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+class MockServer:
+    """Runs one mock app with uvicorn on a daemon thread."""
+
+    def __init__(self, name: str, app: FastAPI, stats: CallStats, host: str = "127.0.0.1"):
+        self.name = name
+        self.stats = stats
+        self.host = host
+        self.port = _free_port(host)
+        self._server = uvicorn.Server(uvicorn.Config(
+            app, host=host, port=self.port,
+            log_level="warning", access_log=False, lifespan="off",
+        ))
+        self._thread = threading.Thread(target=self._server.run, name=f"mock-{name}", daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 10.0) -> "MockServer":
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError(f"mock {self.name} failed to start on {self.url}")
+            time.sleep(0.02)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def start_mocks(
+    cat: Catalog,
+    profile: MockProfile,
+    emby_hit_rate: float = 0.0,
+    image_kb: int = 32,
+) -> Dict[str, MockServer]:
+    """Start every mock and return them keyed by upstream name."""
+    servers: Dict[str, MockServer] = {}
+    builders = {
+        "dispatcharr":   lambda st: dispatcharr_app(cat, profile, st),
+        "tmdb":          lambda st: tmdb_app(cat, profile, st),
+        "tmdb_image":    lambda st: tmdb_image_app(profile, st, image_kb),
+        "emby":          lambda st: emby_app(profile, st, emby_hit_rate),
+        "opensubtitles": lambda st: opensubtitles_app(profile, st),
+    }
+    try:
+        for name, build in builders.items():
+            stats = CallStats()
+            servers[name] = MockServer(name, build(stats), stats).start()
+    except Exception:
+        stop_mocks(servers)
+        raise
+    return servers
+
+
+def stop_mocks(servers: Dict[str, MockServer]) -> None:
+    for server in servers.values():
+        server.stop()
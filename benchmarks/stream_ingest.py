@@ -0,0 +1,164 @@
+# benchmarks/stream_ingest.py
+"""
+Dispatcharr page ingest micro-benchmark.
+
+Decodes and parses listing pages the way ``iter_stream_pages`` did before
+(``json.loads`` on the text, ``DispatcharrStream.from_dict`` per item with
+``strptime``) and the way it does now (``fastjson.loads`` on the bytes,
+then ``_parse_page``: one ``DispatcharrStream.from_page`` pass that frees
+each item as it goes), and reports CPU time per stream and peak memory
+per page for each.
+
+    python -m benchmarks.stream_ingest
+    python -m benchmarks.stream_ingest --pages 20 --type tv
+"""
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+# the models read the settings on import; any valid config will do
+os.environ.setdefault("STRMGEN_CONFIG", str(ROOT / "config.base.json"))
+
+from benchmarks.catalog import CatalogSpec, generate_catalog  # noqa: E402
+from strmgen.core import fastjson  # noqa: E402
+from strmgen.core.string_utils import clean_name  # noqa: E402
+from strmgen.core.models.regex import RE_EPISODE_TAG, TITLE_YEAR_RE  # noqa: E402
+from strmgen.core.models.dispatcharr import DispatcharrStream  # noqa: E402
+from strmgen.core.models.enums import MediaType  # noqa: E402
+from strmgen.services.streams import _parse_page  # noqa: E402
+
+PAGE_SIZE = 1000
+
+
+def pages(count: int, media: MediaType, seed: int) -> List[bytes]:
+    """``count`` listing pages of catalog streams, serialized like Dispatcharr sends them."""
+    spec = CatalogSpec(
+        movies=count * PAGE_SIZE if media is MediaType.MOVIE else 1,
+        shows=count * PAGE_SIZE // 30 + 1 if media is MediaType.TV else 1,
+        seasons=3, episodes=10, channels_24_7=0, decoys=0, seed=seed,
+    )
+    cat = generate_catalog(spec)
+    prefix = "Movies" if media is MediaType.MOVIE else "Series"
+    items = [s for g, streams in cat.streams.items() if g.startswith(prefix) for s in streams]
+    out = []
+    for i in range(count):
+        chunk = items[i * PAGE_SIZE:(i + 1) * PAGE_SIZE]
+        out.append(json.dumps({"count": len(items), "next": None, "results": chunk}).encode())
+    return out
+
+
+def legacy_from_dict(data: Dict[str, Any], group: str, media: MediaType) -> Optional[DispatcharrStream]:
+    """from_dict as it was: fields copied one by one, strptime with two formats per item."""
+    raw_name = str(data.get("name") or "")
+    if media is MediaType.MOVIE:
+        m = TITLE_YEAR_RE.match(raw_name)
+        if m:
+            title, year = clean_name(m.group("title")), int(m.group("year"))
+        else:
+            title, year = clean_name(raw_name), None
+        season = episode = None
+    else:
+        match = RE_EPISODE_TAG.match(raw_name)
+        if not match:
+            return None
+        raw_show, ss, ee = match.groups()
+        title, year, season, episode = clean_name(raw_show), None, int(ss), int(ee)
+
+    local_file_val = data.get("local_file")
+    ts = data.get("updated_at")
+    updated_at = None
+    if ts:
+        for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
+            try:
+                updated_at = datetime.strptime(str(ts), fmt).replace(tzinfo=timezone.utc)
+                break
+            except ValueError:
+                continue
+
+    return DispatcharrStream(
+        id=int(data["id"]), name=title, year=year,
+        url=str(data.get("url") or ""),
+        m3u_account=int(data.get("m3u_account") or 0),
+        logo_url=str(data.get("logo_url") or ""),
+        tvg_id=str(data.get("tvg_id") or ""),
+        local_file=Path(str(local_file_val)) if local_file_val else None,
+        current_viewers=int(data.get("current_viewers") or 0),
+        updated_at=updated_at,
+        stream_profile_id=data.get("stream_profile_id"),
+        is_custom=bool(data.get("is_custom", False)),
+        channel_group=int(data.get("channel_group") or 0),
+        channel_group_name=group,
+        stream_hash=str(data.get("stream_hash") or ""),
+        stream_type=media, season=season, episode=episode,
+    )
+
+
+def run_legacy(body: bytes, media: MediaType) -> List[DispatcharrStream]:
+    data = json.loads(body.decode())
+    out = []
+    for item in data.get("results", []):
+        ds = legacy_from_dict(item, "bench", media)
+        if ds:
+            out.append(ds)
+    return out
+
+
+def run_fast(body: bytes, media: MediaType) -> List[DispatcharrStream]:
+    return _parse_page(fastjson.loads(body), "bench", media, False)
+
+
+def measure(fn: Callable[[bytes, MediaType], List[DispatcharrStream]], bodies: List[bytes],
+            media: MediaType, repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    streams = 0
+    for _ in range(repeat):
+        gc.collect()
+        started = time.process_time()
+        streams = sum(len(fn(b, media)) for b in bodies)
+        best = min(best, time.process_time() - started)
+    # median over pages: one-off growth of shared caches would skew a max
+    peaks = []
+    for body in bodies[:5]:
+        gc.collect()
+        tracemalloc.start()
+        fn(body, media)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {"us_per_stream": best / max(streams, 1) * 1e6, "peak_kib": median(peaks) / 1024, "streams": streams}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.stream_ingest", description=__doc__.split("\n\n")[0])
+    p.add_argument("--pages", type=int, default=10)
+    p.add_argument("--type", choices=("movie", "tv"), default="movie")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--repeat", type=int, default=3, help="timing runs; the fastest is reported")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    media = MediaType.MOVIE if args.type == "movie" else MediaType.TV
+    bodies = pages(args.pages, media, args.seed)
+    legacy = measure(run_legacy, bodies, media, args.repeat)
+    fast = measure(run_fast, bodies, media, args.repeat)
+    print(
+        f"{args.pages} pages of {PAGE_SIZE} {args.type} streams "
+        f"({sum(map(len, bodies)) // 1024} KiB of JSON), decoder: {fastjson.BACKEND}"
+    )
+    print(f"  {'ingest':<10} {'µs/stream':>10} {'peak KiB/page':>14}")
+    for name, r in (("legacy", legacy), ("fast", fast)):
+        print(f"  {name:<10} {r['us_per_stream']:>10.1f} {r['peak_kib']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
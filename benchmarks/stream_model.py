@@ -0,0 +1,111 @@
+# benchmarks/stream_model.py
+"""
+DispatcharrStream construction benchmark.
+
+Builds streams from catalog items with ``DispatcharrStream.from_page`` and
+reports construction time and memory per 100k streams, then the cost of
+resolving every stream's paths afterwards (what a processed stream pays;
+skipped and unchanged streams never do).
+
+    python -m benchmarks.stream_model
+    python -m benchmarks.stream_model --streams 200000 --type tv
+
+Output goes to a temporary ``output_root``, so any directories created
+while constructing streams are counted and then removed.
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+# the models read the settings on import; any valid config will do
+os.environ.setdefault("STRMGEN_CONFIG", str(ROOT / "config.base.json"))
+
+from benchmarks.catalog import CatalogSpec, generate_catalog  # noqa: E402
+from strmgen.core.config import get_settings  # noqa: E402
+from strmgen.core.models.dispatcharr import DispatcharrStream  # noqa: E402
+from strmgen.core.models.enums import MediaType  # noqa: E402
+
+PAGE_SIZE = 1000
+_PATHS = ("base_path", "strm_path", "nfo_path", "poster_path", "backdrop_path")
+
+
+def items(count: int, media: MediaType, seed: int) -> List[Dict[str, Any]]:
+    spec = CatalogSpec(
+        movies=count if media is MediaType.MOVIE else 1,
+        shows=count // 30 + 1 if media is MediaType.TV else 1,
+        seasons=3, episodes=10, channels_24_7=0, decoys=0, seed=seed,
+    )
+    cat = generate_catalog(spec)
+    prefix = "Movies" if media is MediaType.MOVIE else "Series"
+    out = [s for g, streams in cat.streams.items() if g.startswith(prefix) for s in streams]
+    return out[:count]
+
+
+def build(data: List[Dict[str, Any]], media: MediaType) -> List[DispatcharrStream]:
+    out: List[DispatcharrStream] = []
+    for i in range(0, len(data), PAGE_SIZE):
+        out.extend(DispatcharrStream.from_page(data[i:i + PAGE_SIZE], "Bench", media))
+    return out
+
+
+def touch_paths(streams: List[DispatcharrStream]) -> None:
+    for s in streams:
+        for name in _PATHS:
+            getattr(s, name)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.stream_model", description=__doc__.split("\n\n")[0])
+    p.add_argument("--streams", type=int, default=100_000)
+    p.add_argument("--type", choices=("movie", "tv"), default="movie")
+    p.add_argument("--memory-sample", type=int, default=10_000, help="streams traced for memory")
+    p.add_argument("--seed", type=int, default=42)
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    media = MediaType.MOVIE if args.type == "movie" else MediaType.TV
+    data = items(args.streams, media, args.seed)
+    per_100k = 100_000 / max(len(data), 1)
+
+    sample = data[:args.memory_sample]
+
+    with tempfile.TemporaryDirectory() as out_root:
+        get_settings().output_root = out_root
+        build(data[:PAGE_SIZE], media)  # warm the clean_name cache
+
+        gc.collect()
+        started = time.perf_counter()
+        streams = build(data, media)
+        built = time.perf_counter() - started
+        dirs = sum(len(d) for _, d, _ in os.walk(out_root))
+        started = time.perf_counter()
+        touch_paths(streams)
+        resolved = time.perf_counter() - started
+        del streams
+
+        # memory is traced on a sample: tracemalloc slows allocation down a lot
+        gc.collect()
+        tracemalloc.start()
+        streams = build(sample, media)
+        memory = tracemalloc.get_traced_memory()[0]
+        touch_paths(streams)
+        with_paths = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+    scale = 100_000 / max(len(sample), 1) / 2**20
+    print(f"{len(data)} {args.type} streams ({len(sample)} traced for memory); per 100k streams:")
+    print(f"  construct        {built * per_100k:6.2f} s  {memory * scale:7.1f} MiB  ({dirs} dirs created)")
+    print(f"  + resolve paths  {resolved * per_100k:6.2f} s  {with_paths * scale:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
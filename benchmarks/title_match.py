@@ -0,0 +1,254 @@
+# benchmarks/title_match.py
+"""
+Title matcher micro-benchmark.
+
+Ranks a labelled title set with the original ``SequenceMatcher`` scorer
+and with ``strmgen.core.title_match``, then reports top-1 accuracy and
+time per query for each.
+
+    python -m benchmarks.title_match
+    python -m benchmarks.title_match --movies 5000 --noise 0.5 --repeat 5
+
+The set combines hand-picked hard cases (punctuation, roman numerals,
+articles, accents, alternative titles) with synthetic catalog titles.
+Those carry playlist-style noise and are scored against the record plus
+look-alike decoys and unrelated titles that share a word, the way TMDb
+search results do.
+"""
+import argparse
+import os
+import random
+import re
+import time
+
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+# clean_name reads remove_strings from the settings; any valid config will do
+os.environ.setdefault("STRMGEN_CONFIG", str(ROOT / "config.base.json"))
+
+from benchmarks.catalog import NOISE_TAGS, CatalogSpec, generate_catalog  # noqa: E402
+from strmgen.core import title_match  # noqa: E402
+from strmgen.core.string_utils import clean_name  # noqa: E402
+
+_TITLE_YEAR = re.compile(r"^(?P<title>.+?)\s*\((?P<year>\d{4})\)$")
+
+
+def _rec(rid: int, title: str, year: Optional[int], original: Optional[str] = None, alt: Sequence[str] = ()) -> Dict[str, Any]:
+    rec: Dict[str, Any] = {
+        "id": rid,
+        "title": title,
+        "original_title": original or title,
+        "release_date": f"{year}-06-01" if year else "",
+        "popularity": 10.0,
+    }
+    if alt:
+        rec["alternative_titles"] = {"titles": [{"title": t} for t in alt]}
+    return rec
+
+
+# (query title, query year, candidates, id of the right answer)
+HARD_CASES: List[Tuple[str, Optional[int], List[Dict[str, Any]], int]] = [
+    ("Star Wars Episode 4", 1977, [
+        _rec(1, "Star Wars: Episode I - The Phantom Menace", 1977),
+        _rec(2, "Star Wars: Episode IV - A New Hope", 1977),
+        _rec(3, "Star Wars: Episode VI - Return of the Jedi", 1977),
+    ], 2),
+    ("Matrix, The", 1999, [
+        _rec(1, "The Matrix Revisited", 1999),
+        _rec(2, "The Matrix", 1999),
+        _rec(3, "Matrix of Evil", 1999),
+    ], 2),
+    ("Rocky II", None, [
+        _rec(1, "Rocky", 1976),
+        _rec(2, "Rocky III", 1982),
+        _rec(3, "Rocky 2", 1979),
+    ], 3),
+    ("Mission Impossible Fallout", 2018, [
+        _rec(1, "Mission: Impossible", 2018),
+        _rec(2, "Mission: Impossible - Fallout", 2018),
+        _rec(3, "Fallout", 2018),
+    ], 2),
+    ("Harry Potter and the Philosophers Stone", 2001, [
+        _rec(1, "Harry Potter and the Chamber of Secrets", 2001),
+        _rec(2, "Harry Potter and the Philosopher's Stone", 2001),
+        _rec(3, "Harry Potter and the Prisoner of Azkaban", 2001),
+    ], 2),
+    ("Leon The Professional", 1994, [
+        _rec(1, "The Professional", 1994),
+        _rec(2, "Léon: The Professional", 1994, original="Léon"),
+        _rec(3, "Leon", 1994),
+    ], 2),
+    ("Wall E", 2008, [
+        _rec(1, "Wall Street", 2008),
+        _rec(2, "WALL·E", 2008),
+        _rec(3, "Walled In", 2008),
+    ], 2),
+    ("Lord of the Rings Return of the King", 2003, [
+        _rec(1, "The Lord of the Rings: The Two Towers", 2003),
+        _rec(2, "The Lord of the Rings: The Fellowship of the Ring", 2003),
+        _rec(3, "The Lord of the Rings: The Return of the King", 2003),
+    ], 3),
+    ("Fast and Furious 7", 2015, [
+        _rec(1, "Fast & Furious", 2015),
+        _rec(2, "Furious 7", 2015, alt=["Fast & Furious 7", "Fast and Furious 7"]),
+        _rec(3, "The Fast and the Furious", 2015),
+    ], 2),
+    ("Amelie", 2001, [
+        _rec(1, "Amelia", 2001),
+        _rec(2, "Amélie", 2001, original="Le Fabuleux Destin d'Amélie Poulain"),
+        _rec(3, "Emilie", 2001),
+    ], 2),
+    ("Spider Man Far From Home", 2019, [
+        _rec(1, "Spider-Man: Homecoming", 2019),
+        _rec(2, "Spider-Man: Far From Home", 2019),
+        _rec(3, "Far from Home", 2019),
+    ], 2),
+    ("Crouching Tiger Hidden Dragon", 2000, [
+        _rec(1, "Crouching Tiger, Hidden Dragon: Sword of Destiny", 2000),
+        _rec(2, "Crouching Tiger, Hidden Dragon", 2000, original="臥虎藏龍"),
+        _rec(3, "Hidden Dragon", 2000),
+    ], 2),
+]
+
+
+def synthetic_cases(
+    spec: CatalogSpec,
+    pool: int,
+) -> List[Tuple[str, Optional[int], List[Dict[str, Any]], int]]:
+    """Noisy movie stream names from the benchmark catalog, labelled with their record."""
+    cat = generate_catalog(spec)
+    rng = random.Random(spec.seed)
+    by_word: Dict[str, List[int]] = {}
+    for mid, rec in cat.movies.items():
+        for w in set(rec["title"].lower().split()) - {"the", "of"}:
+            by_word.setdefault(w, []).append(mid)
+    movie_ids = list(cat.movies)
+
+    streams = cat.streams_by_id()
+    out = []
+    for sid, mid in cat.matches.items():
+        name = streams[sid]["name"]
+        m = _TITLE_YEAR.match(name)
+        title, year = (m["title"], int(m["year"])) if m else (name, None)
+        for tag in NOISE_TAGS:
+            title = title.replace(tag, "")
+        # the record, its decoys (next ids, same title stem) and word-sharing noise
+        real = cat.movies[mid]
+        ids = {mid}
+        nxt = mid + 1
+        while nxt in cat.movies and cat.movies[nxt]["title"].startswith(real["title"]):
+            ids.add(nxt)
+            nxt += 1
+        words = [w for w in real["title"].lower().split() if w in by_word]
+        while len(ids) < pool and words:
+            ids.add(rng.choice(by_word[rng.choice(words)]))
+            if len(ids) < pool and rng.random() < 0.2:
+                ids.add(rng.choice(movie_ids))
+        candidates = [cat.movies[i] for i in ids]
+        rng.shuffle(candidates)
+        out.append((title.strip(), year, candidates, mid))
+    return out
+
+
+# ─── Scorers ──────────────────────────────────────────────────────────────────
+def _year_ok(year: Optional[int], rec: Dict[str, Any]) -> bool:
+    # both matchers drop exact-year mismatches before scoring, as tmdb.py does
+    rec_year = title_match.record_year(rec)
+    return year is None or rec_year is None or rec_year == year
+
+
+def sequence_matcher(title: str, year: Optional[int], candidates: List[Dict[str, Any]]) -> Optional[int]:
+    """The scorer fetch_movie_details used before title_match."""
+    target = clean_name(title)
+    eligible = [c for c in candidates if _year_ok(year, c)]
+    if not eligible:
+        return None
+    best = max(eligible, key=lambda c: SequenceMatcher(None, clean_name(c["title"]), target).ratio())
+    return best["id"]
+
+
+def fuzzy_matcher(title: str, year: Optional[int], candidates: List[Dict[str, Any]]) -> Optional[int]:
+    query = title_match.make_query(clean_name(title), year)
+    winner = title_match.best(query, [c for c in candidates if _year_ok(year, c)])
+    return winner[1]["id"] if winner else None
+
+
+Matcher = Callable[[str, Optional[int], List[Dict[str, Any]]], Optional[int]]
+MATCHERS: Dict[str, Matcher] = {
+    "sequence_matcher": sequence_matcher,
+    "title_match": fuzzy_matcher,
+}
+
+
+def evaluate(
+    matcher: Matcher,
+    cases: List[Tuple[str, Optional[int], List[Dict[str, Any]], int]],
+    repeat: int,
+) -> Dict[str, Any]:
+    correct = sum(matcher(t, y, c) == label for t, y, c, label in cases)
+    misses = [t for t, y, c, label in cases if matcher(t, y, c) != label]
+
+    def timed() -> float:
+        started = time.perf_counter()
+        for t, y, c, _ in cases:
+            matcher(t, y, c)
+        return (time.perf_counter() - started) / max(1, len(cases)) * 1e6
+
+    # cold: every title normalized for the first time; warm: keys cached,
+    # as for titles TMDb returns again later in a run
+    cold = warm = float("inf")
+    for _ in range(repeat):
+        title_match.title_key.cache_clear()
+        cold = min(cold, timed())
+        warm = min(warm, timed())
+    return {
+        "accuracy": correct / len(cases) if cases else 0.0,
+        "cold_us": cold,
+        "warm_us": warm,
+        "misses": misses,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.title_match", description=__doc__.split("\n\n")[0])
+    p.add_argument("--movies", type=int, default=2000)
+    p.add_argument("--noise", type=float, default=0.4, help="share of distorted stream names")
+    p.add_argument("--decoys", type=float, default=0.8, help="look-alike titles per real title")
+    p.add_argument("--pool", type=int, default=20, help="candidates per query (TMDb returns 20 per page)")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--repeat", type=int, default=3, help="timing runs; the fastest is reported")
+    p.add_argument("--show-misses", type=int, default=5, metavar="N", help="list the first N misses per set")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    spec = CatalogSpec(
+        movies=args.movies, shows=0, channels_24_7=0,
+        name_noise=args.noise, decoys=args.decoys, seed=args.seed,
+    )
+    sets = {
+        "hard": HARD_CASES,
+        "synthetic": synthetic_cases(spec, args.pool),
+    }
+    for set_name, cases in sets.items():
+        print(f"{set_name} ({len(cases)} queries)")
+        print(f"  {'matcher':<18} {'accuracy':>9} {'cold µs/q':>10} {'warm µs/q':>10}")
+        baseline: Optional[Dict[str, Any]] = None
+        for name, matcher in MATCHERS.items():
+            r = evaluate(matcher, cases, args.repeat)
+            speed = (
+                f"  ({baseline['cold_us'] / r['cold_us']:.1f}x cold, {baseline['warm_us'] / r['warm_us']:.1f}x warm)"
+                if baseline else ""
+            )
+            baseline = baseline or r
+            print(f"  {name:<18} {r['accuracy']:>9.2%} {r['cold_us']:>10.1f} {r['warm_us']:>10.1f}{speed}")
+            for miss in r["misses"][:args.show_misses]:
+                print(f"    miss: {miss}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+# strmgen/api/routers/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False, name="metrics.scrape")
+def scrape_metrics():
+    """
+    Prometheus text exposition of all strmgen metrics.
+    """
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -8,6 +8,11 @@ from strmgen.pipeline.runner import (
     is_running
 )
 from strmgen.api.schemas import StatusResponse
+from strmgen.core.concurrency import budget_stats
+from strmgen.core.tmdb_traffic import tmdb_traffic
+from strmgen.core.side_tasks import side_tasks
+from strmgen.core.db import clear_stream_state
+from strmgen.services.reconcile import last_report
 from sse_starlette.sse import EventSourceResponse
 
 router = APIRouter(tags=["process"])
@@ -17,6 +22,14 @@ async def run_now(background_tasks: BackgroundTasks):
     background_tasks.add_task(start_background_run)
     return {"status": "started"}
 
+@router.post("/resume", name="process.resume")
+async def resume_run(background_tasks: BackgroundTasks):
+    """
+    Continue the last cancelled or crashed run from its checkpoint.
+    """
+    background_tasks.add_task(start_background_run, True)
+    return {"status": "resumed"}
+
 @router.post("/stop", name="process.stop")
 async def stop_now():
     stop_background_run()
@@ -31,6 +44,48 @@ async def pipeline_status():
     return StatusResponse(running=is_running())
 
 
+@router.get("/limits", name="process.get_limits")
+async def pipeline_limits():
+    """
+    Current adaptive concurrency limits and counters per upstream.
+    """
+    return budget_stats()
+
+
+@router.get("/limits/tmdb", name="process.get_tmdb_lanes")
+async def tmdb_lanes():
+    """
+    TMDb traffic scheduler: rate tokens, pauses and per-lane queue stats.
+    """
+    return tmdb_traffic.stats()
+
+
+@router.get("/side-tasks", name="process.get_side_tasks")
+async def side_task_stats():
+    """
+    Artwork and subtitle side-task executor: backlog, workers and outcome counts.
+    """
+    return side_tasks.stats()
+
+
+@router.get("/reconcile", name="process.get_reconcile")
+async def reconcile_report():
+    """
+    Orphan cleanup of the last completed run: entries found and removed per group.
+    """
+    return last_report()
+
+
+@router.post("/state/clear", name="process.clear_state")
+async def clear_state(stream_type: str | None = None):
+    """
+    Forget per-stream state so the next incremental run reprocesses everything
+    (optionally only for one stream_type, e.g. MOVIE).
+    """
+    await clear_stream_state(stream_type)
+    return {"status": "ok"}
+
+
 @router.get("/stream/status", name="process.stream_status")
 async def stream_status_sse():
     """
@@ -23,11 +23,13 @@ class SettingsOut(BaseModel):
     stream_base_url: str
     skip_stream_check: bool
     only_updated_streams: bool
+    incremental_runs: bool = False
     last_modified_days: int
     update_stream_link: bool
 
     output_root: str
     clean_output_dir: bool
+    clean_output_dry_run: bool = False
 
     process_movies_groups: bool
     movies_groups: List[str]
@@ -37,10 +39,23 @@ class SettingsOut(BaseModel):
     groups_24_7: List[str]
     remove_strings: List[str]
 
-    batch_size: int
-    batch_delay_seconds: float
-    concurrent_requests: int
+    stream_workers: int = 32
+    stream_queue_size: int = 1000
+    stream_page_concurrency: int = 4
+    max_concurrent_groups: int = 4
+    fs_concurrency: int = 16
+    output_manifest_enabled: bool = True
+    side_task_workers: int = 4
+    side_task_backlog: int = 1000
+    side_task_drain_seconds: int = 30
+    adaptive_initial_concurrency: int = 4
+    adaptive_min_concurrency: int = 1
+    adaptive_latency_target_ms: int = 2000
+    dispatcharr_max_concurrency: int = 8
+    tmdb_max_concurrency: int = 32
+    emby_max_concurrency: int = 8
     tmdb_rate_limit: int
+    tmdb_image_max_concurrency: int = 8
 
     movie_year_regex: str
     tv_series_episode_regex: str
@@ -49,12 +64,24 @@ class SettingsOut(BaseModel):
     tmdb_language: str
     tmdb_download_images: bool
     tmdb_image_size: str
+    artwork_store_dir: Optional[str] = None
     tmdb_create_not_found: bool
     minimum_year: int
     check_tmdb_thresholds: bool
     minimum_tmdb_rating: float
     minimum_tmdb_votes: int
     minimum_tmdb_popularity: float
+    tmdb_movie_two_phase_match: bool = True
+    tmdb_movie_match_top_k: int = 3
+    tmdb_movie_match_margin: float = 0.05
+    tmdb_field_profile: str = "nfo-minimal"
+    tmdb_custom_fields: List[str] = []
+    tmdb_cache_enabled: bool = True
+    tmdb_cache_search_ttl_hours: int = 72
+    tmdb_cache_season_ttl_hours: int = 168
+    tmdb_cache_details_ttl_hours: int = 720
+    tmdb_cache_max_entries: int = 200000
+    tmdb_not_found_ttl_hours: int = 168
 
     write_nfo: bool
     write_nfo_only_if_not_exists: bool
@@ -88,11 +115,13 @@ class SettingsIn(BaseModel):
     stream_base_url: str
     skip_stream_check: bool
     only_updated_streams: bool
+    incremental_runs: bool = False
     last_modified_days: int
     update_stream_link: bool
 
     output_root: str
     clean_output_dir: bool
+    clean_output_dry_run: bool = False
 
     process_movies_groups: bool
     movies_groups: List[str]
@@ -102,10 +131,23 @@ class SettingsIn(BaseModel):
     groups_24_7: List[str]
     remove_strings: List[str]
 
-    batch_size: int
-    batch_delay_seconds: float
-    concurrent_requests: int
+    stream_workers: int = 32
+    stream_queue_size: int = 1000
+    stream_page_concurrency: int = 4
+    max_concurrent_groups: int = 4
+    fs_concurrency: int = 16
+    output_manifest_enabled: bool = True
+    side_task_workers: int = 4
+    side_task_backlog: int = 1000
+    side_task_drain_seconds: int = 30
+    adaptive_initial_concurrency: int = 4
+    adaptive_min_concurrency: int = 1
+    adaptive_latency_target_ms: int = 2000
+    dispatcharr_max_concurrency: int = 8
+    tmdb_max_concurrency: int = 32
+    emby_max_concurrency: int = 8
     tmdb_rate_limit: int
+    tmdb_image_max_concurrency: int = 8
 
     movie_year_regex: str
     tv_series_episode_regex: str
@@ -114,12 +156,24 @@ class SettingsIn(BaseModel):
     tmdb_language: str
     tmdb_download_images: bool
     tmdb_image_size: str
+    artwork_store_dir: Optional[str] = None
     tmdb_create_not_found: bool
     minimum_year: int
     check_tmdb_thresholds: bool
     minimum_tmdb_rating: float
     minimum_tmdb_votes: int
     minimum_tmdb_popularity: float
+    tmdb_movie_two_phase_match: bool = True
+    tmdb_movie_match_top_k: int = 3
+    tmdb_movie_match_margin: float = 0.05
+    tmdb_field_profile: str = "nfo-minimal"
+    tmdb_custom_fields: List[str] = []
+    tmdb_cache_enabled: bool = True
+    tmdb_cache_search_ttl_hours: int = 72
+    tmdb_cache_season_ttl_hours: int = 168
+    tmdb_cache_details_ttl_hours: int = 720
+    tmdb_cache_max_entries: int = 200000
+    tmdb_not_found_ttl_hours: int = 168
 
     write_nfo: bool
     write_nfo_only_if_not_exists: bool
@@ -151,11 +205,13 @@ class SettingsPatch(BaseModel):
     stream_base_url:         Optional[str]   = None
     skip_stream_check:       Optional[bool]  = None
     only_updated_streams:    Optional[bool]  = None
+    incremental_runs:        Optional[bool]  = None
     last_modified_days:      Optional[int]   = None
     update_stream_link:      Optional[bool]  = None
 
     output_root:             Optional[str]   = None
     clean_output_dir:        Optional[bool]  = None
+    clean_output_dry_run:    Optional[bool]  = None
 
     process_movies_groups:         Optional[bool]  = None
     movies_groups:                 Optional[List[str]] = None
@@ -165,10 +221,23 @@ class SettingsPatch(BaseModel):
     groups_24_7:                   Optional[List[str]] = None
     remove_strings:                Optional[List[str]] = None
 
-    batch_size:                   Optional[int]   = None
-    batch_delay_seconds:          Optional[int]   = None
-    concurrent_requests:          Optional[int]   = None
+    stream_workers:               Optional[int]   = None
+    stream_queue_size:            Optional[int]   = None
+    stream_page_concurrency:      Optional[int]   = None
+    max_concurrent_groups:        Optional[int]   = None
+    fs_concurrency:               Optional[int]   = None
+    output_manifest_enabled:      Optional[bool]  = None
+    side_task_workers:            Optional[int]   = None
+    side_task_backlog:            Optional[int]   = None
+    side_task_drain_seconds:      Optional[int]   = None
+    adaptive_initial_concurrency: Optional[int]   = None
+    adaptive_min_concurrency:     Optional[int]   = None
+    adaptive_latency_target_ms:   Optional[int]   = None
+    dispatcharr_max_concurrency:  Optional[int]   = None
+    tmdb_max_concurrency:         Optional[int]   = None
+    emby_max_concurrency:         Optional[int]   = None
     tmdb_rate_limit:              Optional[int]   = None
+    tmdb_image_max_concurrency:   Optional[int]   = None
 
     movie_year_regex:             Optional[str]   = None
     tv_series_episode_regex:      Optional[str]   = None
@@ -177,12 +246,24 @@ class SettingsPatch(BaseModel):
     tmdb_language:                Optional[str]   = None
     tmdb_download_images:         Optional[bool]  = None
     tmdb_image_size:              Optional[str]   = None
+    artwork_store_dir:            Optional[str]   = None
     tmdb_create_not_found:        Optional[bool]  = None
     minimum_year:                 Optional[int]   = None
     check_tmdb_thresholds:        Optional[bool]  = None
     minimum_tmdb_rating:          Optional[int]   = None
     minimum_tmdb_votes:           Optional[int]   = None
     minimum_tmdb_popularity:      Optional[int]   = None
+    tmdb_movie_two_phase_match:   Optional[bool]  = None
+    tmdb_movie_match_top_k:       Optional[int]   = None
+    tmdb_movie_match_margin:      Optional[float] = None
+    tmdb_field_profile:           Optional[str]   = None
+    tmdb_custom_fields:           Optional[List[str]] = None
+    tmdb_cache_enabled:           Optional[bool]  = None
+    tmdb_cache_search_ttl_hours:  Optional[int]   = None
+    tmdb_cache_season_ttl_hours:  Optional[int]   = None
+    tmdb_cache_details_ttl_hours: Optional[int]   = None
+    tmdb_cache_max_entries:       Optional[int]   = None
+    tmdb_not_found_ttl_hours:     Optional[int]   = None
 
     write_nfo:                    Optional[bool]  = None
     write_nfo_only_if_not_exists: Optional[bool]  = None
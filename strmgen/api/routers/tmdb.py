@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from strmgen.services.tmdb import fetch_movie_details, fetch_tv_details
+from strmgen.services import tmdb_cache, tmdb_not_found
+from strmgen.core.db import clear_tmdb_cache, list_tmdb_not_found, purge_tmdb_not_found
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 
@@ -22,4 +24,46 @@ async def api_tmdb_info(stream_type: str, tmdb_id: int):
 
     # this converts Pydantic models (and any other odd types) into plain JSON-able dicts
     payload = jsonable_encoder(info)
-    return JSONResponse(content=payload)
\ No newline at end of file
+    return JSONResponse(content=payload)
+
+
+@router.get("/cache/stats", name="tmdb.cache_stats")
+async def api_tmdb_cache_stats():
+    """Hit/miss counters since startup and cached entries per kind."""
+    return await tmdb_cache.stats()
+
+
+@router.post("/cache/clear", name="tmdb.cache_clear")
+async def api_tmdb_cache_clear(kind: str | None = None):
+    """
+    Drop cached TMDb responses (optionally only one kind: search, season
+    or details) so they are fetched again on the next run.
+    """
+    await clear_tmdb_cache(kind)
+    return {"status": "ok"}
+
+
+@router.get("/not-found", name="tmdb.not_found_list")
+async def api_tmdb_not_found(media_type: str | None = None, limit: int = 100, offset: int = 0):
+    """
+    Titles TMDb could not match that are currently skipped (optionally
+    only one media type: movie or tv), most recent first.
+    """
+    return await list_tmdb_not_found(media_type, limit, offset)
+
+
+@router.get("/not-found/stats", name="tmdb.not_found_stats")
+async def api_tmdb_not_found_stats():
+    """Searches avoided and titles recorded by the negative cache since startup."""
+    return tmdb_not_found.stats()
+
+
+@router.post("/not-found/purge", name="tmdb.not_found_purge")
+async def api_tmdb_not_found_purge(media_type: str | None = None, title: str | None = None):
+    """
+    Forget not-found titles (all, one media type, or one title) so they
+    are searched again on the next run.
+    """
+    key = tmdb_not_found.title_key(title) if title else None
+    removed = await purge_tmdb_not_found(media_type, key)
+    return {"status": "ok", "removed": removed}
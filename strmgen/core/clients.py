@@ -1,9 +1,9 @@
 # strmgen/core/httpclient.py
 import httpx
 from httpx import AsyncClient, Limits, Timeout
-from aiolimiter import AsyncLimiter
 
 from strmgen.core.config import get_settings
+from strmgen.core.metrics import http_event_hooks
 
 # Load settings once into module-level variable for client configuration
 settings = get_settings()
@@ -11,7 +11,8 @@ settings = get_settings()
 # one-and-only AsyncClient for your entire app
 async_client = AsyncClient(
     base_url=settings.api_base,
-    timeout=Timeout(10.0)
+    timeout=Timeout(10.0),
+    event_hooks=http_event_hooks("dispatcharr")
 )
 
 # Constants
@@ -26,7 +27,8 @@ tmdb_client = AsyncClient(
         max_connections=20,
         max_keepalive_connections=10
     ),
-    timeout=Timeout(10.0)
+    timeout=Timeout(10.0),
+    event_hooks=http_event_hooks("tmdb")
 )
 
 tmdb_image_client = AsyncClient(
@@ -35,17 +37,13 @@ tmdb_image_client = AsyncClient(
         max_connections=20,
         max_keepalive_connections=10
     ),
-    timeout=Timeout(10.0)
-)
-
-# Rate limiter parameterized by settings
-tmdb_limiter = AsyncLimiter(
-    max_rate=settings.tmdb_rate_limit,
-    time_period=10
+    timeout=Timeout(10.0),
+    event_hooks=http_event_hooks("tmdb_image")
 )
 
 # Centralized Emby client
 emby_client = httpx.AsyncClient(
     base_url=settings.emby_api_url,
-    headers={"X-Emby-Token": settings.emby_api_key}
+    headers={"X-Emby-Token": settings.emby_api_key},
+    event_hooks=http_event_hooks("emby")
 )
\ No newline at end of file
@@ -0,0 +1,271 @@
+# strmgen/core/concurrency.py
+"""
+Process-wide concurrency budgets, one per external dependency.
+
+Every pipeline stage shares these, so running many groups at once cannot
+multiply the load on Dispatcharr, TMDb, Emby or the output filesystem.
+Upstream HTTP budgets are adaptive (AIMD): the in-flight limit grows while
+responses stay fast and healthy, and is cut sharply on 429/5xx/timeouts.
+``configure_budgets()`` applies the current settings when a run starts.
+"""
+import asyncio
+import time
+import logging
+
+from collections import deque
+from types import TracebackType
+from typing import Any, Callable, Deque, Dict, List, Optional, Type, TypeVar
+
+import httpx
+
+from strmgen.core.config import get_settings
+from strmgen.core.metrics import FS_OP_SECONDS, FS_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+# Multiplicative factors applied to the limit
+_BACKOFF_FACTOR = 0.5      # on 429 / 5xx / timeout
+_SLOW_FACTOR    = 0.9      # on responses slower than the latency target
+_EWMA_ALPHA     = 0.2      # weight of the newest latency sample
+
+
+class AdaptiveLimiter:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit for one upstream.
+
+    Use ``async with limiter.slot() as slot:`` around a request and call
+    ``slot.observe(status_code)`` with the response status; timeouts and
+    network errors raised inside the block count as overload automatically.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        latency_target: float,
+    ):
+        self.name = name
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.latency_target = latency_target
+        self._limit = float(min(max(initial, self.minimum), self.maximum))
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self._latency_ewma: Optional[float] = None
+        self.successes = 0
+        self.throttled = 0
+        self.errors = 0
+        self.increases = 0
+        self.decreases = 0
+
+    def configure(self, minimum: int, maximum: int, latency_target: float) -> None:
+        """Apply new bounds; the limit learned so far is kept within them."""
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.latency_target = latency_target
+        self._limit = min(max(self._limit, float(self.minimum)), float(self.maximum))
+        self._wake()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def slot(self) -> "_Slot":
+        return _Slot(self)
+
+    async def acquire(self) -> None:
+        while self._in_flight >= self.limit:
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                # pass a wake-up we may have consumed on to the next waiter
+                self._wake()
+                raise
+            finally:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+        self._in_flight += 1
+
+    def release(self, latency: float, overloaded: Optional[bool]) -> None:
+        """
+        Return a slot and adapt the limit.
+        ``overloaded`` is True for 429/5xx/timeouts, False for a healthy
+        response and None when the outcome says nothing about upstream load.
+        """
+        saturated = self._in_flight >= self.limit
+        self._in_flight -= 1
+        if overloaded is not None:
+            self._adjust(latency, overloaded, saturated)
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.limit - self._in_flight
+        while free > 0 and self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                free -= 1
+
+    def _adjust(self, latency: float, overloaded: bool, saturated: bool) -> None:
+        now = time.monotonic()
+        # only one decrease per latency window, so a burst of failures from
+        # requests already in flight does not collapse the limit to minimum
+        window = max(self._latency_ewma or 0.0, 1.0)
+
+        if overloaded:
+            if now - self._last_decrease >= window:
+                self._decrease(_BACKOFF_FACTOR, now)
+            return
+
+        self.successes += 1
+        self._latency_ewma = (
+            latency if self._latency_ewma is None
+            else _EWMA_ALPHA * latency + (1 - _EWMA_ALPHA) * self._latency_ewma
+        )
+        if self._latency_ewma > self.latency_target:
+            if now - self._last_decrease >= window:
+                self._decrease(_SLOW_FACTOR, now)
+        elif saturated and self._limit < self.maximum:
+            # +1 per full window of successful requests
+            self._limit = min(self.maximum, self._limit + 1.0 / self._limit)
+            self.increases += 1
+
+    def _decrease(self, factor: float, now: float) -> None:
+        new_limit = max(float(self.minimum), self._limit * factor)
+        if new_limit < self._limit:
+            self.decreases += 1
+            logger.info(
+                "[LIMIT] %s concurrency %d → %d",
+                self.name, self.limit, int(new_limit)
+            )
+        self._limit = new_limit
+        self._last_decrease = now
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name":           self.name,
+            "limit":          self.limit,
+            "in_flight":      self._in_flight,
+            "waiting":        len(self._waiters),
+            "minimum":        self.minimum,
+            "maximum":        self.maximum,
+            "latency_ms":     round(self._latency_ewma * 1000, 1) if self._latency_ewma is not None else None,
+            "successes":      self.successes,
+            "throttled":      self.throttled,
+            "errors":         self.errors,
+            "increases":      self.increases,
+            "decreases":      self.decreases,
+        }
+
+
+class _Slot:
+    """One admitted request; reports its latency and outcome on exit."""
+
+    def __init__(self, limiter: AdaptiveLimiter):
+        self._limiter = limiter
+        self._started = 0.0
+        self._overloaded: Optional[bool] = None
+
+    def observe(self, status_code: int) -> None:
+        self._overloaded = status_code == 429 or status_code >= 500
+
+    async def __aenter__(self) -> "_Slot":
+        await self._limiter.acquire()
+        self._started = time.monotonic()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        latency = time.monotonic() - self._started
+        if isinstance(exc, (httpx.TimeoutException, httpx.NetworkError)):
+            self._limiter.errors += 1
+            self._overloaded = True
+        elif self._overloaded:
+            self._limiter.throttled += 1
+        elif exc is not None and self._overloaded is None:
+            self._limiter.errors += 1
+        self._limiter.release(latency, self._overloaded)
+
+
+# budget name → setting holding its maximum
+_MAXIMUM_SETTINGS = {
+    "dispatcharr": "dispatcharr_max_concurrency",
+    "tmdb":        "tmdb_max_concurrency",
+    "emby":        "emby_max_concurrency",
+}
+
+
+def _adaptive(name: str) -> AdaptiveLimiter:
+    settings = get_settings()
+    return AdaptiveLimiter(
+        name=name,
+        initial=settings.adaptive_initial_concurrency,
+        minimum=settings.adaptive_min_concurrency,
+        maximum=getattr(settings, _MAXIMUM_SETTINGS[name]),
+        latency_target=settings.adaptive_latency_target_ms / 1000,
+    )
+
+
+# Dispatcharr API requests in flight
+dispatcharr_budget = _adaptive("dispatcharr")
+
+# TMDb metadata requests in flight
+tmdb_budget = _adaptive("tmdb")
+
+# Emby library lookups in flight
+emby_budget = _adaptive("emby")
+
+# Blocking filesystem jobs handed to worker threads
+fs_limit = get_settings().fs_concurrency
+fs_budget = asyncio.Semaphore(fs_limit)
+
+
+def configure_budgets() -> None:
+    """Apply the current settings to every budget; called when a run starts."""
+    global fs_budget, fs_limit
+    settings = get_settings()
+    for budget in (dispatcharr_budget, tmdb_budget, emby_budget):
+        budget.configure(
+            minimum=settings.adaptive_min_concurrency,
+            maximum=getattr(settings, _MAXIMUM_SETTINGS[budget.name]),
+            latency_target=settings.adaptive_latency_target_ms / 1000,
+        )
+    if settings.fs_concurrency != fs_limit:
+        # jobs still holding a slot release it on the semaphore they took it from
+        fs_limit = settings.fs_concurrency
+        fs_budget = asyncio.Semaphore(fs_limit)
+
+
+def budget_stats() -> List[Dict[str, Any]]:
+    """Current limits and counters of every adaptive budget."""
+    return [b.stats() for b in (dispatcharr_budget, tmdb_budget, emby_budget)]
+
+
+async def run_fs(fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """Run a blocking filesystem call in a thread under the shared fs budget."""
+    budget = fs_budget
+    FS_QUEUE_DEPTH.inc()
+    try:
+        await budget.acquire()
+    finally:
+        FS_QUEUE_DEPTH.dec()
+    try:
+        with FS_OP_SECONDS.labels(getattr(fn, "__name__", "call")).time():
+            return await asyncio.to_thread(fn, *args, **kwargs)
+    finally:
+        budget.release()
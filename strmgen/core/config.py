@@ -1,5 +1,6 @@
 # strmgen/core/config.py
 import json
+import os
 import re
 from datetime import datetime
 from functools import lru_cache
@@ -15,7 +16,8 @@ from pydantic import BaseModel, Field, field_validator
 # and your JSON lives at:        strmgen/core/config/config.json
 
 BASE_DIR    = Path(__file__).parent           # .../strmgen/core
-CONFIG_PATH = BASE_DIR / "config.json"
+# STRMGEN_CONFIG points at an alternative file (used by the benchmarks)
+CONFIG_PATH = Path(os.environ.get("STRMGEN_CONFIG") or BASE_DIR / "config.json")
 
 
 if not CONFIG_PATH.exists():
@@ -45,7 +47,10 @@ class Settings(BaseModel):
     refresh: Optional[str]
 
     # Output & directories
+    # Remove output of streams that disappeared upstream after a completed run;
+    # with the dry run the orphans are only reported
     clean_output_dir: Optional[bool] = False
+    clean_output_dry_run: bool        = False
     output_root:      Optional[str] = "/output"
 
     # Filtering
@@ -67,6 +72,7 @@ class Settings(BaseModel):
     skip_stream_check:        Optional[bool] = True
     update_stream_link:       Optional[bool] = False
     only_updated_streams:     Optional[bool] = False
+    incremental_runs:         Optional[bool] = False
     last_modified_days: int = 0
 
     # TMDb
@@ -74,13 +80,54 @@ class Settings(BaseModel):
     tmdb_language:        Optional[str] = "en-US"
     tmdb_download_images: Optional[bool] = False
     tmdb_image_size:      Optional[str] = "original"
+    # Downloaded artwork, linked into the library; defaults to <output_root>/.artwork
+    artwork_store_dir:    Optional[str] = None
     tmdb_create_not_found: Optional[bool] = True
     check_tmdb_thresholds: Optional[bool] = False
-
-    batch_size: int                = 20
-    batch_delay_seconds: float     = 2.0
-    concurrent_requests: int       = 5
-    tmdb_rate_limit: int           = 40
+    # Movie matching: rank search results, then fetch details for the best
+    # candidate, or the top k when they score within the margin of each other
+    tmdb_movie_two_phase_match: bool = True
+    tmdb_movie_match_top_k: int      = 3
+    tmdb_movie_match_margin: float   = 0.05
+
+    # Which TMDb sections are requested and which fields are kept in memory:
+    # "nfo-minimal", "full", or "custom" (nfo-minimal plus tmdb_custom_fields)
+    tmdb_field_profile: str                   = "nfo-minimal"
+    tmdb_custom_fields: Optional[List[str]]   = None
+
+    # Persistent TMDb response cache
+    tmdb_cache_enabled: bool          = True
+    tmdb_cache_search_ttl_hours: int  = 72
+    tmdb_cache_season_ttl_hours: int  = 168
+    tmdb_cache_details_ttl_hours: int = 720
+    tmdb_cache_max_entries: int       = 200000
+    # Titles TMDb could not match are not searched again for this long (0 = off)
+    tmdb_not_found_ttl_hours: int     = 168
+
+    stream_workers: int            = 32
+    stream_queue_size: int         = 1000
+    # Dispatcharr listing pages fetched at once per group
+    stream_page_concurrency: int   = 4
+    max_concurrent_groups: int     = 4
+    fs_concurrency: int            = 16
+    # Index output_root once per run and check files against it, not the disk
+    output_manifest_enabled: bool  = True
+
+    # Artwork and subtitle jobs run beside the pipeline: worker count,
+    # queued jobs before producers wait, grace period when a run is cancelled
+    side_task_workers: int         = 4
+    side_task_backlog: int         = 1000
+    side_task_drain_seconds: int   = 30
+
+    # Adaptive (AIMD) upstream concurrency
+    adaptive_initial_concurrency: int = 4
+    adaptive_min_concurrency: int     = 1
+    adaptive_latency_target_ms: int   = 2000
+    dispatcharr_max_concurrency: int  = 8
+    tmdb_max_concurrency: int         = 32
+    emby_max_concurrency: int         = 8
+    tmdb_rate_limit: int           = 40      # metadata requests per 10 seconds
+    tmdb_image_max_concurrency: int = 8
 
     minimum_year:           Optional[int] = None
     minimum_tmdb_rating:    Optional[float] = None
@@ -3,9 +3,11 @@
 
 import asyncpg
 import asyncio
+import hashlib
+import json
 import logging
 
-from typing import TypedDict, Optional, Any, List
+from typing import TypedDict, Optional, Any, Dict, List, Tuple
 from dataclasses import is_dataclass, asdict
 
 from strmgen.core.config import get_settings
@@ -154,4 +156,426 @@ async def update_skipped_reprocess(tmdb_id: int, stream_type: str, reprocess: bo
            AND stream_type = $3
         """,
         reprocess, tmdb_id, stream_type
-    )
\ No newline at end of file
+    )
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-stream state (incremental runs)
+# ─────────────────────────────────────────────────────────────────────────────
+class StreamState(TypedDict):
+    dispatcharr_id: int
+    stream_type: str
+    group: str
+    stream_hash: str
+    url: str
+    tmdb_id: Optional[int]
+    artifact_hashes: Dict[str, str]
+    last_processed: str
+
+async def get_stream_fingerprints(stream_type: str, group: str) -> Dict[int, Tuple[str, str]]:
+    """Map dispatcharr_id → (stream_hash, url) of every stream processed for a group."""
+    pool = await get_pg_pool()
+    rows = await pool.fetch(
+        """
+        SELECT dispatcharr_id, stream_hash, url
+          FROM stream_state
+         WHERE stream_type = $1
+           AND group_name = $2
+        """,
+        stream_type, group
+    )
+    return {r["dispatcharr_id"]: (r["stream_hash"], r["url"]) for r in rows}
+
+async def get_show_folders(group: str) -> Dict[int, str]:
+    """Map dispatcharr_id → show folder (named after the TMDb title) of a TV group's processed streams."""
+    pool = await get_pg_pool()
+    rows = await pool.fetch(
+        """
+        SELECT dispatcharr_id, artifact_hashes->>'show_folder' AS show_folder
+          FROM stream_state
+         WHERE stream_type = 'TV'
+           AND group_name = $1
+           AND artifact_hashes ? 'show_folder'
+        """,
+        group
+    )
+    return {r["dispatcharr_id"]: r["show_folder"] for r in rows}
+
+async def save_stream_state(
+    stream: DispatcharrStream,
+    tmdb_id: Optional[int] = None,
+    artifacts: Optional[Dict[str, str]] = None,
+) -> None:
+    """Upsert the state record of a stream after it has been processed."""
+    await save_stream_states([stream], tmdb_id, artifacts)
+
+async def save_stream_states(
+    streams: List[DispatcharrStream],
+    tmdb_id: Optional[int] = None,
+    artifacts: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Upsert state records for processed streams. Failures are logged, not
+    raised: losing a record only means the stream is reprocessed next run.
+    """
+    rows = []
+    for stream in streams:
+        hashes = {"strm": hashlib.sha1(stream.proxy_url.strip().encode("utf-8")).hexdigest()}
+        if artifacts:
+            hashes.update(artifacts)
+        rows.append((
+            stream.id, stream.stream_type.name, stream.channel_group_name,
+            stream.stream_hash, stream.url, tmdb_id, json.dumps(hashes)
+        ))
+    if not rows:
+        return
+    try:
+        pool = await get_pg_pool()
+        await pool.executemany(
+            """
+            INSERT INTO stream_state
+            (dispatcharr_id, stream_type, group_name, stream_hash, url, tmdb_id, artifact_hashes, last_processed)
+            VALUES ($1, $2, $3, $4, $5, $6, $7::jsonb, now())
+            ON CONFLICT (dispatcharr_id)
+            DO UPDATE SET
+                stream_type=EXCLUDED.stream_type,
+                group_name=EXCLUDED.group_name,
+                stream_hash=EXCLUDED.stream_hash,
+                url=EXCLUDED.url,
+                tmdb_id=COALESCE(EXCLUDED.tmdb_id, stream_state.tmdb_id),
+                artifact_hashes=EXCLUDED.artifact_hashes,
+                last_processed=EXCLUDED.last_processed;
+            """,
+            rows
+        )
+    except Exception as e:
+        logger.warning("Failed to save stream state for %d stream(s): %s", len(rows), e)
+
+async def clear_stream_state(stream_type: Optional[str] = None) -> None:
+    """Forget processed-stream state so the next incremental run reprocesses everything."""
+    pool = await get_pg_pool()
+    if stream_type is None:
+        await pool.execute("TRUNCATE TABLE stream_state;")
+    else:
+        await pool.execute("DELETE FROM stream_state WHERE stream_type = $1", stream_type)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Run checkpoints (resume after cancel / crash)
+# ─────────────────────────────────────────────────────────────────────────────
+class GroupProgress(TypedDict):
+    next_page: int
+    completed: bool
+
+async def start_run(run_id: str) -> None:
+    """Register a new pipeline run; the checkpoints of the runs it supersedes are dropped."""
+    pool = await get_pg_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                "INSERT INTO pipeline_runs (run_id, status, started_at) VALUES ($1, 'running', now())",
+                run_id
+            )
+            await conn.execute("DELETE FROM run_checkpoints WHERE run_id <> $1", run_id)
+            await conn.execute("DELETE FROM run_completed_streams WHERE run_id <> $1", run_id)
+
+async def finish_run(run_id: str, status: str) -> None:
+    """Record how a run ended; a completed run's checkpoints are dropped."""
+    pool = await get_pg_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                "UPDATE pipeline_runs SET status = $2, finished_at = now() WHERE run_id = $1",
+                run_id, status
+            )
+            if status == "completed":
+                await conn.execute("DELETE FROM run_checkpoints WHERE run_id = $1", run_id)
+                await conn.execute("DELETE FROM run_completed_streams WHERE run_id = $1", run_id)
+
+async def latest_unfinished_run() -> Optional[str]:
+    """run_id of the most recent run, when that run was cancelled or never finished."""
+    pool = await get_pg_pool()
+    row = await pool.fetchrow(
+        """
+        SELECT run_id, status
+          FROM pipeline_runs
+         ORDER BY started_at DESC
+         LIMIT 1
+        """
+    )
+    return row["run_id"] if row and row["status"] != "completed" else None
+
+async def reopen_run(run_id: str) -> None:
+    """Mark a previously interrupted run as running again."""
+    pool = await get_pg_pool()
+    await pool.execute(
+        "UPDATE pipeline_runs SET status = 'running', finished_at = NULL WHERE run_id = $1",
+        run_id
+    )
+
+async def load_checkpoints(run_id: str) -> Dict[Tuple[str, str], GroupProgress]:
+    """Map (stream_type, group) → progress for every group a run has touched."""
+    pool = await get_pg_pool()
+    rows = await pool.fetch(
+        """
+        SELECT stream_type, group_name, next_page, completed
+          FROM run_checkpoints
+         WHERE run_id = $1
+        """,
+        run_id
+    )
+    return {
+        (r["stream_type"], r["group_name"]): {"next_page": r["next_page"], "completed": r["completed"]}
+        for r in rows
+    }
+
+async def save_checkpoint(
+    run_id: str,
+    stream_type: str,
+    group: str,
+    next_page: int,
+    completed: bool,
+    stream_ids: Optional[List[int]] = None,
+) -> None:
+    """Durably record a group's page cursor and any newly completed stream ids."""
+    pool = await get_pg_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            if stream_ids:
+                await conn.executemany(
+                    """
+                    INSERT INTO run_completed_streams (run_id, stream_type, group_name, dispatcharr_id)
+                    VALUES ($1, $2, $3, $4)
+                    ON CONFLICT DO NOTHING
+                    """,
+                    [(run_id, stream_type, group, sid) for sid in stream_ids]
+                )
+            await conn.execute(
+                """
+                INSERT INTO run_checkpoints (run_id, stream_type, group_name, next_page, completed, updated_at)
+                VALUES ($1, $2, $3, $4, $5, now())
+                ON CONFLICT (run_id, stream_type, group_name)
+                DO UPDATE SET
+                    next_page=EXCLUDED.next_page,
+                    completed=EXCLUDED.completed,
+                    updated_at=EXCLUDED.updated_at;
+                """,
+                run_id, stream_type, group, next_page, completed
+            )
+
+async def load_completed_streams(run_id: str, stream_type: str, group: str) -> set[int]:
+    """Dispatcharr ids already finished for a group in the given run."""
+    pool = await get_pg_pool()
+    rows = await pool.fetch(
+        """
+        SELECT dispatcharr_id
+          FROM run_completed_streams
+         WHERE run_id = $1
+           AND stream_type = $2
+           AND group_name = $3
+        """,
+        run_id, stream_type, group
+    )
+    return {r["dispatcharr_id"] for r in rows}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TMDb response cache
+# ─────────────────────────────────────────────────────────────────────────────
+class TMDbCacheEntry(TypedDict):
+    payload: Any
+    etag: Optional[str]
+    fresh: bool
+
+async def get_tmdb_cache_entry(cache_key: str) -> Optional[TMDbCacheEntry]:
+    """Cached TMDb response for a request key, fresh or expired."""
+    pool = await get_pg_pool()
+    row = await pool.fetchrow(
+        """
+        SELECT payload, etag, expires_at > now() AS fresh
+          FROM tmdb_cache
+         WHERE cache_key = $1
+        """,
+        cache_key
+    )
+    if row is None:
+        return None
+    return {"payload": json.loads(row["payload"]), "etag": row["etag"], "fresh": row["fresh"]}
+
+async def put_tmdb_cache_entry(
+    cache_key: str,
+    kind: str,
+    payload_json: str,
+    etag: Optional[str],
+    ttl_seconds: int,
+) -> None:
+    """Upsert a TMDb response body (raw JSON text) with its expiry."""
+    pool = await get_pg_pool()
+    await pool.execute(
+        """
+        INSERT INTO tmdb_cache (cache_key, kind, payload, etag, fetched_at, expires_at)
+        VALUES ($1, $2, $3::jsonb, $4, now(), now() + make_interval(secs => $5))
+        ON CONFLICT (cache_key)
+        DO UPDATE SET
+            kind=EXCLUDED.kind,
+            payload=EXCLUDED.payload,
+            etag=EXCLUDED.etag,
+            fetched_at=EXCLUDED.fetched_at,
+            expires_at=EXCLUDED.expires_at;
+        """,
+        cache_key, kind, payload_json, etag, float(ttl_seconds)
+    )
+
+async def touch_tmdb_cache_entry(cache_key: str, ttl_seconds: int) -> None:
+    """Extend an entry that TMDb confirmed unchanged (304)."""
+    pool = await get_pg_pool()
+    await pool.execute(
+        """
+        UPDATE tmdb_cache
+           SET fetched_at = now(),
+               expires_at = now() + make_interval(secs => $2)
+         WHERE cache_key = $1
+        """,
+        cache_key, float(ttl_seconds)
+    )
+
+async def evict_tmdb_cache(max_entries: int) -> int:
+    """Trim the cache to ``max_entries``, dropping the soonest-expiring first."""
+    pool = await get_pg_pool()
+    status = await pool.execute(
+        """
+        DELETE FROM tmdb_cache
+         WHERE cache_key IN (
+               SELECT cache_key
+                 FROM tmdb_cache
+                ORDER BY expires_at DESC
+               OFFSET $1
+         )
+        """,
+        max_entries
+    )
+    # asyncpg returns the command tag, e.g. "DELETE 42"
+    return int(status.split()[-1])
+
+async def tmdb_cache_counts() -> Dict[str, Dict[str, int]]:
+    """Entries per kind, split into fresh and expired."""
+    pool = await get_pg_pool()
+    rows = await pool.fetch(
+        """
+        SELECT kind,
+               count(*) FILTER (WHERE expires_at > now())  AS fresh,
+               count(*) FILTER (WHERE expires_at <= now()) AS expired
+          FROM tmdb_cache
+         GROUP BY kind
+        """
+    )
+    return {r["kind"]: {"fresh": r["fresh"], "expired": r["expired"]} for r in rows}
+
+async def clear_tmdb_cache(kind: Optional[str] = None) -> None:
+    """Drop cached TMDb responses, all of them or one kind."""
+    pool = await get_pg_pool()
+    if kind is None:
+        await pool.execute("TRUNCATE TABLE tmdb_cache;")
+    else:
+        await pool.execute("DELETE FROM tmdb_cache WHERE kind = $1", kind)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TMDb negative cache (titles with no match)
+# ─────────────────────────────────────────────────────────────────────────────
+class NotFoundEntry(TypedDict):
+    media_type: str
+    title_key: str
+    year: int
+    title: str
+    misses: int
+    first_seen: str
+    last_seen: str
+    expires_at: str
+
+async def is_tmdb_not_found(media_type: str, title_key: str, year: int) -> bool:
+    """True while an unexpired not-found entry exists for the title."""
+    pool = await get_pg_pool()
+    row = await pool.fetchrow(
+        """
+        SELECT 1
+          FROM tmdb_not_found
+         WHERE media_type = $1
+           AND title_key = $2
+           AND year = $3
+           AND expires_at > now()
+        """,
+        media_type, title_key, year
+    )
+    return row is not None
+
+async def put_tmdb_not_found(
+    media_type: str,
+    title_key: str,
+    year: int,
+    title: str,
+    ttl_seconds: int,
+) -> None:
+    """Record (or extend) a title TMDb had no match for."""
+    pool = await get_pg_pool()
+    await pool.execute(
+        """
+        INSERT INTO tmdb_not_found (media_type, title_key, year, title, expires_at)
+        VALUES ($1, $2, $3, $4, now() + make_interval(secs => $5))
+        ON CONFLICT (media_type, title_key, year)
+        DO UPDATE SET
+            title=EXCLUDED.title,
+            misses=tmdb_not_found.misses + 1,
+            last_seen=now(),
+            expires_at=EXCLUDED.expires_at;
+        """,
+        media_type, title_key, year, title, float(ttl_seconds)
+    )
+
+async def list_tmdb_not_found(
+    media_type: Optional[str] = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> List[NotFoundEntry]:
+    """Unexpired not-found entries, most recently missed first."""
+    pool = await get_pg_pool()
+    rows = await pool.fetch(
+        """
+        SELECT media_type, title_key, year, title, misses,
+               first_seen, last_seen, expires_at
+          FROM tmdb_not_found
+         WHERE ($1::text IS NULL OR media_type = $1)
+           AND expires_at > now()
+         ORDER BY last_seen DESC
+         LIMIT $2 OFFSET $3
+        """,
+        media_type, limit, offset
+    )
+    return [
+        {
+            **dict(r),
+            "first_seen": r["first_seen"].isoformat(),
+            "last_seen":  r["last_seen"].isoformat(),
+            "expires_at": r["expires_at"].isoformat(),
+        }
+        for r in rows
+    ]
+
+async def purge_tmdb_not_found(
+    media_type: Optional[str] = None,
+    title_key: Optional[str] = None,
+) -> int:
+    """
+    Delete not-found entries (all, one media type, or one title) along with
+    any that have expired; returns rows removed.
+    """
+    pool = await get_pg_pool()
+    status = await pool.execute(
+        """
+        DELETE FROM tmdb_not_found
+         WHERE ($1::text IS NULL OR media_type = $1)
+           AND ($2::text IS NULL OR title_key = $2)
+            OR expires_at <= now()
+        """,
+        media_type, title_key
+    )
+    return int(status.split()[-1])
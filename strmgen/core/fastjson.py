@@ -0,0 +1,23 @@
+# strmgen/core/fastjson.py
+"""
+JSON decoding for large upstream payloads.
+
+Uses orjson when it is installed (it parses bytes directly, without first
+decoding them to a str) and the standard library otherwise.
+"""
+import json
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional; json is the fallback
+    orjson = None  # type: ignore[assignment]
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,307 @@
+# strmgen/core/manifest.py
+"""
+In-memory manifest of the output tree.
+
+At the start of a run ``output_root`` is scanned once (``os.scandir``,
+one stat per file) into a map of path → size, mtime and, once known, a
+content hash. Existence and up-to-date checks read the manifest instead of
+the disk, and every writer records what it wrote or removed, so on a
+network-mounted output root a stream costs no round trips beyond the
+writes themselves.
+
+Content hashes are kept between runs in ``<output_root>/.strmgen-manifest.json``
+and reused for files whose size and mtime have not changed since, so
+up-to-date checks do not read files back either.
+
+Outside a run, or for paths outside ``output_root``, the helpers fall back
+to the filesystem. Changes made behind the pipeline's back during a run
+are not seen until the next scan; ``output_manifest_enabled`` turns the
+manifest off.
+
+Writers run in ``run_fs`` worker threads, so updates take a lock; lookups
+are single dict/set reads and do not. Each folder keeps an index of its
+entries, so forgetting a removed folder costs the size of that folder, not
+of the whole tree.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from strmgen.core import fastjson
+from strmgen.core.config import get_settings
+from strmgen.core.concurrency import run_fs
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+SIDECAR = ".strmgen-manifest.json"
+
+
+def digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class Entry:
+    __slots__ = ("size", "mtime_ns", "digest")
+
+    def __init__(self, size: int, mtime_ns: int, digest: Optional[bytes] = None):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+
+
+class OutputManifest:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._root: Optional[str] = None
+        self._files: Dict[str, Entry] = {}
+        self._dirs: Set[str] = set()
+        self._children: Dict[str, Set[str]] = {}     # folder → files and folders in it
+        self._counts: Counter[str] = Counter()
+        self.scan_seconds = 0.0
+
+    # ── lifecycle ────────────────────────────────────────────────────────
+    @property
+    def active(self) -> bool:
+        return self._root is not None
+
+    async def load(self, root: Optional[PathLike]) -> None:
+        """Scan ``root`` and serve checks from the result until ``clear()``."""
+        self.clear()
+        if not root or not get_settings().output_manifest_enabled:
+            return
+        root = str(Path(root))
+        started = time.perf_counter()
+        files, dirs, children = await run_fs(_scan, root)
+        hashed = await run_fs(_load_digests, root, files)
+        with self._lock:
+            self._files, self._dirs, self._children = files, dirs, children
+            self._root = root
+        self.scan_seconds = time.perf_counter() - started
+        logger.info(
+            "[FS] Output manifest: %d files (%d with known content) in %d folders under %s (%.2fs)",
+            len(files), hashed, len(dirs), root, self.scan_seconds,
+        )
+
+    async def save(self) -> None:
+        """Keep the known content hashes for the next run's scan."""
+        if self._root is not None:
+            with self._lock:
+                files = dict(self._files)
+            await run_fs(_save_digests, self._root, files)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._root = None
+            self._files = {}
+            self._dirs = set()
+            self._children = {}
+        self._counts.clear()
+        self.scan_seconds = 0.0
+
+    def _covers(self, key: str) -> bool:
+        root = self._root
+        return root is not None and (key == root or key.startswith(root + os.sep))
+
+    # ── queries (sync: for code already running in a worker thread) ─────
+    def has_file(self, path: PathLike) -> bool:
+        key = str(path)
+        if not self._covers(key):
+            self._counts["disk"] += 1
+            return os.path.isfile(key)
+        self._counts["hit"] += 1
+        return key in self._files
+
+    def has_path(self, path: PathLike) -> bool:
+        key = str(path)
+        if not self._covers(key):
+            self._counts["disk"] += 1
+            return os.path.exists(key)
+        self._counts["hit"] += 1
+        return key in self._files or key in self._dirs
+
+    def same_content(self, path: PathLike, data: bytes) -> bool:
+        """
+        True when ``path`` already holds ``data``. Size and, once known, the
+        hash come from the manifest; a file of matching size whose hash is
+        not yet known is read once and its hash remembered.
+        """
+        key = str(path)
+        if self._covers(key):
+            entry = self._files.get(key)
+            if entry is None or entry.size != len(data):
+                self._counts["hit"] += 1
+                return False
+            if entry.digest is not None:
+                self._counts["hit"] += 1
+                return entry.digest == digest(data)
+        self._counts["disk"] += 1
+        try:
+            if os.stat(key).st_size != len(data):
+                return False
+            existing = Path(key).read_bytes()
+        except FileNotFoundError:
+            return False
+        entry = self._files.get(key) if self._covers(key) else None
+        if entry is not None:
+            entry.digest = digest(existing)
+        return existing == data
+
+    def ensure_dir(self, path: PathLike) -> None:
+        """mkdir -p, skipped for folders the manifest already knows."""
+        key = str(path)
+        if key in self._dirs:
+            return
+        Path(key).mkdir(parents=True, exist_ok=True)
+        # the folder and every parent up to the root exist now
+        with self._lock:
+            if self._covers(key) and key not in self._dirs:
+                self._dirs.add(key)
+                self._link(key)
+
+    def _link(self, key: str) -> None:
+        """Index ``key`` in its folder, and missing folders up to the root; lock held."""
+        while key != self._root:
+            parent = os.path.dirname(key)
+            self._children.setdefault(parent, set()).add(key)
+            if parent in self._dirs:
+                return
+            self._dirs.add(parent)
+            key = parent
+
+    # ── updates ──────────────────────────────────────────────────────────
+    def wrote(self, path: PathLike, data: Optional[bytes] = None) -> None:
+        """Record a file just written, with its content when the caller has it."""
+        key = str(path)
+        if not self._covers(key):
+            return
+        try:
+            # the real mtime, so the next run's scan can match the stored hash
+            st = os.stat(key)
+        except OSError:
+            self.removed(key)
+            return
+        entry = Entry(st.st_size, st.st_mtime_ns, digest(data) if data is not None else None)
+        with self._lock:
+            if not self._covers(key):
+                return
+            self._files[key] = entry
+            self._link(key)
+
+    def removed(self, path: PathLike) -> None:
+        """Forget ``path`` and, for a folder, everything below it."""
+        key = str(path)
+        if not self._covers(key):
+            return
+        with self._lock:
+            siblings = self._children.get(os.path.dirname(key))
+            if siblings is not None:
+                siblings.discard(key)
+            stack = [key]
+            while stack:
+                k = stack.pop()
+                self._files.pop(k, None)
+                if k in self._dirs:
+                    self._dirs.discard(k)
+                    stack.extend(self._children.pop(k, ()))
+
+    # ── async helpers for the event loop ─────────────────────────────────
+    async def exists(self, path: PathLike) -> bool:
+        """Whether a file or folder exists; no thread hop when the manifest covers it."""
+        if self._covers(str(path)):
+            return self.has_path(path)
+        return await run_fs(self.has_path, path)
+
+    # ── introspection ────────────────────────────────────────────────────
+    def files_under(self, path: PathLike) -> List[str]:
+        out: List[str] = []
+        with self._lock:
+            stack = list(self._children.get(str(path), ()))
+            while stack:
+                k = stack.pop()
+                if k in self._files:
+                    out.append(k)
+                stack.extend(self._children.get(k, ()))
+        return out
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "files":        len(self._files),
+            "dirs":         len(self._dirs),
+            "scan_seconds": round(self.scan_seconds, 3),
+            "hits":         self._counts["hit"],
+            "disk_checks":  self._counts["disk"],
+        }
+
+
+def _scan(root: str) -> Tuple[Dict[str, Entry], Set[str], Dict[str, Set[str]]]:
+    files: Dict[str, Entry] = {}
+    dirs: Set[str] = {root} if os.path.isdir(root) else set()
+    children: Dict[str, Set[str]] = {}
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                kids = children.setdefault(folder, set())
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.add(entry.path)
+                            kids.add(entry.path)
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            files[entry.path] = Entry(st.st_size, st.st_mtime_ns)
+                            kids.add(entry.path)
+                    except OSError as e:
+                        logger.warning("[FS] Manifest scan skipped %s: %s", entry.path, e)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.warning("[FS] Manifest scan could not list %s: %s", folder, e)
+    return files, dirs, children
+
+
+def _load_digests(root: str, files: Dict[str, Entry]) -> int:
+    """Attach stored hashes to files whose size and mtime still match; returns how many."""
+    try:
+        stored = fastjson.loads(Path(root, SIDECAR).read_bytes())
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError) as e:
+        logger.warning("[FS] Ignoring unreadable %s: %s", SIDECAR, e)
+        return 0
+    hashed = 0
+    for rel, (size, mtime_ns, hexdigest) in stored.items():
+        entry = files.get(os.path.join(root, rel))
+        if entry is not None and entry.size == size and entry.mtime_ns == mtime_ns:
+            entry.digest = bytes.fromhex(hexdigest)
+            hashed += 1
+    return hashed
+
+
+def _save_digests(root: str, files: Dict[str, Entry]) -> None:
+    start = len(root) + 1
+    stored = {
+        key[start:]: [e.size, e.mtime_ns, e.digest.hex()]
+        for key, e in list(files.items()) if e.digest is not None
+    }
+    path = Path(root, SIDECAR)
+    tmp = path.with_name(f"{SIDECAR}.tmp")
+    try:
+        tmp.write_text(json.dumps(stored, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("[FS] Could not save %s: %s", SIDECAR, e)
+
+
+output_manifest = OutputManifest()
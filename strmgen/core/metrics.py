@@ -0,0 +1,176 @@
+# strmgen/core/metrics.py
+"""
+Prometheus metrics for upstream HTTP traffic, concurrency budgets,
+pipeline outcomes and filesystem work. Exposed at /metrics.
+"""
+import re
+import time
+
+from typing import Any, Callable, Dict, Iterator, List
+
+import httpx
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# ─── Upstream HTTP ──────────────────────────────────────────────────────────
+HTTP_REQUESTS = Counter(
+    "strmgen_http_requests_total",
+    "Upstream HTTP responses by endpoint template and status code",
+    ["upstream", "endpoint", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "strmgen_http_request_duration_seconds",
+    "Upstream HTTP latency until response headers",
+    ["upstream", "endpoint"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16),
+)
+TMDB_COALESCED = Counter(
+    "strmgen_tmdb_coalesced_total",
+    "TMDb calls answered by an identical request already in flight",
+)
+TMDB_CACHE = Counter(
+    "strmgen_tmdb_cache_total",
+    "TMDb response cache lookups and writes by result",
+    ["result"],
+)
+TMDB_NOT_FOUND = Counter(
+    "strmgen_tmdb_not_found_total",
+    "TMDb negative cache: searches avoided for known-missing titles, titles recorded",
+    ["result"],
+)
+TMDB_DETAIL_REQUESTS_SAVED = Counter(
+    "strmgen_tmdb_detail_requests_saved_total",
+    "Movie detail requests avoided by ranking search results before fetching details",
+)
+ARTWORK = Counter(
+    "strmgen_artwork_total",
+    "Artwork store downloads, reuses and placements by result",
+    ["result"],
+)
+ARTWORK_BYTES = Counter(
+    "strmgen_artwork_downloaded_bytes_total",
+    "Bytes of artwork downloaded into the store",
+)
+TMDB_RATE_LIMIT_WAIT = Histogram(
+    "strmgen_tmdb_rate_limit_wait_seconds",
+    "Time spent waiting on the TMDb traffic scheduler, by priority lane",
+    ["lane"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10),
+)
+
+# ─── Pipeline ───────────────────────────────────────────────────────────────
+STREAMS = Counter(
+    "strmgen_streams_total",
+    "Streams handled by the pipeline, by category and outcome",
+    ["category", "outcome"],
+)
+STREAM_QUEUE_DEPTH = Gauge(
+    "strmgen_stream_queue_depth",
+    "Streams waiting in a group's work queue",
+    ["group"],
+)
+
+SIDE_TASKS = Counter(
+    "strmgen_side_tasks_total",
+    "Artwork and subtitle side tasks by kind and outcome",
+    ["kind", "outcome"],
+)
+SIDE_TASK_BACKLOG = Gauge(
+    "strmgen_side_task_backlog",
+    "Side tasks queued and not yet started",
+)
+
+# ─── Filesystem ─────────────────────────────────────────────────────────────
+FS_OP_SECONDS = Histogram(
+    "strmgen_fs_op_duration_seconds",
+    "Blocking filesystem jobs run under the fs budget",
+    ["op"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+FILES_WRITTEN = Counter(
+    "strmgen_files_written_total",
+    "Output files handled by bulk writes, by outcome (written, unchanged, failed)",
+    ["outcome"],
+)
+BYTES_WRITTEN = Counter(
+    "strmgen_bytes_written_total",
+    "Bytes written to output files by bulk writes",
+)
+FS_QUEUE_DEPTH = Gauge(
+    "strmgen_fs_budget_waiting",
+    "Filesystem jobs waiting for an fs budget slot",
+)
+
+# ─── Endpoint templates ─────────────────────────────────────────────────────
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+_IMAGE_PATH = re.compile(r"^/[^/]+/[^/]+$")
+
+
+def endpoint_template(upstream: str, path: str) -> str:
+    """Collapse ids in a URL path so label cardinality stays bounded."""
+    if upstream == "tmdb_image" and _IMAGE_PATH.match(path):
+        return "/{size}/{image}"
+    path = _NUMERIC_SEGMENT.sub("/{id}", path)
+    if upstream == "emby" and path.startswith("/Items/"):
+        return "/Items/{id}/" + path.rsplit("/", 1)[-1]
+    return path
+
+
+def http_event_hooks(upstream: str) -> Dict[str, List[Callable[..., Any]]]:
+    """httpx event hooks recording request counts, status codes and latency."""
+
+    async def on_request(request: httpx.Request) -> None:
+        request.extensions["strmgen_started"] = time.perf_counter()
+
+    async def on_response(response: httpx.Response) -> None:
+        request = response.request
+        source = upstream
+        if upstream == "dispatcharr" and not request.url.path.startswith("/api/"):
+            # stream URLs (liveness checks) are unique per stream and can carry
+            # provider credentials; only Dispatcharr API routes are templated
+            source, endpoint = "stream", f"stream_{request.method.lower()}"
+        else:
+            endpoint = endpoint_template(upstream, request.url.path)
+        started = request.extensions.get("strmgen_started")
+        if started is not None:
+            HTTP_LATENCY.labels(source, endpoint).observe(time.perf_counter() - started)
+        HTTP_REQUESTS.labels(source, endpoint, str(response.status_code)).inc()
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def record_stream(category: str, outcome: str, count: int = 1) -> None:
+    STREAMS.labels(category, outcome).inc(count)
+
+
+# ─── Adaptive budgets (read at scrape time) ─────────────────────────────────
+class _BudgetCollector:
+    def describe(self) -> List[Any]:
+        # budgets are created after this module loads; skip registration-time collect
+        return []
+
+    def collect(self) -> Iterator[Any]:
+        from strmgen.core.concurrency import budget_stats
+
+        limit = GaugeMetricFamily("strmgen_budget_limit", "Current adaptive concurrency limit", labels=["budget"])
+        in_flight = GaugeMetricFamily("strmgen_budget_in_flight", "Requests holding a budget slot", labels=["budget"])
+        waiting = GaugeMetricFamily("strmgen_budget_waiting", "Requests queued for a budget slot", labels=["budget"])
+        throttled = CounterMetricFamily("strmgen_budget_throttled", "429/5xx responses seen by a budget", labels=["budget"])
+        errors = CounterMetricFamily("strmgen_budget_errors", "Timeouts and transport errors seen by a budget", labels=["budget"])
+        for s in budget_stats():
+            limit.add_metric([s["name"]], s["limit"])
+            in_flight.add_metric([s["name"]], s["in_flight"])
+            waiting.add_metric([s["name"]], s["waiting"])
+            throttled.add_metric([s["name"]], s["throttled"])
+            errors.add_metric([s["name"]], s["errors"])
+        yield from (limit, in_flight, waiting, throttled, errors)
+
+        from strmgen.core.tmdb_traffic import tmdb_traffic
+
+        lane_waiting = GaugeMetricFamily("strmgen_tmdb_lane_waiting", "TMDb requests queued per priority lane", labels=["lane"])
+        for lane, s in tmdb_traffic.stats()["lanes"].items():
+            lane_waiting.add_metric([lane], s["waiting"])
+        yield lane_waiting
+
+
+REGISTRY.register(_BudgetCollector())
@@ -1,7 +1,9 @@
 # strmgen/core/models/dispatcharr.py
+import logging
+
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 from pathlib import Path
 
 from strmgen.core.config import get_settings
@@ -11,7 +13,17 @@ from strmgen.core.models.models import StreamInfo
 from strmgen.core.models.enums import MediaType
 from strmgen.core.models.regex import TITLE_YEAR_RE, RE_EPISODE_TAG
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+class StreamPaths(NamedTuple):
+    base:     Path
+    strm:     Path
+    nfo:      Path
+    poster:   Path
+    backdrop: Path
+
+
+@dataclass(slots=True)
 class DispatcharrStream:
     # ── Raw API fields ─────────────────────────────────────────────────────────
     id: int
@@ -35,14 +47,36 @@ class DispatcharrStream:
     season:  Optional[int]            = field(default=None, repr=False)
     episode: Optional[int]            = field(default=None, repr=False)
 
-    # ── Computed paths ─────────────────────────────────────────────────────────
-    base_path:     Path               = field(init=False, repr=False)
-    strm_path:     Path               = field(init=False, repr=False)
-    nfo_path:      Path               = field(init=False, repr=False)
-    poster_path:   Path               = field(init=False, repr=False)
-    backdrop_path: Path               = field(init=False, repr=False)
+    # ── Computed paths: built on first use, never touching the disk ───────────
+    _paths: Optional[StreamPaths]     = field(default=None, init=False, repr=False, compare=False)
 
-    def __post_init__(self):
+    @property
+    def paths(self) -> StreamPaths:
+        if self._paths is None:
+            self._paths = self._compute_paths()
+        return self._paths
+
+    @property
+    def base_path(self) -> Path:
+        return self.paths.base
+
+    @property
+    def strm_path(self) -> Path:
+        return self.paths.strm
+
+    @property
+    def nfo_path(self) -> Path:
+        return self.paths.nfo
+
+    @property
+    def poster_path(self) -> Path:
+        return self.paths.poster
+
+    @property
+    def backdrop_path(self) -> Path:
+        return self.paths.backdrop
+
+    def _compute_paths(self) -> StreamPaths:
         info = StreamInfo(
             group   = self.channel_group_name,
             title   = self.name,
@@ -50,39 +84,13 @@ class DispatcharrStream:
             season  = self.season,
             episode = self.episode,
         )
-
-        if self.stream_type is MediaType.TV:
-            if info.season is not None and info.episode is not None:
-                self.base_path     = MediaPaths.season_folder(info)
-                self.strm_path     = MediaPaths.episode_strm(info)
-                self.nfo_path      = MediaPaths.episode_nfo(info)
-                self.poster_path   = MediaPaths.episode_image(info)
-                self.backdrop_path = MediaPaths.season_poster(info)
-            else:
-                self.base_path     = MediaPaths._base_folder(
-                                        MediaType.TV,
-                                        info.group,
-                                        info.title,
-                                        None
-                                     )
-                self.strm_path     = Path()
-                self.nfo_path      = MediaPaths.show_nfo(info)
-                self.poster_path   = MediaPaths.show_image(info, "poster.jpg")
-                self.backdrop_path = MediaPaths.show_image(info, "fanart.jpg")
-        else:
-            self.base_path     = MediaPaths._base_folder(
-                                    MediaType.MOVIE,
-                                    info.group,
-                                    info.title,
-                                    info.year
-                                 )
-            self.strm_path     = MediaPaths.movie_strm(info)
-            self.nfo_path      = MediaPaths.movie_nfo(info)
-            self.poster_path   = MediaPaths.movie_poster(info)
-            self.backdrop_path = MediaPaths.movie_backdrop(info)
+        # movies and 24/7 channels share the movie layout
+        media_type = MediaType.TV if self.stream_type is MediaType.TV else MediaType.MOVIE
+        return StreamPaths(*MediaPaths.stream_paths(media_type, info))
 
     def _recompute_paths(self):
-        self.__post_init__()
+        """Forget cached paths after the name, year, season or group changed."""
+        self._paths = None
 
     @property
     def proxy_url(self) -> str:
@@ -92,6 +100,11 @@ class DispatcharrStream:
         url = f"{settings.api_base.rstrip('/')}/{settings.stream_base_url}/{self.stream_hash}"
         return fix_url_string(url)
 
+    @property
+    def fingerprint(self) -> tuple[str, str]:
+        """Upstream identity of the stream content; a change means it must be reprocessed."""
+        return (self.stream_hash, self.url)
+
     @property
     def stream_updated(self) -> bool:
         settings = get_settings()
@@ -112,65 +125,108 @@ class DispatcharrStream:
         channel_group_name: str,
         stream_type: MediaType
     ) -> Optional["DispatcharrStream"]:
-        raw_name = str(data.get("name") or "")
-
-        if stream_type is MediaType.MOVIE:
-            m = TITLE_YEAR_RE.match(raw_name)
-            if m:
-                title = clean_name(m.group("title"))
-                year  = int(m.group("year"))
-            else:
-                title = clean_name(raw_name)
-                year  = None
-            season = episode = None
-        else:
-            match = RE_EPISODE_TAG.match(raw_name)
-            if not match:
-                return None
-            raw_show, ss, ee = match.groups()
-            title   = clean_name(raw_show)
-            year    = None
-            season  = int(ss)
-            episode = int(ee)
-
-        # common fields
-        url             = str(data.get("url") or "")
-        m3u_account     = int(data.get("m3u_account") or 0)
-        logo_url        = str(data.get("logo_url") or "")
-        tvg_id          = str(data.get("tvg_id") or "")
-        channel_group   = int(data.get("channel_group") or 0)
-        stream_hash     = str(data.get("stream_hash") or "")
-        local_file_val  = data.get("local_file")
-        local_file      = Path(str(local_file_val)) if local_file_val else None
-
-        ts = data.get("updated_at")
-        updated_at = None
-        if ts:
-            for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
-                try:
-                    updated_at = datetime.strptime(str(ts), fmt)\
-                                     .replace(tzinfo=timezone.utc)
-                    break
-                except ValueError:
+        parsed = _parse_name(str(data.get("name") or ""), stream_type)
+        if parsed is None:
+            return None
+        return cls._build(data, parsed, _parse_timestamp(data.get("updated_at")),
+                          channel_group_name, stream_type)
+
+    @classmethod
+    def from_page(
+        cls,
+        items: Iterable[Dict[str, Any]],
+        channel_group_name: str,
+        stream_type: MediaType
+    ) -> List["DispatcharrStream"]:
+        """
+        Build the streams of one listing page in a single pass. Items whose
+        name does not parse are left out, as with ``from_dict``; timestamps
+        are parsed once per distinct value (a playlist refresh stamps
+        thousands of streams alike).
+        """
+        stamps: Dict[Any, Optional[datetime]] = {}
+        out: List[DispatcharrStream] = []
+        for data in items:
+            try:
+                parsed = _parse_name(str(data.get("name") or ""), stream_type)
+                if parsed is None:
                     continue
+                ts = data.get("updated_at")
+                updated_at = stamps.get(ts)
+                if updated_at is None and ts not in stamps:
+                    updated_at = stamps[ts] = _parse_timestamp(ts)
+                out.append(cls._build(data, parsed, updated_at, channel_group_name, stream_type))
+            except Exception as e:
+                logger.error("Failed to parse DispatcharrStream for %s: %s", data, e)
+        return out
 
+    @classmethod
+    def _build(
+        cls,
+        data: Dict[str, Any],
+        parsed: "_ParsedName",
+        updated_at: Optional[datetime],
+        channel_group_name: str,
+        stream_type: MediaType
+    ) -> "DispatcharrStream":
+        title, year, season, episode = parsed
+        get = data.get
+        local_file_val = get("local_file")
         return cls(
             id                  = int(data["id"]),
             name                = title,
             year                = year,
-            url                 = url,
-            m3u_account         = m3u_account,
-            logo_url            = logo_url,
-            tvg_id              = tvg_id,
-            local_file          = local_file,
-            current_viewers     = int(data.get("current_viewers") or 0),
+            url                 = str(get("url") or ""),
+            m3u_account         = int(get("m3u_account") or 0),
+            logo_url            = str(get("logo_url") or ""),
+            tvg_id              = str(get("tvg_id") or ""),
+            local_file          = Path(str(local_file_val)) if local_file_val else None,
+            current_viewers     = int(get("current_viewers") or 0),
             updated_at          = updated_at,
-            stream_profile_id   = data.get("stream_profile_id"),
-            is_custom           = bool(data.get("is_custom", False)),
-            channel_group       = channel_group,
+            stream_profile_id   = get("stream_profile_id"),
+            is_custom           = bool(get("is_custom", False)),
+            channel_group       = int(get("channel_group") or 0),
             channel_group_name  = channel_group_name,
-            stream_hash         = stream_hash,
+            stream_hash         = str(get("stream_hash") or ""),
             stream_type         = stream_type,
             season              = season,
             episode             = episode,
         )
+
+
+# (title, year, season, episode)
+_ParsedName = Tuple[str, Optional[int], Optional[int], Optional[int]]
+
+
+def _parse_name(raw_name: str, stream_type: MediaType) -> Optional[_ParsedName]:
+    """Title and year of a movie, or show, season and episode; None for an untagged episode."""
+    if stream_type is MediaType.MOVIE:
+        m = TITLE_YEAR_RE.match(raw_name)
+        if m:
+            return clean_name(m.group("title")), int(m.group("year")), None, None
+        return clean_name(raw_name), None, None, None
+
+    match = RE_EPISODE_TAG.match(raw_name)
+    if not match:
+        return None
+    raw_show, ss, ee = match.groups()
+    return clean_name(raw_show), None, int(ss), int(ee)
+
+
+def _parse_timestamp(ts: Any) -> Optional[datetime]:
+    if not ts:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(ts))
+    except ValueError:
+        for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
+            try:
+                parsed = datetime.strptime(str(ts), fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
@@ -1,5 +1,5 @@
 # strmgen/core/models/paths.py
-from typing import Optional
+from typing import Optional, Tuple
 from pathlib import Path
 
 from strmgen.core.config import get_settings
@@ -27,12 +27,18 @@ class MediaPaths:
         """
         Construct the base folder for the given media type, group, title, and optional year.
         """
-        root = cls._root()
+        return cls._root().joinpath(media_type.value, group, cls.folder_name(media_type, title, year))
+
+    @classmethod
+    def folder_name(cls, media_type: MediaType, title: str, year: Optional[int] = None) -> str:
+        """Name of a title's folder inside its group folder."""
         if media_type is MediaType.MOVIE:
-            folder_name = f"{title} ({year})" if year else title
-        else:
-            folder_name = title
-        return root / media_type.value / group / folder_name
+            return f"{title} ({year})" if year else title
+        return title
+
+    @classmethod
+    def group_folder(cls, media_type: MediaType, group: str) -> Path:
+        return cls._root().joinpath(media_type.value, group)
 
     @classmethod
     def _file_path(
@@ -85,9 +91,8 @@ class MediaPaths:
     def season_folder(cls, stream: StreamInfo) -> Path:
         assert stream.season is not None, "season required"
         base = cls._base_folder(MediaType.TV, stream.group, stream.title, None)
-        season_folder = base / f"Season {stream.season:02d}"
-        season_folder.mkdir(parents=True, exist_ok=True)
-        return season_folder
+        # only the path: whoever writes into the folder creates it
+        return base / f"Season {stream.season:02d}"
 
     @classmethod
     def season_poster(cls, stream: StreamInfo) -> Path:
@@ -113,3 +118,41 @@ class MediaPaths:
         sf = cls.season_folder(stream)
         base = f"{stream.title} - S{stream.season:02d}E{stream.episode:02d}"
         return sf / f"{base}.jpg"
+
+    # ── All paths of one stream ──────────────────────────────────────────────────
+
+    @classmethod
+    def stream_paths(
+        cls, media_type: MediaType, stream: StreamInfo
+    ) -> Tuple[Path, Path, Path, Path, Path]:
+        """
+        Base folder, .strm, .nfo, poster and backdrop of a stream, joined
+        onto one base folder; the same paths as the helpers above.
+        """
+        if media_type is MediaType.MOVIE:
+            base = cls._base_folder(MediaType.MOVIE, stream.group, stream.title, stream.year)
+            return (
+                base,
+                base / f"{stream.title}.strm",
+                base / f"{stream.title}.nfo",
+                base / "poster.jpg",
+                base / "fanart.jpg",
+            )
+        show = cls._base_folder(MediaType.TV, stream.group, stream.title, None)
+        if stream.season is None or stream.episode is None:
+            return (
+                show,
+                Path(),
+                show / f"{stream.title}.nfo",
+                show / "poster.jpg",
+                show / "fanart.jpg",
+            )
+        season = show / f"Season {stream.season:02d}"
+        episode = f"{stream.title} - S{stream.season:02d}E{stream.episode:02d}"
+        return (
+            season,
+            season / f"{episode}.strm",
+            season / f"{episode}.nfo",
+            season / f"{episode}.jpg",
+            season / f"Season {stream.season:02d}.tbn",
+        )
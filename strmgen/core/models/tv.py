@@ -33,6 +33,9 @@ class TVShow:
     external_ids: Dict[str, Any]
     raw: Dict[str, Any]
 
+    # — season payloads fetched along with the show (season → raw TMDb season) —
+    seasons: Dict[int, Dict[str, Any]] = field(default_factory=dict, repr=False)
+
     # — computed paths (init=False so you don’t pass them in) —
     show_folder:         Path = field(init=False, repr=False)
     show_nfo_path:       Path = field(init=False, repr=False)
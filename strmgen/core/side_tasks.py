@@ -0,0 +1,138 @@
+# strmgen/core/side_tasks.py
+"""
+Bounded executor for pipeline side work (artwork, subtitles).
+
+Stream handlers hand off work they do not need to wait for with
+``await side_tasks.submit(kind, fn, *args)``. Jobs run on a fixed pool of
+``side_task_workers``; the backlog holds at most ``side_task_backlog``
+jobs, and ``submit`` blocks while it is full, so a slow artwork or
+subtitle upstream slows the producers down instead of piling up tasks.
+
+A run calls ``finish()`` on its way out: a completed run waits for the
+backlog to drain; a cancelled one gets ``side_task_drain_seconds`` of
+grace, after which the rest is dropped and counted. The pool is then shut
+down, and the next run's first ``submit`` starts it with the settings
+current at that time.
+"""
+import asyncio
+import logging
+
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from strmgen.core.config import get_settings
+from strmgen.core.metrics import SIDE_TASK_BACKLOG, SIDE_TASKS
+
+logger = logging.getLogger(__name__)
+
+_Job = Tuple[str, Callable[..., Awaitable[Any]], Tuple[Any, ...]]
+
+
+class SideTasks:
+    def __init__(self) -> None:
+        self.workers = 0
+        self.backlog = 0
+        self._queue: Optional["asyncio.Queue[_Job]"] = None
+        self._workers: List["asyncio.Task[None]"] = []
+        self._running = 0
+        self._counts: Dict[str, Counter[str]] = {}
+
+    # ── producers ────────────────────────────────────────────────────────
+    async def submit(self, kind: str, fn: Callable[..., Awaitable[Any]], *args: Any) -> None:
+        """Queue ``fn(*args)``; waits while the backlog is full."""
+        queue = self._start()
+        self._count(kind, "submitted")
+        await queue.put((kind, fn, args))
+        SIDE_TASK_BACKLOG.set(queue.qsize())
+
+    def _start(self) -> "asyncio.Queue[_Job]":
+        # created lazily: the queue and workers need the running loop
+        if self._queue is None:
+            settings = get_settings()
+            self.workers = max(1, settings.side_task_workers)
+            self.backlog = max(1, settings.side_task_backlog)
+            self._queue = asyncio.Queue(maxsize=self.backlog)
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        return self._queue
+
+    # ── workers ──────────────────────────────────────────────────────────
+    async def _worker(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            kind, fn, args = await queue.get()
+            SIDE_TASK_BACKLOG.set(queue.qsize())
+            self._running += 1
+            try:
+                await fn(*args)
+                self._count(kind, "done")
+            except asyncio.CancelledError:
+                self._count(kind, "dropped")
+                raise
+            except Exception:
+                self._count(kind, "failed")
+                logger.exception("[SIDE] %s task failed", kind)
+            finally:
+                self._running -= 1
+                queue.task_done()
+
+    # ── end of run ───────────────────────────────────────────────────────
+    async def finish(self, cancelled: bool = False) -> None:
+        """
+        Drain the backlog. For a cancelled or failed run the drain is limited to
+        ``side_task_drain_seconds``; whatever is left is dropped.
+        """
+        if self._queue is None:
+            return
+        pending = self._queue.qsize() + self._running
+        if pending:
+            timeout = get_settings().side_task_drain_seconds if cancelled else None
+            logger.info("[SIDE] Waiting for %d side task(s) to finish", pending)
+            try:
+                await asyncio.wait_for(asyncio.shield(self._queue.join()), timeout)
+            except asyncio.TimeoutError:
+                await self._abort()
+        await self._stop()
+
+    async def _stop(self) -> None:
+        """Stop the idle workers; the next submit starts a fresh pool."""
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queue = None
+
+    async def _abort(self) -> None:
+        assert self._queue is not None
+        dropped = 0
+        while not self._queue.empty():
+            kind, _, _ = self._queue.get_nowait()
+            self._queue.task_done()
+            self._count(kind, "dropped")
+            dropped += 1
+        # in-flight jobs count themselves as dropped when cancelled
+        dropped += self._running
+        await self._stop()
+        SIDE_TASK_BACKLOG.set(0)
+        logger.warning("[SIDE] Dropped %d side task(s) after the drain timeout", dropped)
+
+    # ── introspection ────────────────────────────────────────────────────
+    def _count(self, kind: str, outcome: str) -> None:
+        self._counts.setdefault(kind, Counter())[outcome] += 1
+        SIDE_TASKS.labels(kind, outcome).inc()
+
+    def reset_stats(self) -> None:
+        self._counts.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers":  self.workers,
+            "backlog":  self._queue.qsize() if self._queue else 0,
+            "capacity": self.backlog,
+            "running":  self._running,
+            "tasks":    {kind: dict(c) for kind, c in self._counts.items()},
+        }
+
+
+side_tasks = SideTasks()
@@ -1,22 +1,97 @@
 # strmgen/core/string_utils.py
 
 import re
+
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence
 from urllib.parse import urlsplit, urlunsplit, quote, parse_qsl, urlencode
 
 from strmgen.core.config import get_settings
 
 # ─── Filename Utilities ───────────────────────────────────────────────────────
 
+# characters not allowed in file names on common filesystems
+_ILLEGAL_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+
+
+def _trie_pattern(tokens: Iterable[str]) -> str:
+    """Regex matching any of ``tokens``, built as a trie."""
+    trie: dict = {}
+    for token in tokens:
+        node = trie
+        for ch in token:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if "" in node:
+            # a token ends here
+            return f"(?:{'|'.join(branches)})?"
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    return build(trie)
+
+
+class NameNormalizer:
+    """
+    ``clean_name`` with compiled matchers and results memoized in a bounded LRU.
+
+    ``remove_strings`` tokens are still replaced one after another in their
+    configured order, so names come out exactly as before: overlapping
+    tokens ("UHD 4K", "4K") and text joined by an earlier removal depend on
+    that order. All tokens are compiled into one prefix trie ("EN| " and
+    "ES| " become ``E(?:N\\|\\ |S\\|\\ )``) that only answers whether a
+    name contains any token; names without one skip the replace loop.
+    """
+
+    def __init__(self, remove_strings: Sequence[str] = (), cache_size: int = 65536):
+        self.tokens = tuple(remove_strings)
+        self._replace = tuple(t for t in self.tokens if t)
+        self._any_token = re.compile(_trie_pattern(self._replace)) if self._replace else None
+        self.clean = lru_cache(maxsize=cache_size)(self._clean)
+
+    def _clean(self, name: str) -> str:
+        if self._any_token is not None and self._any_token.search(name):
+            for token in self._replace:
+                name = name.replace(token, "")
+        return _ILLEGAL_CHARS_RE.sub("", name).strip()
+
+    def clean_many(self, names: Iterable[str]) -> List[str]:
+        clean = self.clean
+        return [clean(n) for n in names]
+
+
+_normalizer: Optional[NameNormalizer] = None
+# the settings.remove_strings list _normalizer was last checked against
+_source: Optional[List[str]] = None
+
+
+def name_normalizer() -> NameNormalizer:
+    """
+    The normalizer for the current ``remove_strings``. Saving settings
+    replaces the list, so an identity check is enough on the hot path; the
+    matcher is only recompiled when the tokens actually changed.
+    """
+    global _normalizer, _source
+    tokens = get_settings().remove_strings
+    if _normalizer is None or tokens is not _source:
+        if _normalizer is None or tuple(tokens or ()) != _normalizer.tokens:
+            _normalizer = NameNormalizer(tokens or ())
+        _source = tokens
+    return _normalizer
+
+
 def clean_name(name: str) -> str:
     """Sanitize and strip optional tokens from a name, then trim surrounding spaces."""
-    settings = get_settings()
-    if settings.remove_strings:
-        for token in settings.remove_strings:
-            name = name.replace(token, "")
-    # remove illegal filesystem characters
-    name = re.sub(r'[<>:"/\\|?*]', "", name)
-    # strip spaces before and after
-    return name.strip()
+    return name_normalizer().clean(name)
+
+
+def clean_names(names: Iterable[str]) -> List[str]:
+    """``clean_name`` for a batch of names, e.g. a whole page of streams."""
+    return name_normalizer().clean_many(names)
 
 
 def remove_prefixes(title: str) -> str:
@@ -0,0 +1,174 @@
+# strmgen/core/title_match.py
+"""
+Fuzzy title matching for TMDb candidates.
+
+Titles are normalized once (case, accents, punctuation, "&", roman
+numerals, leading articles) into a ``TitleKey`` of word tokens and
+character trigrams; keys are cached, so a title seen again costs a dict
+lookup. Similarity is set arithmetic on those keys, which tolerates
+reordered words and punctuation ("Star Wars: Episode IV" vs "Star Wars
+Episode 4") and is far cheaper than ``difflib.SequenceMatcher``.
+
+``rank`` scores a batch of candidates for one query and ``best_matches``
+ranks many queries against one candidate pool. Scoring is pluggable:
+any ``Scorer`` taking a ``Query`` and a TMDb record may be passed in;
+``default_scorer`` weighs title, original title, alternative titles and
+year.
+"""
+import re
+import unicodedata
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+_NON_WORD = re.compile(r"[^\w]+")
+_TRAILING_ARTICLE = re.compile(r",\s*(the|a|an)\s*$")
+_ARTICLES = frozenset({"the", "a", "an"})
+_ROMAN = {
+    "ii": "2", "iii": "3", "iv": "4", "v": "5", "vi": "6",
+    "vii": "7", "viii": "8", "ix": "9", "x": "10",
+}
+
+# Share of the title score given to trigram overlap; the rest is word overlap
+_TRIGRAM_WEIGHT = 0.6
+_TITLE_WEIGHT = 0.8
+_YEAR_WEIGHT = 0.2
+
+
+@dataclass(frozen=True)
+class TitleKey:
+    text:   str
+    tokens: FrozenSet[str]
+    grams:  FrozenSet[str]
+
+
+@dataclass(frozen=True)
+class Query:
+    key:  TitleKey
+    year: Optional[int] = None
+
+
+Scorer = Callable[[Query, Mapping[str, Any]], float]
+
+
+def normalize(title: str) -> str:
+    """Lower-case ASCII words separated by single spaces."""
+    text = title
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    text = text.lower()
+    text = _TRAILING_ARTICLE.sub("", text.replace("&", " and ").replace("_", " "))
+    words = [_ROMAN.get(w, w) for w in _NON_WORD.split(text) if w]
+    # "The Matrix" and "Matrix, The" should agree
+    if len(words) > 1 and words[0] in _ARTICLES:
+        words = words[1:]
+    return " ".join(words)
+
+
+@lru_cache(maxsize=65536)
+def title_key(title: str) -> TitleKey:
+    text = normalize(title)
+    padded = f"  {text} "
+    return TitleKey(
+        text=text,
+        tokens=frozenset(text.split()),
+        grams=frozenset(padded[i:i + 3] for i in range(len(padded) - 2)),
+    )
+
+
+def make_query(title: str, year: Optional[int] = None) -> Query:
+    return Query(title_key(title), year)
+
+
+def similarity(a: TitleKey, b: TitleKey) -> float:
+    """0..1 blend of trigram and word-token Dice overlap."""
+    if a.text == b.text:
+        return 1.0 if a.text else 0.0
+    grams = (2 * len(a.grams & b.grams) / (len(a.grams) + len(b.grams))) if a.grams and b.grams else 0.0
+    tokens = (2 * len(a.tokens & b.tokens) / (len(a.tokens) + len(b.tokens))) if a.tokens and b.tokens else 0.0
+    return _TRIGRAM_WEIGHT * grams + (1 - _TRIGRAM_WEIGHT) * tokens
+
+
+# ─── TMDb record helpers ────────────────────────────────────────────────────
+def record_titles(rec: Mapping[str, Any]) -> List[str]:
+    """Every title a movie or TV record is known by, primary first."""
+    titles = [
+        rec.get("title") or rec.get("name") or "",
+        rec.get("original_title") or rec.get("original_name") or "",
+    ]
+    alt = rec.get("alternative_titles") or {}
+    # movies list them under "titles", shows under "results"
+    titles += [t.get("title", "") for t in alt.get("titles") or alt.get("results") or ()]
+    return [t for t in titles if t]
+
+
+def record_year(rec: Mapping[str, Any]) -> Optional[int]:
+    date = rec.get("release_date") or rec.get("first_air_date")
+    # TMDb dates are "YYYY-MM-DD"; only the year is needed
+    if date and date[:4].isdigit():
+        return int(date[:4])
+    return None
+
+
+def title_score(query: Query, rec: Mapping[str, Any]) -> float:
+    """Best similarity between the query and any of the record's titles."""
+    return max((similarity(query.key, title_key(t)) for t in record_titles(rec)), default=0.0)
+
+
+def year_score(query: Query, rec: Mapping[str, Any]) -> float:
+    if query.year is None:
+        return 1.0
+    year = record_year(rec)
+    if year is None:
+        return 0.5
+    return {0: 1.0, 1: 0.5}.get(abs(year - query.year), 0.0)
+
+
+def default_scorer(query: Query, rec: Mapping[str, Any]) -> float:
+    return _TITLE_WEIGHT * title_score(query, rec) + _YEAR_WEIGHT * year_score(query, rec)
+
+
+# ─── Batch ranking ──────────────────────────────────────────────────────────
+def rank(
+    query: Query,
+    candidates: Iterable[Mapping[str, Any]],
+    scorer: Scorer = default_scorer,
+) -> List[Tuple[float, Mapping[str, Any]]]:
+    """Candidates with their scores, best first; popularity breaks ties."""
+    scored = [(scorer(query, c), c) for c in candidates]
+    scored.sort(key=lambda sc: (sc[0], sc[1].get("popularity") or 0.0), reverse=True)
+    return scored
+
+
+def best(
+    query: Query,
+    candidates: Iterable[Mapping[str, Any]],
+    scorer: Scorer = default_scorer,
+) -> Optional[Tuple[float, Mapping[str, Any]]]:
+    scored = ((scorer(query, c), c) for c in candidates)
+    return max(scored, key=lambda sc: (sc[0], sc[1].get("popularity") or 0.0), default=None)
+
+
+def best_matches(
+    queries: Sequence[Query],
+    candidates: Sequence[Mapping[str, Any]],
+    scorer: Scorer = default_scorer,
+) -> List[Optional[Tuple[float, Mapping[str, Any]]]]:
+    """
+    Best candidate for each query from one shared pool, e.g. a whole
+    group's titles against its search results. Only candidates sharing a
+    trigram with a query are scored.
+    """
+    by_gram: Dict[str, List[int]] = {}
+    for i, rec in enumerate(candidates):
+        grams = frozenset().union(*(title_key(t).grams for t in record_titles(rec)))
+        for g in grams:
+            by_gram.setdefault(g, []).append(i)
+
+    out: List[Optional[Tuple[float, Mapping[str, Any]]]] = []
+    for q in queries:
+        hits = {i for g in q.key.grams for i in by_gram.get(g, ())}
+        out.append(best(q, (candidates[i] for i in sorted(hits)), scorer))
+    return out
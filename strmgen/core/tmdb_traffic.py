@@ -0,0 +1,283 @@
+# strmgen/core/tmdb_traffic.py
+"""
+Single scheduler for all TMDb traffic, with priority lanes.
+
+Metadata lanes (search > details > season) share one token bucket of
+``tmdb_rate_limit`` requests per 10 seconds; whenever a token frees up it
+goes to the highest-priority waiter, so a queue of season lookups never
+delays a search. Image downloads are not API calls and take no tokens,
+but they are capped at ``tmdb_image_max_concurrency`` and throttled to a
+single download while any metadata request is waiting, so artwork bursts
+cannot crowd out critical-path lookups.
+
+Rate-limit headers are honoured when TMDb sends them: ``Retry-After`` on
+a 429 and ``X-RateLimit-Remaining``/``X-RateLimit-Reset`` pause the
+bucket until TMDb is ready again.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from strmgen.core.config import get_settings
+from strmgen.core.metrics import TMDB_RATE_LIMIT_WAIT
+
+logger = logging.getLogger(__name__)
+
+# Longest pause a rate-limit header may impose
+_MAX_PAUSE = 60.0
+
+
+class Lane(IntEnum):
+    """Lower value = higher priority."""
+    SEARCH = 0
+    DETAILS = 1
+    SEASON = 2
+    IMAGES = 3
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+
+def lane_for(endpoint: str) -> Lane:
+    if endpoint.startswith("/search/"):
+        return Lane.SEARCH
+    if "/season/" in endpoint:
+        return Lane.SEASON
+    return Lane.DETAILS
+
+
+@dataclass
+class _LaneStats:
+    granted: int = 0
+    waited: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+class TMDbTraffic:
+    def __init__(self, rate: int, period: float, image_concurrency: int):
+        self.rate = max(1, rate)
+        self.period = period
+        self.image_concurrency = max(1, image_concurrency)
+        self._tokens = float(self.rate)
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._seq = itertools.count()
+        self._meta_waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._image_waiters: Deque[asyncio.Future] = deque()
+        self._images_in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._stats: Dict[Lane, _LaneStats] = {lane: _LaneStats() for lane in Lane}
+        self.throttled = 0
+        self.pauses = 0
+
+    def configure(self, rate: int, image_concurrency: int) -> None:
+        """Apply a new metadata rate and image cap; tokens already earned are kept up to the rate."""
+        self._refill()
+        self.rate = max(1, rate)
+        self.image_concurrency = max(1, image_concurrency)
+        self._tokens = min(self._tokens, float(self.rate))
+
+    # ── admission ────────────────────────────────────────────────────────
+    async def acquire(self, lane: Lane) -> None:
+        """
+        Wait for permission to send one request on ``lane``. Image permits
+        must be returned with ``release``; prefer ``slot()``.
+        """
+        started = time.monotonic()
+        if not self._try_grant(lane):
+            fut = asyncio.get_running_loop().create_future()
+            if lane is Lane.IMAGES:
+                self._image_waiters.append(fut)
+            else:
+                heapq.heappush(self._meta_waiters, (lane, next(self._seq), fut))
+            self._dispatch()
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    # granted just before we were cancelled: hand it back
+                    self._return(lane)
+                else:
+                    # drop our entry so it no longer holds back image downloads
+                    self._dispatch()
+                raise
+        self._record(lane, time.monotonic() - started)
+
+    def release(self, lane: Lane) -> None:
+        if lane is Lane.IMAGES:
+            self._images_in_flight -= 1
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, lane: Lane) -> AsyncIterator[None]:
+        await self.acquire(lane)
+        try:
+            yield
+        finally:
+            self.release(lane)
+
+    def _try_grant(self, lane: Lane) -> bool:
+        """Grant immediately when nobody of equal or higher priority is queued."""
+        if lane is Lane.IMAGES:
+            if self._image_waiters or self._images_in_flight >= self._image_cap():
+                return False
+            self._images_in_flight += 1
+            return True
+        if self._meta_waiters and self._meta_waiters[0][0] <= lane:
+            return False
+        self._refill()
+        if time.monotonic() < self._paused_until or self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _return(self, lane: Lane) -> None:
+        if lane is Lane.IMAGES:
+            self._images_in_flight -= 1
+        else:
+            self._tokens = min(float(self.rate), self._tokens + 1)
+        self._dispatch()
+
+    def _image_cap(self) -> int:
+        return 1 if self._meta_waiters else self.image_concurrency
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.rate),
+            self._tokens + (now - self._refilled) * self.rate / self.period,
+        )
+        self._refilled = now
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._refill()
+        now = time.monotonic()
+        while self._meta_waiters:
+            fut = self._meta_waiters[0][2]
+            if fut.done():
+                heapq.heappop(self._meta_waiters)
+                continue
+            if now < self._paused_until or self._tokens < 1:
+                break
+            heapq.heappop(self._meta_waiters)
+            self._tokens -= 1
+            fut.set_result(None)
+
+        while self._image_waiters and self._images_in_flight < self._image_cap():
+            fut = self._image_waiters.popleft()
+            if fut.done():
+                continue
+            self._images_in_flight += 1
+            fut.set_result(None)
+
+        if any(not w[2].done() for w in self._meta_waiters):
+            wake = max(self._paused_until, now + (1 - self._tokens) * self.period / self.rate)
+            self._timer = asyncio.get_running_loop().call_later(max(0.0, wake - now), self._dispatch)
+
+    def _record(self, lane: Lane, waited: float) -> None:
+        stats = self._stats[lane]
+        stats.granted += 1
+        if waited > 0.001:
+            stats.waited += 1
+            stats.wait_seconds += waited
+            stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+        TMDB_RATE_LIMIT_WAIT.labels(lane.label).observe(waited)
+
+    # ── feedback from responses ──────────────────────────────────────────
+    def observe(self, resp: httpx.Response) -> float:
+        """
+        Apply TMDb's rate-limit headers. Returns the pause imposed, in
+        seconds (0 when the headers asked for none).
+        """
+        pause = 0.0
+        if resp.status_code == 429:
+            self.throttled += 1
+            pause = _seconds(resp.headers.get("retry-after"))
+        remaining = resp.headers.get("x-ratelimit-remaining")
+        if remaining is not None and remaining.isdigit():
+            self._refill()
+            self._tokens = min(self._tokens, float(remaining))
+            if int(remaining) == 0:
+                reset = _seconds(resp.headers.get("x-ratelimit-reset"), epoch=True)
+                pause = max(pause, reset)
+        if pause > 0:
+            self.pause(pause)
+        return pause
+
+    def pause(self, seconds: float) -> None:
+        seconds = min(seconds, _MAX_PAUSE)
+        until = time.monotonic() + seconds
+        if until > self._paused_until:
+            self._paused_until = until
+            self.pauses += 1
+            logger.warning("[TMDB] Rate limited; pausing metadata requests for %.1fs", seconds)
+
+    # ── introspection ────────────────────────────────────────────────────
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        waiting = {lane: 0 for lane in Lane}
+        for lane, _, fut in self._meta_waiters:
+            if not fut.done():
+                waiting[Lane(lane)] += 1
+        waiting[Lane.IMAGES] = sum(1 for f in self._image_waiters if not f.done())
+        return {
+            "rate_per_period": self.rate,
+            "period_seconds":  self.period,
+            "tokens":          round(self._tokens, 2),
+            "paused_seconds":  round(max(0.0, self._paused_until - time.monotonic()), 2),
+            "images_in_flight": self._images_in_flight,
+            "image_limit":     self._image_cap(),
+            "throttled":       self.throttled,
+            "pauses":          self.pauses,
+            "lanes": {
+                lane.label: {
+                    "waiting":          waiting[lane],
+                    "granted":          s.granted,
+                    "waited":           s.waited,
+                    "avg_wait_ms":      round(s.wait_seconds / s.waited * 1000, 1) if s.waited else 0.0,
+                    "max_wait_ms":      round(s.max_wait_seconds * 1000, 1),
+                }
+                for lane, s in self._stats.items()
+            },
+        }
+
+
+def _seconds(value: Optional[str], epoch: bool = False) -> float:
+    """Parse a delay header; ``epoch`` values are absolute Unix timestamps."""
+    if not value:
+        return 0.0
+    try:
+        seconds = float(value)
+    except ValueError:
+        return 0.0
+    if epoch:
+        seconds -= time.time()
+    return max(0.0, seconds)
+
+
+tmdb_traffic = TMDbTraffic(
+    rate=get_settings().tmdb_rate_limit,
+    period=10,
+    image_concurrency=get_settings().tmdb_image_max_concurrency,
+)
+
+
+def configure_tmdb_traffic() -> None:
+    """Apply the current rate settings; called when a run starts."""
+    settings = get_settings()
+    tmdb_traffic.configure(settings.tmdb_rate_limit, settings.tmdb_image_max_concurrency)
@@ -7,14 +7,17 @@ import shutil
 import os
 import logging
 
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Any, Optional, Dict, Callable, TypeVar, Union
+from typing import List, Any, Optional, Dict, Callable, Iterable, Set, Tuple, TypeVar, Union
 from jinja2 import Environment, select_autoescape
 
 from strmgen.core.config import get_settings
 from strmgen.core.models.dispatcharr import DispatcharrStream
 from strmgen.core.models.tv import TVShow, EpisodeMeta, SeasonMeta
 from strmgen.core.models.movie import Movie
+from strmgen.core.metrics import FILES_WRITTEN, BYTES_WRITTEN
+from strmgen.core.manifest import output_manifest
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -98,41 +101,38 @@ MOVIE_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
   <status>{{ movie.raw.get('status', '') }}</status>
 </movie>"""
 
+# compiled once; episode NFOs are rendered in bulk
+_episode_template = env.from_string(EPISODE_TEMPLATE)
+
 # ─── Templating Functions ───────────────────────────────────────────────────
 def write_tvshow_nfo(stream: DispatcharrStream, show: TVShow) -> bool:
     path = stream.nfo_path
     try:
         xml = env.from_string(TVSHOW_TEMPLATE).render(stream=stream, show=show)
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        try:
-            path.write_text(xml, encoding="utf-8")
-            logger.info("[NFO] ✅ TV-Show NFO: %s", path)
-            logger.debug("[NFO] TV-Show NFO content: %s", xml)
-            return True
-        except PermissionError as pe:
-            logger.error("[NFO] ❌ Permission denied writing TV-Show NFO: %s - %s", path, pe)
+        if materialize([(path, xml)]).failed:
             return False
+        logger.info("[NFO] ✅ TV-Show NFO: %s", path)
+        logger.debug("[NFO] TV-Show NFO content: %s", xml)
+        return True
 
     except Exception:
         logger.exception("[NFO] ❌ Failed TV-Show NFO: %s", show.name)
         return False
 
 
+def render_episode_nfo(stream: DispatcharrStream, episode: EpisodeMeta) -> str:
+    return _episode_template.render(stream=stream, episode=episode)
+
+
 def write_episode_nfo(stream: DispatcharrStream, episode: EpisodeMeta) -> bool:
     path = stream.nfo_path
     try:
-        xml = env.from_string(EPISODE_TEMPLATE).render(stream=stream, episode=episode)
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        try:
-            path.write_text(xml, encoding="utf-8")
-            logger.info("[NFO] ✅ Episode NFO: %s", path)
-            logger.debug("[NFO] Episode NFO content: %s", xml)
-            return True
-        except PermissionError as pe:
-            logger.error("[NFO] ❌ Permission denied writing Episode NFO: %s - %s", path, pe)
+        xml = render_episode_nfo(stream, episode)
+        if materialize([(path, xml)]).failed:
             return False
+        logger.info("[NFO] ✅ Episode NFO: %s", path)
+        logger.debug("[NFO] Episode NFO content: %s", xml)
+        return True
 
     except Exception:
         logger.exception(
@@ -146,16 +146,11 @@ def write_movie_nfo(stream: DispatcharrStream, movie: Movie) -> bool:
     path = stream.nfo_path
     try:
         xml = env.from_string(MOVIE_TEMPLATE).render(stream=stream, movie=movie)
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        try:
-            path.write_text(xml, encoding="utf-8")
-            logger.info("[NFO] ✅ Movie NFO: %s", path)
-            logger.debug("[NFO] Movie NFO content: %s", xml)
-            return True
-        except PermissionError as pe:
-            logger.error("[NFO] ❌ Permission denied writing NFO: %s - %s", path, pe)
+        if materialize([(path, xml)]).failed:
             return False
+        logger.info("[NFO] ✅ Movie NFO: %s", path)
+        logger.debug("[NFO] Movie NFO content: %s", xml)
+        return True
 
     except Exception:
         logger.exception("[NFO] ❌ Failed Movie NFO rendering for: %s", movie.title)
@@ -202,6 +197,49 @@ def filter_by_threshold(name: str, meta: Optional[MetaType]) -> bool:
 
 
 
+# ─── Bulk Writer ─────────────────────────────────────────────────────────────
+@dataclass
+class WriteReport:
+    written:   int = 0
+    unchanged: int = 0
+    bytes:     int = 0
+    failed:    Set[Path] = field(default_factory=set)
+
+
+def materialize(files: Iterable[Tuple[Path, str]]) -> WriteReport:
+    """
+    Write many small text files in one blocking job (run it through
+    ``run_fs``). Each directory is created once, and a file already holding
+    the same content is left untouched; during a run both checks are
+    answered by the output manifest instead of the disk. A failed file is
+    logged and reported; the rest are still written.
+    """
+    report = WriteReport()
+    made: Set[Path] = set()
+    for path, text in files:
+        data = text.encode("utf-8")
+        try:
+            if path.parent not in made:
+                output_manifest.ensure_dir(path.parent)
+                made.add(path.parent)
+            if output_manifest.same_content(path, data):
+                report.unchanged += 1
+                continue
+            path.write_bytes(data)
+            output_manifest.wrote(path, data)
+        except OSError as e:
+            logger.error("Failed writing %s: %s", path, e)
+            report.failed.add(path)
+            continue
+        report.written += 1
+        report.bytes += len(data)
+    FILES_WRITTEN.labels("written").inc(report.written)
+    FILES_WRITTEN.labels("unchanged").inc(report.unchanged)
+    FILES_WRITTEN.labels("failed").inc(len(report.failed))
+    BYTES_WRITTEN.inc(report.bytes)
+    return report
+
+
 # ─── Filesystem Helpers ───────────────────────────────────────────────────────
 def safe_mkdir(path: Path) -> None:
     try:
@@ -212,6 +250,8 @@ def safe_mkdir(path: Path) -> None:
 
 def safe_remove(path: Path):
     """Remove files/dirs without blowing up on NFS stale handles, perms, or symlinks."""
+    # forgotten first: anything a failed removal leaves behind is rewritten, not trusted
+    output_manifest.removed(path)
     # Shortcut: nothing to do
     if not path.exists() and not path.is_symlink():
         return
@@ -9,7 +9,7 @@ from contextlib import asynccontextmanager
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
-from strmgen.api.routers import logs, process, schedule, streams, tmdb, skipped
+from strmgen.api.routers import logs, process, schedule, streams, tmdb, skipped, metrics
 from strmgen.api.routers import settings as settings_router
 from strmgen.web_ui.routes import router as ui_router
 from strmgen.core.auth import get_access_token
@@ -41,6 +41,9 @@ api_v1.include_router(skipped.router,  prefix="/skipped")
 api_v1.include_router(settings_router.router, prefix="/settings")
 app.include_router(api_v1)
 
+# Prometheus scrape endpoint
+app.include_router(metrics.router)
+
 # Static files for the UI
 STATIC_DIR = Path(__file__).parent / "web_ui" / "static"
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
@@ -102,7 +105,86 @@ async def lifespan(app: FastAPI):
           ON skipped_streams(dispatcharr_id);
         """)
 
-        # 3.a) Grant all the necessary rights to your configured DB user
+        # 3.b) Per-stream state for incremental runs
+        await conn.execute("""
+        CREATE TABLE IF NOT EXISTS stream_state (
+          dispatcharr_id  BIGINT       PRIMARY KEY,
+          stream_type     TEXT         NOT NULL,
+          group_name      TEXT         NOT NULL,
+          stream_hash     TEXT         NOT NULL,
+          url             TEXT         NOT NULL,
+          tmdb_id         BIGINT,
+          artifact_hashes JSONB        NOT NULL DEFAULT '{}'::jsonb,
+          last_processed  TIMESTAMPTZ  NOT NULL DEFAULT now()
+        );
+        """)
+        await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_stream_state_group
+          ON stream_state(stream_type, group_name);
+        """)
+
+        # 3.c) Run checkpoints for resuming cancelled or crashed runs
+        await conn.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_runs (
+          run_id      TEXT         PRIMARY KEY,
+          status      TEXT         NOT NULL,
+          started_at  TIMESTAMPTZ  NOT NULL DEFAULT now(),
+          finished_at TIMESTAMPTZ
+        );
+        """)
+        await conn.execute("""
+        CREATE TABLE IF NOT EXISTS run_checkpoints (
+          run_id      TEXT         NOT NULL,
+          stream_type TEXT         NOT NULL,
+          group_name  TEXT         NOT NULL,
+          next_page   INT          NOT NULL DEFAULT 1,
+          completed   BOOLEAN      NOT NULL DEFAULT FALSE,
+          updated_at  TIMESTAMPTZ  NOT NULL DEFAULT now(),
+          PRIMARY KEY (run_id, stream_type, group_name)
+        );
+        """)
+        await conn.execute("""
+        CREATE TABLE IF NOT EXISTS run_completed_streams (
+          run_id         TEXT    NOT NULL,
+          stream_type    TEXT    NOT NULL,
+          group_name     TEXT    NOT NULL,
+          dispatcharr_id BIGINT  NOT NULL,
+          PRIMARY KEY (run_id, stream_type, group_name, dispatcharr_id)
+        );
+        """)
+
+        # 3.d) Persistent TMDb response cache
+        await conn.execute("""
+        CREATE TABLE IF NOT EXISTS tmdb_cache (
+          cache_key   TEXT         PRIMARY KEY,
+          kind        TEXT         NOT NULL,
+          payload     JSONB        NOT NULL,
+          etag        TEXT,
+          fetched_at  TIMESTAMPTZ  NOT NULL DEFAULT now(),
+          expires_at  TIMESTAMPTZ  NOT NULL
+        );
+        """)
+        await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tmdb_cache_expires
+          ON tmdb_cache(expires_at);
+        """)
+
+        # 3.e) Titles TMDb could not match, so they are not searched every run
+        await conn.execute("""
+        CREATE TABLE IF NOT EXISTS tmdb_not_found (
+          media_type  TEXT         NOT NULL,
+          title_key   TEXT         NOT NULL,
+          year        INT          NOT NULL DEFAULT 0,
+          title       TEXT         NOT NULL,
+          misses      INT          NOT NULL DEFAULT 1,
+          first_seen  TIMESTAMPTZ  NOT NULL DEFAULT now(),
+          last_seen   TIMESTAMPTZ  NOT NULL DEFAULT now(),
+          expires_at  TIMESTAMPTZ  NOT NULL,
+          PRIMARY KEY (media_type, title_key, year)
+        );
+        """)
+
+        # 3.f) Grant all the necessary rights to your configured DB user
         db_user = settings.db_user
         db_name = settings.db_name
 
@@ -0,0 +1,73 @@
+# strmgen/pipeline/checkpoint.py
+"""Durable per-group progress tracking so an interrupted run can be resumed."""
+
+import asyncio
+import logging
+
+from typing import Dict, Iterable, List
+
+from strmgen.core.db import save_checkpoint
+
+logger = logging.getLogger(__name__)
+
+# Completed stream ids are buffered and written in batches of this size
+FLUSH_EVERY = 200
+
+
+class GroupCheckpoint:
+    """
+    Track the page cursor and completed stream ids of one group.
+
+    ``next_page`` is the first page that still has unfinished streams; on
+    resume, listing restarts there and ``done_ids`` filters out the streams
+    of that page (and later ones) that had already finished.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        stream_type: str,
+        group: str,
+        start_page: int = 1,
+        done_ids: Iterable[int] = (),
+    ):
+        self.run_id = run_id
+        self.stream_type = stream_type
+        self.group = group
+        self.next_page = start_page
+        self.done_ids = set(done_ids)
+        self._remaining: Dict[int, int] = {}
+        self._pending_ids: List[int] = []
+        self._lock = asyncio.Lock()
+
+    def page_queued(self, page_no: int, count: int) -> None:
+        """Register how many streams of a page were handed to workers."""
+        self._remaining[page_no] = count
+        self._advance()
+
+    async def stream_done(self, page_no: int, stream_id: int) -> None:
+        self._pending_ids.append(stream_id)
+        self._remaining[page_no] -= 1
+        if self._advance() or len(self._pending_ids) >= FLUSH_EVERY:
+            await self.flush()
+
+    def _advance(self) -> bool:
+        moved = False
+        while self._remaining.get(self.next_page) == 0:
+            del self._remaining[self.next_page]
+            self.next_page += 1
+            moved = True
+        return moved
+
+    async def flush(self, completed: bool = False) -> None:
+        """Persist the cursor and buffered ids; failures are logged, not raised."""
+        async with self._lock:
+            ids, self._pending_ids = self._pending_ids, []
+            try:
+                await save_checkpoint(
+                    self.run_id, self.stream_type, self.group,
+                    self.next_page, completed, ids
+                )
+            except Exception as e:
+                self._pending_ids.extend(ids)
+                logger.warning("Failed to checkpoint group %s: %s", self.group, e)
@@ -4,24 +4,45 @@ import asyncio
 import logging
 import fnmatch
 import logging
+import uuid
 
 from datetime import datetime, timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, JobExecutionEvent
-from more_itertools import chunked
 
 from strmgen.core.config import get_settings
 from strmgen.core.auth import get_auth_headers
-from strmgen.services.streams import fetch_streams_by_group_name
+from strmgen.services.streams import fetch_streams_by_group_name, iter_stream_pages
 from strmgen.services.service_24_7 import process_24_7
 from strmgen.services.movies import process_movies, movie_cache
 from strmgen.services.tv import process_tv
+from strmgen.services.show_identity import show_identities
+from strmgen.services.reconcile import ExpectedOutput, reconcile_output
+from strmgen.services.tmdb import movie_match_stats, reset_movie_match_stats
+from strmgen.services import artwork
 from strmgen.core.logger import notify_progress
 from strmgen.core.models.enums import MediaType
 from strmgen.core.clients import async_client
+from strmgen.core.concurrency import dispatcharr_budget, budget_stats, configure_budgets
+from strmgen.core.tmdb_traffic import tmdb_traffic, configure_tmdb_traffic
+from strmgen.core.side_tasks import side_tasks
+from strmgen.core.manifest import output_manifest
+from strmgen.core.metrics import STREAM_QUEUE_DEPTH, record_stream
 from strmgen.core.control import set_processor_task, is_running
+from strmgen.core.db import (
+    get_stream_fingerprints,
+    get_show_folders,
+    start_run,
+    finish_run,
+    reopen_run,
+    latest_unfinished_run,
+    load_checkpoints,
+    load_completed_streams,
+    save_checkpoint,
+)
+from strmgen.pipeline.checkpoint import GroupCheckpoint
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +59,7 @@ def _record_daily_run(event: JobExecutionEvent) -> None:
 processor_task: asyncio.Task | None = None
 MAIN_LOOP: asyncio.AbstractEventLoop | None = None
 
-def start_background_run():
+def start_background_run(resume: bool = False):
     global processor_task, MAIN_LOOP
     if MAIN_LOOP is None or not MAIN_LOOP.is_running():
         logger.error("Event loop not ready—cannot start pipeline")
@@ -46,7 +67,7 @@ def start_background_run():
     if processor_task and not processor_task.done():
         logger.info("Scheduled run skipped: pipeline already running")
         return
-    processor_task = MAIN_LOOP.create_task(run_pipeline())
+    processor_task = MAIN_LOOP.create_task(run_pipeline(resume=resume))
     set_processor_task(processor_task)
     logger.info("Pipeline background task scheduled")
 
@@ -59,19 +80,55 @@ def stop_background_run() -> bool:
     return False
 
 # ─── Core async pipeline ────────────────────────────────────────────────────
-async def run_pipeline():
+def _drop_unchanged(streams, known):
+    """Keep only streams that are new or whose fingerprint changed since the last run."""
+    return [s for s in streams if known.get(s.id) != s.fingerprint]
+
+async def run_pipeline(resume: bool = False):
+    """
+    Process every matched group. With ``resume=True`` the most recent
+    cancelled or crashed run is continued from its checkpoints instead of
+    starting over.
+    """
     settings = get_settings()
     logger.info("Pipeline starting")
+    run_id: str | None = None
+    status = "failed"
+    # limits saved through the settings API apply from the next run on
+    configure_budgets()
+    configure_tmdb_traffic()
+    reset_movie_match_stats()
+    artwork.reset_stats()
+    side_tasks.reset_stats()
+    show_identities.reset()
+    # what each listed group accounts for on disk, for the orphan cleanup
+    expected = ExpectedOutput() if settings.clean_output_dir else None
     try:
         headers = await get_auth_headers()
 
+        # 0) Open a new run, or reopen the last interrupted one
+        checkpoints = {}
+        if resume:
+            run_id = await latest_unfinished_run()
+            if run_id:
+                checkpoints = await load_checkpoints(run_id)
+                await reopen_run(run_id)
+                logger.info("Resuming run %s (%d groups checkpointed)", run_id, len(checkpoints))
+            else:
+                logger.info("No interrupted run to resume; starting a new run")
+        if not run_id:
+            run_id = uuid.uuid4().hex
+            await start_run(run_id)
+
         # 1) Fetch all group names
         try:
-            resp = await async_client.get(
-                "/api/channels/streams/groups/",
-                headers=headers,
-                timeout=10
-            )
+            async with dispatcharr_budget.slot() as slot:
+                resp = await async_client.get(
+                    "/api/channels/streams/groups/",
+                    headers=headers,
+                    timeout=10
+                )
+                slot.observe(resp.status_code)
             resp.raise_for_status()
             all_groups = resp.json()
             logger.info("Retrieved %d groups", len(all_groups))
@@ -105,67 +162,229 @@ async def run_pipeline():
         logger.info(f"Matched 24/7 groups ({len(matched_24_7)}), TV groups ({len(matched_tv)}), Movie groups ({len(matched_movies)})")
         if not (matched_24_7 or matched_tv or matched_movies):
             logger.info("No groups matched; pipeline will not run")
+            status = "completed"
             return
 
-        # Helper to process one category of groups
-        async def process_category(groups, proc_fn, media_type):
-            for grp in groups:
-                if not is_running():
-                    return
-                streams = await fetch_streams_by_group_name(grp, media_type)
-                batches = list(chunked(streams, settings.batch_size))
-                for idx, batch in enumerate(batches, start=1):
-                    logger.info("Starting batch %d/%d for group %s", idx, len(batches), grp)
-                    await _process_batch(batch, grp, proc_fn)
-                    if not is_running():
-                        logger.info("Pipeline stopped during batch %d", idx)
-                        return
-                    await asyncio.sleep(settings.batch_delay_seconds)
-                    notify_progress(
-                        media_type=media_type,
-                        group=grp,
-                        current=idx,
-                        total=len(batches),
-                    )
-                logger.info(f"[PIPELINE] ✅ Completed processing {media_type} streams for group: {grp}")
-            if proc_fn == process_movies:
-                movie_cache.clear()
-
-        async def _process_batch(batch, grp, proc_fn):
-            sem = asyncio.Semaphore(settings.concurrent_requests)
-            async def worker(i, total, stream):
-                async with sem:
-                    if not is_running():
-                        return
+        # Existence and up-to-date checks are answered from one scan of the output tree
+        await output_manifest.load(settings.output_root)
+
+        # Helper to process one TV group (process_tv needs the full listing
+        # to group episodes by show and season)
+        async def _process_tv_group(grp):
+            # TV groups are checkpointed as a whole
+            streams = await fetch_streams_by_group_name(grp, MediaType.TV)
+            if expected is not None:
+                expected.add(MediaType.TV, grp, streams)
+                expected.add_show_folders(grp, streams, await get_show_folders(grp))
+            if settings.incremental_runs:
+                known = await get_stream_fingerprints(MediaType.TV.name, grp)
+                total = len(streams)
+                streams = _drop_unchanged(streams, known)
+                record_stream(MediaType.TV.name, "unchanged", total - len(streams))
+                logger.info("TV group %r: %d/%d streams unchanged since last run", grp, total - len(streams), total)
+            logger.info("TV group %r has %d streams; delegating to process_tv()", grp, len(streams))
+            await process_tv(streams, grp)
+            if is_running():
+                await save_checkpoint(run_id, MediaType.TV.name, grp, 1, True)
+
+        async def _process_group(grp, proc_fn, media_type):
+            # Producer/consumer: pages are queued as they arrive so workers
+            # start on page 1; the bounded queue keeps memory flat.
+            queue: asyncio.Queue = asyncio.Queue(maxsize=settings.stream_queue_size)
+            n_workers = max(1, settings.stream_workers)
+            queued = 0
+            completed = 0
+            unchanged = 0
+            failed = 0
+            fetch_failed = False
+            known = (
+                await get_stream_fingerprints(media_type.name, grp)
+                if settings.incremental_runs else None
+            )
+            progress = checkpoints.get((media_type.name, grp))
+            start_page = progress["next_page"] if progress else 1
+            ckpt = GroupCheckpoint(
+                run_id, media_type.name, grp,
+                start_page=start_page,
+                done_ids=await load_completed_streams(run_id, media_type.name, grp) if progress else (),
+            )
+            if progress:
+                logger.info("Resuming group %s at page %d (%d streams already done)", grp, start_page, len(ckpt.done_ids))
+            if expected is not None and start_page > 1:
+                # pages before start_page are not listed again
+                expected.incomplete(media_type, grp)
+
+            async def producer():
+                nonlocal queued, unchanged, fetch_failed
+                try:
+                    page_no = start_page - 1
+                    async for page in iter_stream_pages(grp, media_type, start_page=start_page):
+                        page_no += 1
+                        if expected is not None:
+                            expected.add(media_type, grp, page)
+                        if known is not None:
+                            fetched = len(page)
+                            page = _drop_unchanged(page, known)
+                            unchanged += fetched - len(page)
+                            record_stream(media_type.name, "unchanged", fetched - len(page))
+                        if ckpt.done_ids:
+                            page = [s for s in page if s.id not in ckpt.done_ids]
+                        ckpt.page_queued(page_no, len(page))
+                        logger.info("Queued page %d (%d streams) for group %s", page_no, len(page), grp)
+                        for stream in page:
+                            if not is_running():
+                                return
+                            await queue.put((page_no, stream))
+                            queued += 1
+                            STREAM_QUEUE_DEPTH.labels(grp).set(queue.qsize())
+                        notify_progress(
+                            media_type=media_type,
+                            group=grp,
+                            current=completed,
+                            total=queued,
+                        )
+                except Exception:
+                    fetch_failed = True
+                    logger.exception("Failed fetching streams for group %s", grp)
+                finally:
+                    for _ in range(n_workers):
+                        await queue.put(None)
+
+            async def worker():
+                nonlocal completed, failed
+                while True:
+                    item = await queue.get()
                     try:
-                        await proc_fn([stream], grp, headers)
-                    except Exception:
-                        logger.exception("Stream %r failed in batch %d/%d for %s", stream, i, total, grp)
-            total = len(batch)
-            await asyncio.gather(*(worker(i, total, s) for i, s in enumerate(batch, start=1)))
-
-        # 3) Run categories
-        if matched_24_7:
-            await process_category(matched_24_7, process_24_7, MediaType.STREAM_24_7)
-        if matched_movies:
-            await process_category(matched_movies, process_movies, MediaType.MOVIE)
-
-        if matched_tv:
-            for grp in matched_tv:
+                        if item is None:
+                            return
+                        page_no, stream = item
+                        STREAM_QUEUE_DEPTH.labels(grp).set(queue.qsize())
+                        if not is_running():
+                            continue
+                        try:
+                            await proc_fn([stream], grp)
+                        except Exception:
+                            # left unmarked: the cursor stays on its page and a resume retries it
+                            failed += 1
+                            record_stream(media_type.name, "failed")
+                            logger.exception("Stream %r failed for %s", stream, grp)
+                        else:
+                            await ckpt.stream_done(page_no, stream.id)
+                        completed += 1
+                    finally:
+                        queue.task_done()
+
+            try:
+                await asyncio.gather(producer(), *(worker() for _ in range(n_workers)))
+            except BaseException:
+                # cancelled or crashed: keep what finished so far
+                await ckpt.flush()
+                raise
+            finally:
+                try:
+                    STREAM_QUEUE_DEPTH.remove(grp)
+                except KeyError:
+                    pass
+            await ckpt.flush(completed=is_running() and not fetch_failed and not failed)
+            if fetch_failed and expected is not None:
+                expected.incomplete(media_type, grp)
+            if known is not None:
+                logger.info("Group %s: %d streams unchanged since last run", grp, unchanged)
+            notify_progress(
+                media_type=media_type,
+                group=grp,
+                current=completed,
+                total=queued,
+            )
+
+        # 3) Run every matched group across all categories concurrently.
+        #    Upstream load is bounded by the shared budgets in
+        #    strmgen.core.concurrency, not by running categories in sequence.
+        jobs = (
+            [(g, process_24_7, MediaType.STREAM_24_7) for g in matched_24_7]
+            + [(g, process_movies, MediaType.MOVIE) for g in matched_movies]
+            + [(g, process_tv, MediaType.TV) for g in matched_tv]
+        )
+        group_slots = asyncio.Semaphore(max(1, settings.max_concurrent_groups))
+
+        async def run_group(grp, proc_fn, media_type):
+            progress = checkpoints.get((media_type.name, grp))
+            if progress and progress["completed"]:
+                logger.info("Skipping %s group %r: completed before interruption", media_type.value, grp)
+                if expected is not None:
+                    expected.incomplete(media_type, grp)
+                return
+            async with group_slots:
                 if not is_running():
-                    break
-                streams = await fetch_streams_by_group_name(grp, MediaType.TV)
-                logger.info("TV group %r has %d streams; delegating to process_tv()", grp, len(streams))
+                    return
                 try:
-                    await process_tv(streams, grp)
+                    if media_type is MediaType.TV:
+                        await _process_tv_group(grp)
+                    else:
+                        await _process_group(grp, proc_fn, media_type)
                 except Exception:
-                    logger.exception("Fatal error in TV group %r; continuing", grp)
+                    logger.exception("Fatal error in %s group %r; continuing", media_type.value, grp)
+                    if expected is not None:
+                        expected.incomplete(media_type, grp)
+                    return
+                if is_running():
+                    logger.info(f"[PIPELINE] ✅ Completed processing {media_type} streams for group: {grp}")
+
+        await asyncio.gather(*(run_group(*job) for job in jobs))
+        movie_cache.clear()
+        status = "completed" if is_running() else "cancelled"
 
     except asyncio.CancelledError:
+        status = "cancelled"
         logger.info("Pipeline task was cancelled")
     except Exception:
         logger.exception("Pipeline aborted due to unexpected error")
     finally:
+        try:
+            await side_tasks.finish(cancelled=status != "completed")
+        except Exception:
+            logger.exception("Failed to drain side tasks")
+        logger.info("[SIDE] %s", side_tasks.stats()["tasks"])
+        if run_id:
+            try:
+                await finish_run(run_id, status)
+            except Exception:
+                logger.exception("Failed to record end of run %s", run_id)
+        for stats in budget_stats():
+            logger.info("[LIMIT] %s", stats)
+        logger.info("[LIMIT] tmdb lanes %s", tmdb_traffic.stats()["lanes"])
+        match = movie_match_stats()
+        if match.get("searches"):
+            logger.info(
+                "[TMDB] Movie matching: %d searches, %d detail requests, %d saved by two-phase matching",
+                match["searches"], match.get("detail_requests", 0), match.get("detail_requests_saved", 0),
+            )
+        if output_manifest.active:
+            logger.info("[FS] Output manifest %s", output_manifest.stats())
+            try:
+                await output_manifest.save()
+            except Exception:
+                logger.exception("Failed to save the output manifest")
+        output_manifest.clear()
+        if expected is not None and status == "completed":
+            # after the manifest is cleared: removals need not keep it up to date
+            try:
+                await reconcile_output(expected, dry_run=bool(settings.clean_output_dry_run))
+            except Exception:
+                logger.exception("Failed to clean orphaned output")
+        shows = show_identities.stats()
+        if shows["shows"]:
+            logger.info(
+                "[TMDB] TV shows: %d resolved with %d lookups, %d reused across groups, %d unmatched",
+                shows["shows"], shows.get("lookups", 0), shows.get("shared", 0), shows.get("unmatched", 0),
+            )
+        art = artwork.stats()
+        if art:
+            logger.info(
+                "[TMDB] Artwork: %d downloaded (%d bytes), %d reused from store, %d hardlinked, %d reflinked, %d copied",
+                art.get("downloaded", 0), art.get("bytes", 0), art.get("reused", 0),
+                art.get("hardlinked", 0), art.get("reflinked", 0), art.get("copied", 0),
+            )
         if processor_task and processor_task.cancelled():
             logger.info("Pipeline was cancelled")
         else:
@@ -0,0 +1,173 @@
+# strmgen/services/artwork.py
+"""
+Content-addressed store for TMDb artwork.
+
+Each image is downloaded once per size, streamed to disk in chunks, and
+stored under its TMDb path (``<store>/<size>/<xx>/<name>``). Destinations
+(poster.jpg, fanart.jpg, season ``.tbn`` files, episode stills) are then
+materialised from the stored file by hardlink; when that is impossible
+(another filesystem, link limit) a reflink is tried, then a plain copy.
+Concurrent requests for the same image share one download, so memory and
+bytes fetched grow with unique images, not with destinations.
+"""
+import asyncio
+import logging
+import os
+import shutil
+
+from collections import Counter
+from pathlib import Path
+from typing import Dict
+
+import aiofiles
+from httpx import HTTPError, PoolTimeout
+
+from strmgen.core.config import get_settings
+from strmgen.core.clients import tmdb_image_client
+from strmgen.core.concurrency import run_fs
+from strmgen.core.manifest import output_manifest
+from strmgen.core.metrics import ARTWORK, ARTWORK_BYTES
+from strmgen.core.tmdb_traffic import Lane, tmdb_traffic
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; reflinks are skipped there
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 64 * 1024
+_RETRIES = 3
+# ioctl(FICLONE): share the source's extents (btrfs, XFS, bcachefs)
+_FICLONE = 0x40049409
+
+_counters: Counter[str] = Counter()
+_inflight: Dict[Path, "asyncio.Task[bool]"] = {}
+
+
+def store_root() -> Path:
+    settings = get_settings()
+    # inside the output root by default, so hardlinks stay on one filesystem
+    return Path(settings.artwork_store_dir or Path(settings.output_root) / ".artwork")
+
+
+def store_path(size: str, image_path: str) -> Path:
+    name = Path(image_path).name
+    # fan out on the name's first characters to keep directories small
+    return store_root() / size / name[:2].lower() / name
+
+
+def _count(result: str, n: int = 1) -> None:
+    _counters[result] += n
+    ARTWORK.labels(result).inc(n)
+
+
+async def place(image_path: str, dest: Path) -> bool:
+    """
+    Make ``dest`` a copy of the TMDb image ``image_path`` at the configured
+    size, downloading it into the store first when needed.
+    """
+    size = get_settings().tmdb_image_size or "original"
+    src = store_path(size, image_path)
+    if await output_manifest.exists(src):
+        _count("reused")
+    else:
+        task = _inflight.get(src)
+        if task is None:
+            task = asyncio.create_task(_download(f"/{size}{image_path}", src))
+            _inflight[src] = task
+            task.add_done_callback(lambda t: _inflight.pop(src, None))
+        else:
+            _count("reused")
+        if not await asyncio.shield(task):
+            return False
+
+    try:
+        how = await run_fs(_materialise, src, dest)
+    except OSError as e:
+        logger.warning("[TMDB] Could not place artwork %s: %s", dest, e)
+        _count("failed")
+        return False
+    _count(how)
+    logger.info("[TMDB] Placed image (%s): %s", how, dest)
+    return True
+
+
+async def _download(url: str, target: Path) -> bool:
+    await run_fs(target.parent.mkdir, parents=True, exist_ok=True)
+    part = target.with_name(f"{target.name}.{os.getpid()}.part")
+    for attempt in range(1, _RETRIES + 1):
+        try:
+            written = 0
+            async with tmdb_traffic.slot(Lane.IMAGES):
+                async with tmdb_image_client.stream("GET", url) as resp:
+                    resp.raise_for_status()
+                    async with aiofiles.open(part, "wb") as f:
+                        async for chunk in resp.aiter_bytes(_CHUNK):
+                            await f.write(chunk)
+                            written += len(chunk)
+            await run_fs(os.replace, part, target)
+            await run_fs(output_manifest.wrote, target)
+            _count("downloaded")
+            _counters["bytes"] += written
+            ARTWORK_BYTES.inc(written)
+            return True
+        except PoolTimeout:
+            if attempt < _RETRIES:
+                logger.warning("[TMDB] PoolTimeout, retry %d/%d", attempt, _RETRIES)
+                await asyncio.sleep(attempt)
+                continue
+            logger.error("[TMDB] PoolTimeout giving up on %s", url)
+        except HTTPError as exc:
+            logger.warning("[TMDB] HTTP error on %s: %s", url, exc)
+            break
+        finally:
+            # left behind only by a failed or cancelled download
+            part.unlink(missing_ok=True)
+    _count("failed")
+    return False
+
+
+def _materialise(src: Path, dest: Path) -> str:
+    """Link or copy ``src`` to ``dest`` atomically; returns the method used."""
+    output_manifest.ensure_dir(dest.parent)
+    # rename() is a no-op between two links to one file, so check first
+    try:
+        if output_manifest.has_file(dest) and os.path.samefile(src, dest):
+            return "unchanged"
+    except FileNotFoundError:  # removed behind the manifest's back
+        pass
+    tmp = dest.with_name(f".{dest.name}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+        how = "hardlinked"
+    except OSError:
+        if _reflink(src, tmp):
+            how = "reflinked"
+        else:
+            shutil.copyfile(src, tmp)
+            how = "copied"
+    os.replace(tmp, dest)
+    output_manifest.wrote(dest)
+    return how
+
+
+def _reflink(src: Path, dest: Path) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as s, open(dest, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return True
+    except OSError:
+        dest.unlink(missing_ok=True)
+        return False
+
+
+def stats() -> Dict[str, int]:
+    return dict(_counters)
+
+
+def reset_stats() -> None:
+    _counters.clear()
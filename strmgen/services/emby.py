@@ -5,6 +5,7 @@ import urllib.parse
 from typing import Any
 
 from strmgen.core.clients import emby_client
+from strmgen.core.concurrency import emby_budget
 from strmgen.core.config import get_settings
 from strmgen.core.logger import logging
 
@@ -46,7 +47,9 @@ async def search_emby_library(title: str, media_type: str | int | MediaType) ->
             query += f"&ParentId={settings.emby_movie_library_id}"
 
         logging.debug("[Emby] Searching library: %s", query)
-        resp = await emby_client.get(query)
+        async with emby_budget.slot() as slot:
+            resp = await emby_client.get(query)
+            slot.observe(resp.status_code)
         resp.raise_for_status()
         data = resp.json()
 
@@ -10,8 +10,12 @@ from .subtitles import download_movie_subtitles
 from .streams import write_strm_file, get_dispatcharr_stream_by_id
 from .tmdb import fetch_movie_details, download_if_missing
 from strmgen.core.utils import write_if, write_movie_nfo, filter_by_threshold, safe_remove
-from strmgen.core.db import mark_skipped, is_skipped, SkippedStream
+from strmgen.core.db import mark_skipped, is_skipped, save_stream_state, SkippedStream
 from strmgen.core.control import is_running
+from strmgen.core.concurrency import run_fs
+from strmgen.core.manifest import output_manifest
+from strmgen.core.side_tasks import side_tasks
+from strmgen.core.metrics import record_stream
 from strmgen.core.models.dispatcharr import DispatcharrStream
 from strmgen.services.emby import search_emby_library
 from strmgen.core.models.enums import MediaType
@@ -35,86 +39,94 @@ async def process_movies(
       3) Download artwork and subtitles asynchronously
     """
     settings = get_settings()
-    sem = asyncio.Semaphore(settings.concurrent_requests)
 
     async def _process_one(stream: DispatcharrStream):
         if not is_running():
             return
 
-        async with sem:
-            if not is_running():
-                return
-
-            # Skip if already processed
-            if not reprocess and await is_skipped(stream.stream_type.name, stream.id):
-                logger.info(f"{LOG_TAG} 🚫 Skipped: {stream.name}")
-                return
-
-            title = stream.name
-            year = stream.year
-            logger.info(f"{LOG_TAG} 🎬 Processing movie: {title}")
-
-            # Check movie_cache
-            if stream.base_path.name in movie_cache:
-                logger.info(f"{LOG_TAG} 🚫 Skipping duplicate (cache): {title}")
-                if stream.base_path.exists():
-                    await asyncio.to_thread(safe_remove, stream.base_path)
-                    logger.info(f"{LOG_TAG} ✂️ Removed path due to duplicate: {stream.base_path}")
-                await mark_skipped("MOVIE", group, {"title": title, "year": year}, stream)
-                return
-
-            # 1) Fetch TMDb metadata
-            movie = await fetch_movie_details(title=title, year=year)
-            if not is_running() or not movie:
-                logger.info(f"{LOG_TAG} 🚫 '{title}' not found in TMDb")
-                return
-
-            # Fill missing year
-            if not stream.year and movie.release_date:
-                stream.year = int(movie.release_date[:4])
-                stream._recompute_paths()
-
-            # 2) Threshold filtering
-            ok = await asyncio.to_thread(filter_by_threshold, stream.name, movie)
-            if not is_running() or not ok:
-                try:
-                    await mark_skipped("MOVIE", group, movie, stream)
-                    logger.info(f"{LOG_TAG} 🚫 Filter failed: {title}")
-                    if stream.base_path.exists():
-                        await asyncio.to_thread(safe_remove, stream.base_path)
-                        logger.info(f"{LOG_TAG} ✂️ Removed path: {stream.base_path}")
-                except Exception as e:
-                    logger.info(f"{LOG_TAG} Exception occurred: {e}")
-                return
-
-            # check Emby first
-            if settings.emby_api_key and await search_emby_library(movie.title, MediaType.MOVIE):
-                logger.info(f"{LOG_TAG} 🚫 Already in Emby: {movie.title} ({movie.year})")
-                if stream.base_path.exists():
-                    await asyncio.to_thread(safe_remove, stream.base_path)
-                    logger.info(f"{LOG_TAG} ✂️ Removed path: {stream.base_path}")
+        # Skip if already processed
+        if not reprocess and await is_skipped(stream.stream_type.name, stream.id):
+            logger.info(f"{LOG_TAG} 🚫 Skipped: {stream.name}")
+            record_stream(stream.stream_type.name, "skipped")
+            return
+
+        title = stream.name
+        year = stream.year
+        logger.info(f"{LOG_TAG} 🎬 Processing movie: {title}")
+
+        # Check movie_cache
+        if stream.base_path.name in movie_cache:
+            logger.info(f"{LOG_TAG} 🚫 Skipping duplicate (cache): {title}")
+            record_stream(stream.stream_type.name, "skipped")
+            if await output_manifest.exists(stream.base_path):
+                await run_fs(safe_remove, stream.base_path)
+                logger.info(f"{LOG_TAG} ✂️ Removed path due to duplicate: {stream.base_path}")
+            await mark_skipped("MOVIE", group, {"title": title, "year": year}, stream)
+            await save_stream_state(stream)
+            return
+
+        # 1) Fetch TMDb metadata
+        movie = await fetch_movie_details(title=title, year=year)
+        if not is_running() or not movie:
+            logger.info(f"{LOG_TAG} 🚫 '{title}' not found in TMDb")
+            record_stream(stream.stream_type.name, "skipped")
+            return
+
+        # Fill missing year
+        if not stream.year and movie.release_date:
+            stream.year = int(movie.release_date[:4])
+            stream._recompute_paths()
+
+        # 2) Threshold filtering
+        ok = await asyncio.to_thread(filter_by_threshold, stream.name, movie)
+        if not is_running():
+            return
+        if not ok:
+            try:
                 await mark_skipped("MOVIE", group, movie, stream)
-                return
+                await save_stream_state(stream, tmdb_id=movie.id)
+                logger.info(f"{LOG_TAG} 🚫 Filter failed: {title}")
+                record_stream(stream.stream_type.name, "skipped")
+                if await output_manifest.exists(stream.base_path):
+                    await run_fs(safe_remove, stream.base_path)
+                    logger.info(f"{LOG_TAG} ✂️ Removed path: {stream.base_path}")
+            except Exception as e:
+                logger.info(f"{LOG_TAG} Exception occurred: {e}")
+            return
+
+        # check Emby first
+        if settings.emby_api_key and await search_emby_library(movie.title, MediaType.MOVIE):
+            logger.info(f"{LOG_TAG} 🚫 Already in Emby: {movie.title} ({movie.year})")
+            record_stream(stream.stream_type.name, "skipped")
+            if await output_manifest.exists(stream.base_path):
+                await run_fs(safe_remove, stream.base_path)
+                logger.info(f"{LOG_TAG} ✂️ Removed path: {stream.base_path}")
+            await mark_skipped("MOVIE", group, movie, stream)
+            await save_stream_state(stream, tmdb_id=movie.id)
+            return
 
 
-            # 3) Write .strm
-            wrote = await write_strm_file(stream)
-            if not is_running() or not wrote:
-                logger.warning(f"{LOG_TAG} ❌ .strm write failed: {stream.strm_path}")
-                return
+        # 3) Write .strm
+        wrote = await write_strm_file(stream)
+        if not is_running() or not wrote:
+            logger.warning(f"{LOG_TAG} ❌ .strm write failed: {stream.strm_path}")
+            record_stream(stream.stream_type.name, "failed")
+            return
 
-            # 4) Write NFO and schedule artwork downloads
-            if settings.write_nfo:
-                await asyncio.to_thread(write_if, True, stream, movie, write_movie_nfo)
-                asyncio.create_task(download_if_missing(LOG_TAG, stream, movie))
+        # 4) Write NFO and queue artwork downloads
+        if settings.write_nfo:
+            await run_fs(write_if, True, stream, movie, write_movie_nfo)
+            await side_tasks.submit("artwork", download_if_missing, LOG_TAG, stream, movie)
 
-            # 5) Schedule subtitles
-            if settings.opensubtitles_download:
-                logger.info(f"{LOG_TAG} 🔽 Downloading subtitles for: {title}")
-                asyncio.create_task(download_movie_subtitles(movie, stream))
+        # 5) Queue subtitles
+        if settings.opensubtitles_download:
+            logger.info(f"{LOG_TAG} 🔽 Downloading subtitles for: {title}")
+            await side_tasks.submit("subtitles", download_movie_subtitles, movie, stream)
 
-            # ✅ Add to movie_cache
-            movie_cache[stream.base_path.name] = True
+        # ✅ Add to movie_cache
+        movie_cache[stream.base_path.name] = True
+        await save_stream_state(stream, tmdb_id=movie.id)
+        record_stream(stream.stream_type.name, "processed")
 
     await asyncio.gather(*(_process_one(s) for s in streams))
 
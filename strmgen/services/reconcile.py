@@ -0,0 +1,253 @@
+# strmgen/services/reconcile.py
+"""
+Orphan reconciliation: remove output for streams that disappeared upstream.
+
+While a run lists each group, the runner records what the group's streams
+map to on disk: movie and 24/7 title folders, and TV shows with their
+seasons and episodes. A matched show's NFO and artwork folder is named
+after its TMDb title; it is kept when this run resolved the show or an
+earlier run stored the name with the show's streams, and while a listed
+show's folder is unknown no folder without seasons is removed. After a
+completed run every fully listed group
+folder is compared with that record, one directory at a time, and what no
+stream accounts for is removed by a pool of removal workers fed through a
+bounded queue. Memory grows with the number of streams, not files.
+
+A group is left alone when its listing was incomplete (fetch failure,
+resumed run, crash), empty, or when more than ``_MAX_ORPHAN_SHARE`` of
+its entries would go, which looks like a provider outage rather than
+titles being dropped. Dot-entries (the artwork store, the manifest
+sidecar, temp files) are never touched. ``clean_output_dir`` enables the
+stage; ``clean_output_dry_run`` only reports.
+"""
+import asyncio
+import logging
+import os
+import re
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from strmgen.core.config import get_settings
+from strmgen.core.concurrency import run_fs
+from strmgen.core.models.dispatcharr import DispatcharrStream
+from strmgen.core.models.enums import MediaType
+from strmgen.core.models.paths import MediaPaths
+from strmgen.core.utils import safe_remove
+from strmgen.services.show_identity import show_identities
+
+logger = logging.getLogger(__name__)
+
+TAG = "[CLEAN]"
+_MAX_ORPHAN_SHARE = 0.5
+_SAMPLE = 50
+RE_SEASON_DIR = re.compile(r"^Season (\d+)$")
+RE_EPISODE_FILE = re.compile(r" - S(\d+)E(\d+)\.")
+RE_YEAR_SUFFIX = re.compile(r" \(\d{4}\)$")
+
+
+@dataclass
+class _Expected:
+    layout: MediaType                                    # MOVIE or TV folder layout
+    complete: bool = True
+    streams: int = 0
+    folders: Set[str] = field(default_factory=set)       # movie folder names
+    titles: Set[str] = field(default_factory=set)        # movies listed without a year
+    episodes: Dict[str, Dict[int, Set[int]]] = field(default_factory=dict)  # show → season → episodes
+    show_folders: Dict[str, str] = field(default_factory=dict)  # show → TMDb-titled folder
+
+
+@dataclass
+class GroupReport:
+    group:    str
+    folder:   str
+    checked:  int = 0
+    orphans:  int = 0
+    removed:  int = 0
+    failed:   int = 0
+    skipped:  Optional[str] = None
+    sample:   List[str] = field(default_factory=list)
+
+
+class ExpectedOutput:
+    """What each group's listing accounts for on disk, collected during a run."""
+
+    def __init__(self) -> None:
+        self._groups: Dict[Path, _Expected] = {}
+
+    def _entry(self, media_type: MediaType, group: str) -> _Expected:
+        layout = MediaType.TV if media_type is MediaType.TV else MediaType.MOVIE
+        key = MediaPaths.group_folder(layout, group)
+        entry = self._groups.get(key)
+        if entry is None:
+            entry = self._groups[key] = _Expected(layout)
+        return entry
+
+    def add(self, media_type: MediaType, group: str, streams: Iterable[DispatcharrStream]) -> None:
+        entry = self._entry(media_type, group)
+        for s in streams:
+            entry.streams += 1
+            if entry.layout is MediaType.TV:
+                if s.season is not None and s.episode is not None:
+                    entry.episodes.setdefault(s.name, {}).setdefault(s.season, set()).add(s.episode)
+            else:
+                entry.folders.add(MediaPaths.folder_name(MediaType.MOVIE, s.name, s.year))
+                if not s.year:
+                    # the folder gets the TMDb year once the movie is matched
+                    entry.titles.add(s.name)
+
+    def add_show_folders(self, group: str, streams: Iterable[DispatcharrStream], folders: Dict[int, str]) -> None:
+        """Show folders stored by earlier runs (``folders``: stream id → folder name)."""
+        entry = self._entry(MediaType.TV, group)
+        for s in streams:
+            folder = folders.get(s.id)
+            if folder:
+                entry.show_folders[s.name] = folder
+
+    def incomplete(self, media_type: MediaType, group: str) -> None:
+        """The group was not listed in full this run; it is not reconciled."""
+        self._entry(media_type, group).complete = False
+
+    def groups(self) -> List[Tuple[Path, _Expected]]:
+        return list(self._groups.items())
+
+
+_last_report: Dict[str, Any] = {}
+
+
+def last_report() -> Dict[str, Any]:
+    return _last_report
+
+
+async def reconcile_output(expected: ExpectedOutput, dry_run: bool = False) -> Dict[str, Any]:
+    """Remove (or with ``dry_run`` only report) what no listed stream accounts for."""
+    global _last_report
+    settings = get_settings()
+    queue: "asyncio.Queue[Optional[Tuple[GroupReport, Path]]]" = asyncio.Queue(maxsize=1000)
+    n_workers = max(1, settings.fs_concurrency)
+
+    async def remover() -> None:
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                report, path = item
+                try:
+                    await run_fs(safe_remove, path)
+                    report.removed += 1
+                except Exception as e:
+                    report.failed += 1
+                    logger.warning("%s Could not remove %s: %s", TAG, path, e)
+            finally:
+                queue.task_done()
+
+    workers = [] if dry_run else [asyncio.create_task(remover()) for _ in range(n_workers)]
+    reports: List[GroupReport] = []
+    try:
+        for folder, exp in expected.groups():
+            report = GroupReport(group=folder.name, folder=str(folder))
+            reports.append(report)
+            if not exp.complete:
+                report.skipped = "incomplete listing"
+            elif not exp.streams:
+                report.skipped = "empty listing"
+            elif not await run_fs(folder.is_dir):
+                report.skipped = "no output folder"
+            if report.skipped:
+                continue
+
+            orphans = await run_fs(_find_orphans, folder, exp, report)
+            report.orphans = len(orphans)
+            report.sample = [str(p) for p in orphans[:_SAMPLE]]
+            if report.checked and report.orphans > report.checked * _MAX_ORPHAN_SHARE:
+                report.skipped = f"{report.orphans}/{report.checked} entries would be removed"
+                logger.warning("%s Not cleaning %s: %s", TAG, folder, report.skipped)
+                continue
+            if dry_run:
+                for p in orphans:
+                    logger.info("%s Would remove %s", TAG, p)
+                continue
+            for p in orphans:
+                await queue.put((report, p))
+            del orphans
+    finally:
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    totals = {
+        "orphans": sum(r.orphans for r in reports),
+        "removed": sum(r.removed for r in reports),
+        "failed":  sum(r.failed for r in reports),
+    }
+    _last_report = {"dry_run": dry_run, **totals, "groups": [asdict(r) for r in reports]}
+    logger.info(
+        "%s %s %d orphaned entries in %d groups (%d removed, %d failed, %d groups skipped)",
+        TAG, "Found" if dry_run else "Cleaned", totals["orphans"], len(reports),
+        totals["removed"], totals["failed"], sum(1 for r in reports if r.skipped),
+    )
+    return _last_report
+
+
+# ─── Directory walk (worker thread) ──────────────────────────────────────────
+def _entries(folder: Path) -> List[Tuple[str, bool]]:
+    """(name, is_dir) of one directory, without dot-entries."""
+    with os.scandir(folder) as it:
+        return [(e.name, e.is_dir(follow_symlinks=False)) for e in it if not e.name.startswith(".")]
+
+
+def _has_seasons(show_folder: Path) -> bool:
+    return any(is_dir and RE_SEASON_DIR.match(name) for name, is_dir in _entries(show_folder))
+
+
+def _find_orphans(group_folder: Path, exp: _Expected, report: GroupReport) -> List[Path]:
+    """
+    Paths under ``group_folder`` no listed stream accounts for. Only title
+    folders are returned for movies; for TV whole shows, whole seasons or
+    single episode files (.strm, .nfo, stills, subtitles).
+    """
+    orphans: List[Path] = []
+    show_folders: Set[str] = set()
+    unknown_folders = False
+    if exp.layout is MediaType.TV:
+        for show in exp.episodes:
+            folder = show_identities.folder_name(show) or exp.show_folders.get(show)
+            if folder:
+                show_folders.add(folder)
+            else:
+                unknown_folders = True
+    for name, is_dir in _entries(group_folder):
+        report.checked += 1
+        path = group_folder / name
+        if exp.layout is MediaType.MOVIE:
+            if name in exp.folders or RE_YEAR_SUFFIX.sub("", name) in exp.titles:
+                continue
+            orphans.append(path)
+            continue
+
+        seasons = exp.episodes.get(name)
+        if seasons is None and name in show_folders:
+            continue
+        if seasons is None and unknown_folders and is_dir and not _has_seasons(path):
+            # may be the NFO and artwork folder of a show this run did not resolve
+            continue
+        if seasons is None or not is_dir:
+            orphans.append(path)
+            continue
+        for season_name, season_is_dir in _entries(path):
+            report.checked += 1
+            m = RE_SEASON_DIR.match(season_name)
+            if not (m and season_is_dir):
+                continue  # show-level files: NFO, poster, fanart
+            episodes = seasons.get(int(m.group(1)))
+            if episodes is None:
+                orphans.append(path / season_name)
+                continue
+            for file_name, _ in _entries(path / season_name):
+                report.checked += 1
+                ep = RE_EPISODE_FILE.search(file_name)
+                if ep and int(ep.group(2)) not in episodes:
+                    orphans.append(path / season_name / file_name)
+    return orphans
@@ -7,6 +7,8 @@ from typing import List
 
 from .streams import write_strm_file
 from strmgen.core.string_utils import clean_name
+from strmgen.core.db import save_stream_state
+from strmgen.core.metrics import record_stream
 from strmgen.core.models.dispatcharr import DispatcharrStream
 
 logger = logging.getLogger(__name__)
@@ -37,10 +39,14 @@ async def process_24_7(
                 wrote = await write_strm_file(stream)
             except Exception:
                 logger.exception("Error writing .strm for '%s'", title)
+                record_stream(stream.stream_type.name, "failed")
                 return
 
             if not wrote:
+                record_stream(stream.stream_type.name, "skipped")
                 return
+            await save_stream_state(stream)
+            record_stream(stream.stream_type.name, "processed")
         except Exception as e:
             logger.error("Error processing stream %s: %s", stream.name, e)
             continue
@@ -0,0 +1,117 @@
+# strmgen/services/show_identity.py
+"""
+Run-scoped identity map for TV shows.
+
+The same series often appears in several TV groups (per language or per
+quality). The first group to reach a show resolves it on TMDb; the other
+groups reuse that resolution, keyed by normalized show name, and only the
+group-specific paths are rebuilt. Season payloads are shared the same way.
+A show TMDb has no match for is remembered too, so other groups skip it.
+
+The map is cleared when a run starts. Across runs, the persistent TMDb
+response cache and the not-found cache keep repeat lookups cheap.
+"""
+import asyncio
+import logging
+
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, Optional
+
+from strmgen.core.models.tv import SeasonMeta, TVShow
+from strmgen.core.string_utils import clean_name
+from strmgen.core.title_match import normalize
+from strmgen.services.tmdb import fetch_tv_details
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    show: Optional[TVShow]                                   # None: no TMDb match
+    seasons: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+
+class ShowIdentityMap:
+    def __init__(self) -> None:
+        self._entries: Dict[str, _Entry] = {}
+        self._pending: Dict[str, "asyncio.Task[_Entry]"] = {}
+        self._counts: Counter[str] = Counter()
+
+    @staticmethod
+    def key(show_name: str) -> str:
+        return normalize(clean_name(show_name))
+
+    async def resolve(
+        self,
+        group: str,
+        show_name: str,
+        seasons: Iterable[int] = (),
+        retry_missing: bool = False,
+    ) -> Optional[TVShow]:
+        """
+        The show for ``group``, looked up on TMDb only by the first group
+        to ask. ``seasons`` are fetched along with the show on that first
+        lookup; seasons any group has already loaded are attached to the
+        returned show for ``get_show_seasons``. With ``retry_missing`` a
+        show remembered as unmatched is looked up again.
+        """
+        seasons = list(seasons)
+        key = self.key(show_name)
+        entry = self._entries.get(key)
+        if entry is None or (entry.show is None and retry_missing):
+            task = self._pending.get(key)
+            if task is None:
+                task = asyncio.create_task(self._lookup(key, group, show_name, seasons))
+                self._pending[key] = task
+                task.add_done_callback(lambda t: self._pending.pop(key, None))
+            else:
+                self._counts["shared"] += 1
+            entry = await asyncio.shield(task)
+        else:
+            self._counts["shared"] += 1
+
+        if entry.show is None:
+            return None
+        # a fresh TVShow per group: __post_init__ recomputes the paths
+        return replace(
+            entry.show,
+            channel_group_name=group,
+            seasons={n: entry.seasons[n] for n in seasons if n in entry.seasons},
+        )
+
+    async def _lookup(self, key: str, group: str, show_name: str, seasons: list) -> _Entry:
+        self._counts["lookups"] += 1
+        show = await fetch_tv_details(group, show_name, seasons=seasons)
+        entry = _Entry(show)
+        if show is not None:
+            entry.seasons.update(show.seasons)
+            show.seasons = {}
+        else:
+            self._counts["unmatched"] += 1
+        self._entries[key] = entry
+        return entry
+
+    def remember_seasons(self, show_name: str, metas: Dict[int, SeasonMeta]) -> None:
+        """Keep season payloads one group fetched for the next group."""
+        entry = self._entries.get(self.key(show_name))
+        if entry is not None and entry.show is not None:
+            for n, meta in metas.items():
+                entry.seasons.setdefault(n, meta.raw)
+
+    def folder_name(self, show_name: str) -> Optional[str]:
+        """Folder the show's NFO and artwork went to this run (named after the TMDb title)."""
+        entry = self._entries.get(self.key(show_name))
+        if entry is None or entry.show is None:
+            return None
+        return entry.show.show_folder.name
+
+    def reset(self) -> None:
+        self._entries.clear()
+        self._counts.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"shows": len(self._entries), **self._counts}
+
+
+show_identities = ShowIdentityMap()
@@ -4,21 +4,127 @@ import asyncio
 import httpx
 import logging
 
-from pathlib import Path
-from typing import List, Optional, Any
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional
 from urllib.parse import quote_plus
 from fastapi import HTTPException
 
+from strmgen.core import fastjson
 from strmgen.core.config import get_settings
 from strmgen.core.auth import get_auth_headers
 from strmgen.core.models.dispatcharr import DispatcharrStream, MediaType
 from strmgen.core.clients import async_client
+from strmgen.core.concurrency import dispatcharr_budget, run_fs
+from strmgen.core.manifest import output_manifest
+from strmgen.core.utils import materialize
 
 logger = logging.getLogger(__name__)
 API_TIMEOUT = 10.0
+_PAGE_SIZE = 1000
 
 tag = "[STRM]"
 
+async def iter_stream_pages(
+    group_name: str,
+    stream_type: MediaType,
+    updated_only: bool = False,
+    start_page: int = 1,
+) -> AsyncIterator[List[DispatcharrStream]]:
+    """
+    Async iterator over the Stream entries of a channel group, yielding one
+    parsed page of DispatcharrStream at a time so callers can start work
+    before the whole group has been downloaded.
+
+    The first page's ``count`` gives the number of pages; the rest are
+    fetched ``stream_page_concurrency`` at a time and yielded in page order.
+    Without a ``count`` the listing is walked by following ``next``.
+    """
+    settings = get_settings()
+    data = await _fetch_page(group_name, start_page)
+    if data is None:
+        return
+    yield _parse_page(data, group_name, stream_type, updated_only)
+
+    count = data.get("count")
+    last = start_page
+    if isinstance(count, int) and data.get("next"):
+        last = max(start_page, -(-count // _PAGE_SIZE))
+        window = max(1, settings.stream_page_concurrency)
+        pending: Deque["asyncio.Task[Optional[Dict[str, Any]]]"] = deque()
+        next_page = start_page + 1
+        try:
+            while pending or next_page <= last:
+                while next_page <= last and len(pending) < window:
+                    pending.append(asyncio.create_task(_fetch_page(group_name, next_page)))
+                    next_page += 1
+                data = await pending.popleft()
+                if data is None:
+                    return
+                yield _parse_page(data, group_name, stream_type, updated_only)
+        finally:
+            # stopped early (error, consumer gone): drop the pages in flight
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    # no count, or the group grew while it was listed
+    page = last
+    while data.get("next"):
+        page += 1
+        data = await _fetch_page(group_name, page)
+        if data is None:
+            return
+        yield _parse_page(data, group_name, stream_type, updated_only)
+
+
+async def _fetch_page(group_name: str, page: int) -> Optional[Dict[str, Any]]:
+    """One page of a group's stream listing; None (logged) when Dispatcharr refuses it."""
+    logger.info(
+        "%s Fetching streams for group '%s': page: %d...",
+        tag, group_name, page
+    )
+    url = (
+        f"{get_settings().api_base}/api/channels/streams/"
+        f"?page={page}&page_size={_PAGE_SIZE}&ordering=name&channel_group={quote_plus(group_name)}"
+    )
+    resp = await _request("GET", url)
+    if not resp.is_success:
+        logger.error(
+            "%s ❌ Error fetching streams for group '%s' (page %d): %d %s",
+            tag, group_name, page, resp.status_code, await resp.aread()
+        )
+        return None
+    # decoded from bytes: the body is never copied into a str
+    data = fastjson.loads(resp.content)
+    logger.debug(
+        "%s Page %d of '%s': %d bytes on the wire, %d decoded (%s)",
+        tag, page, group_name, resp.num_bytes_downloaded, len(resp.content),
+        resp.headers.get("content-encoding", "identity"),
+    )
+    return data
+
+
+def _parse_page(
+    data: Dict[str, Any],
+    group_name: str,
+    stream_type: MediaType,
+    updated_only: bool,
+) -> List[DispatcharrStream]:
+    # hand items over one at a time, releasing each dict once its stream is
+    # built, so a page's decoded JSON and its streams are not all alive at once
+    results = data.pop("results", None) or []
+    results.reverse()
+
+    def _drain() -> Iterator[Dict[str, Any]]:
+        while results:
+            yield results.pop()
+
+    out = DispatcharrStream.from_page(_drain(), group_name, stream_type)
+    if updated_only:
+        out = [ds for ds in out if ds.stream_updated is None or ds.stream_updated]
+    return out
+
+
 async def fetch_streams_by_group_name(
     group_name: str,
     stream_type: MediaType,
@@ -28,53 +134,9 @@ async def fetch_streams_by_group_name(
     Async fetch all Stream entries for a given channel group,
     with automatic token refresh, returning DispatcharrStream.
     """
-    settings = get_settings()
     out: List[DispatcharrStream] = []
-    page = 1
-    enc = quote_plus(group_name)
-    page_size = 1000
-    while True:
-        logger.info(
-            "%s Fetching streams for group '%s': page: %d...",
-            tag, group_name, page
-        )
-        url = (
-            f"{settings.api_base}/api/channels/streams/"
-            f"?page={page}&page_size={page_size}&ordering=name&channel_group={enc}"
-        )
-        resp = await _request("GET", url)
-        # stream_count = data.get("count", 0)
-
-
-        if not resp.is_success:
-            logger.error(
-                "%s ❌ Error fetching streams for group '%s': %d %s",
-                tag, group_name, resp.status_code, await resp.aread()
-            )
-            break
-        data = resp.json()
-        for item in data.get("results", []):
-            try:
-                ds = DispatcharrStream.from_dict(
-                    item,
-                    channel_group_name=group_name,
-                    stream_type=stream_type,
-                )
-                if not ds:
-                    continue
-
-                if updated_only:
-                    if ds.stream_updated is None or ds.stream_updated:
-                        out.append(ds)
-                else:
-                    out.append(ds)
-            except Exception as e:
-                logger.error("Failed to parse DispatcharrStream for %s: %s", item, e)
-
-        if not data.get("next"):
-            break
-        page += 1
-
+    async for page in iter_stream_pages(group_name, stream_type, updated_only):
+        out.extend(page)
     return out
 
 
@@ -134,28 +196,23 @@ async def write_strm_file(
         logger.warning("%s ⚠️ Stream #%d unreachable, skipping", tag, stream.id)
         return False
 
-    if not settings.update_stream_link and await asyncio.to_thread(stream.strm_path.exists):
+    if not settings.update_stream_link and await output_manifest.exists(stream.strm_path):
         return True
 
-    # Ensure target directory exists
-    await asyncio.to_thread(stream.strm_path.parent.mkdir, parents=True, exist_ok=True)
-
-    if await is_strm_up_to_date(stream):
+    # one worker-thread job: folder, up-to-date check and write
+    report = await run_fs(materialize, [(stream.strm_path, stream.proxy_url.strip())])
+    if report.failed:
+        return False
+    if report.unchanged:
         logger.info("%s ⚠️ .strm up-to-date: %s", tag, stream.strm_path)
-        return True
-
-    # Write the file
-    await asyncio.to_thread(stream.strm_path.write_text, stream.proxy_url.strip(), "utf-8")
-    logger.info("%s ✅ Wrote .strm: %s", tag, stream.strm_path)
+    else:
+        logger.info("%s ✅ Wrote .strm: %s", tag, stream.strm_path)
     return True
 
 
 async def is_strm_up_to_date(stream: DispatcharrStream, encoding: str = "utf-8") -> bool:
-    path: Path = stream.strm_path
-    if not await asyncio.to_thread(path.exists):
-        return False
-    existing = await asyncio.to_thread(path.read_text, encoding)
-    return existing.strip() == stream.proxy_url.strip()
+    data = stream.proxy_url.strip().encode(encoding)
+    return await run_fs(output_manifest.same_content, stream.strm_path, data)
 
 
 async def fetch_groups() -> List[str]:
@@ -186,52 +243,21 @@ async def fetch_groups() -> List[str]:
     return groups
 
 
-async def fetch_streams(
-    group: str,
-    stream_type: str,
-    timeout: float = API_TIMEOUT,
-) -> List[DispatcharrStream]:
-    out: List[DispatcharrStream] = []
-    settings = get_settings()
-    url = f"{settings.api_base.rstrip('/')}\
-/ api/channels/streams/"
-    page = 1
-
-    while True:
-        params = {
-            "search":      group,
-            "stream_type": stream_type,
-            "ordering":    "name",
-        }
-        resp = await _request("GET", url, timeout=timeout, params=params)
-        resp.raise_for_status()
-        body: Any = resp.json()
-
-        items = body.get("results", body if isinstance(body, list) else [])
-        for entry in items:
-            try:
-                out.append(DispatcharrStream.from_dict(entry))
-            except Exception as e:
-                logger.warning("%s Skipping invalid stream entry: %s — %s", tag, entry, e)
-
-        if not body.get("next"):
-            break
-        page += 1
-
-    return out
-
-
 async def _request(
     method: str, url: str, timeout: float = API_TIMEOUT, **kwargs
 ) -> httpx.Response:
     # 1) grab a fresh header
     headers = await get_auth_headers()
-    resp = await async_client.request(method, url, headers=headers, timeout=timeout, **kwargs)
+    async with dispatcharr_budget.slot() as slot:
+        resp = await async_client.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        slot.observe(resp.status_code)
 
     # 2) if we got kicked back, force-refresh & retry once
     if resp.status_code == 401:
         logger.info("[AUTH] 🔄 Token expired, refreshing & retrying")
         headers = await get_auth_headers(expired=True)
-        resp = await async_client.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        async with dispatcharr_budget.slot() as slot:
+            resp = await async_client.request(method, url, headers=headers, timeout=timeout, **kwargs)
+            slot.observe(resp.status_code)
 
     return resp
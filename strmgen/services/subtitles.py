@@ -11,6 +11,7 @@ from opensubtitlescom import OpenSubtitles
 
 from strmgen.core.config import get_settings
 from strmgen.core.utils import safe_mkdir
+from strmgen.core.manifest import output_manifest
 from strmgen.core.string_utils import clean_name
 from strmgen.services.tmdb import Movie
 from strmgen.core.models.dispatcharr import DispatcharrStream
@@ -75,6 +76,7 @@ async def _download_and_write(params: dict[str, Any], filename: str, folder: Pat
 
         output_path = folder / filename
         shutil.copy(sub_path, output_path)
+        output_manifest.wrote(output_path)
         Path(sub_path).unlink(missing_ok=True)
         logger.info(f"[SUB] Subtitle saved as: {output_path}")
 
@@ -106,7 +108,7 @@ async def download_movie_subtitles(
 
     filename = f"{clean_name(meta.title)}.en.srt"
     filepath = stream.base_path / filename
-    if await asyncio.to_thread(filepath.exists):
+    if await output_manifest.exists(filepath):
         logger.info(f"[SUB] Subtitle exists: {filepath}")
         return
 
@@ -137,7 +139,7 @@ async def download_episode_subtitles(
 
     filename = f"{clean_name(show)} - S{season:02d}E{ep:02d}.en.srt"
     filepath = folder / filename
-    if await asyncio.to_thread(filepath.exists):
+    if await output_manifest.exists(filepath):
         logger.info(f"[SUB] Subtitle exists: {filepath}")
         return
 
@@ -2,48 +2,118 @@
 
 import asyncio
 import random
-from difflib import SequenceMatcher
-from typing import Optional, Dict, List, Any, TypeVar
+from typing import Optional, Dict, Iterable, List, Any, Tuple, TypeVar
 from pathlib import Path
 from datetime import datetime
 import logging
+from collections import Counter
 
-import aiofiles
 import httpx
-from httpx import PoolTimeout, HTTPError
 
 from strmgen.core.config import get_settings
-from strmgen.core.utils import safe_mkdir
 from strmgen.core.string_utils import clean_name
-from strmgen.core.clients import tmdb_client, tmdb_image_client, tmdb_limiter
+from strmgen.core import title_match
+from strmgen.core.clients import tmdb_client
+from strmgen.core.concurrency import tmdb_budget
+from strmgen.core.manifest import output_manifest
+from strmgen.core.metrics import TMDB_COALESCED, TMDB_DETAIL_REQUESTS_SAVED
+from strmgen.core.tmdb_traffic import lane_for, tmdb_traffic
 from strmgen.core.models.dispatcharr import DispatcharrStream
 from strmgen.core.models.tv import TVShow, EpisodeMeta, SeasonMeta
 from strmgen.core.models.movie import Movie
+from strmgen.services import artwork, tmdb_cache, tmdb_fields, tmdb_not_found
 
 
 logger = logging.getLogger(__name__)
 
+# Requests currently on the wire, keyed by endpoint + params
+_inflight: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], "asyncio.Task[Any]"] = {}
+
 
 async def _get(endpoint: str, params: Dict[str, Any]) -> Any:
+    """
+    TMDb GET with request coalescing: identical calls already in flight
+    share one network request and one parsed result, which callers must
+    treat as read-only.
+    """
+    key = (endpoint, tuple(sorted(params.items())))
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_cached_get(endpoint, params))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _forget(key, t))
+    else:
+        TMDB_COALESCED.inc()
+    # shield so one cancelled caller does not cancel the request for the rest
+    return await asyncio.shield(task)
+
+
+def _forget(key: Tuple[str, Tuple[Tuple[str, Any], ...]], task: "asyncio.Task[Any]") -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        # waiters re-raise it themselves; avoid "exception never retrieved"
+        task.exception()
+
+
+async def _cached_get(endpoint: str, params: Dict[str, Any]) -> Any:
+    """
+    Serve from the persistent cache; expired entries are revalidated with
+    their ETag, and used as-is if TMDb cannot be reached.
+    """
+    key = tmdb_cache.cache_key(endpoint, params)
+    entry = await tmdb_cache.lookup(key)
+    if entry and entry["fresh"]:
+        return entry["payload"]
+
+    resp = await _fetch(endpoint, params, etag=entry["etag"] if entry else None)
+    if resp is None:
+        return entry["payload"] if entry else None
+    if resp.status_code == 304 and entry:
+        await tmdb_cache.revalidated(key, tmdb_cache.endpoint_kind(endpoint, params))
+        return entry["payload"]
+    data = resp.json()
+    await tmdb_cache.store(key, tmdb_cache.endpoint_kind(endpoint, params), resp.text, resp.headers.get("etag"))
+    return data
+
+
+async def _fetch(
+    endpoint: str,
+    params: Dict[str, Any],
+    etag: Optional[str] = None,
+) -> Optional[httpx.Response]:
     """
     Internal TMDb GET with retry/backoff and rate-limit handling.
+    Returns the successful (or 304 Not Modified) response, None after retries.
     """
     backoff = 1
     settings = get_settings()
+    lane = lane_for(endpoint)
+    headers = {"If-None-Match": etag} if etag else None
     for attempt in range(3):
         try:
-            async with tmdb_limiter:
+            await tmdb_traffic.acquire(lane)
+            async with tmdb_budget.slot() as slot:
                 resp = await tmdb_client.get(
                     endpoint,
-                    params={**params, "api_key": settings.tmdb_api_key}
+                    params={**params, "api_key": settings.tmdb_api_key},
+                    headers=headers,
                 )
+                slot.observe(resp.status_code)
+            paused = tmdb_traffic.observe(resp)
             if resp.status_code == 429:
+                if paused:
+                    # the scheduler holds every metadata lane until Retry-After
+                    logger.warning("[TMDB] 429 for %s, retrying after %.1fs", endpoint, paused)
+                    continue
                 logger.warning("[TMDB] 429 for %s, backing off %ds", endpoint, backoff)
                 await asyncio.sleep(backoff + random.random())
                 backoff = min(backoff * 2, 8)
                 continue
+            if resp.status_code == 304:
+                return resp
             resp.raise_for_status()
-            return resp.json()
+            return resp
         except httpx.HTTPStatusError as exc:
             if exc.response.status_code == 429:
                 logger.warning("[TMDB] Rate-limit on attempt %d for %s", attempt+1, endpoint)
@@ -70,6 +140,119 @@ async def search_any_tmdb(title: str) -> Optional[Dict[str, Any]]:
         logger.error("[TMDB] multi-search failed for '%s': %s", title, e)
         return None
 
+# Detail requests made vs. avoided by two-phase matching since the last reset
+_match_stats: Counter = Counter()
+
+
+def movie_match_stats() -> Dict[str, int]:
+    return dict(_match_stats)
+
+
+def reset_movie_match_stats() -> None:
+    _match_stats.clear()
+
+
+def _release_year(rel_date: Optional[str]) -> Optional[int]:
+    if not rel_date:
+        return None
+    try:
+        return datetime.fromisoformat(rel_date).year       # e.g. "2022-05-13"
+    except ValueError:
+        return None
+
+
+def _no_candidates(results: List[Dict[str, Any]], year: Optional[int]) -> bool:
+    """True when no search result could match: none at all, or none from ``year``."""
+    return not any(
+        r.get("id") and (year is None or _release_year(r.get("release_date")) in (None, year))
+        for r in results
+    )
+
+
+def _movie_from(det: Dict[str, Any]) -> Movie:
+    det = tmdb_fields.project("movie", det)
+    return Movie(
+        id=det.get("id", 0),
+        title=det.get("title", ""),
+        original_title=det.get("original_title", ""),
+        overview=det.get("overview", ""),
+        poster_path=det.get("poster_path"),
+        backdrop_path=det.get("backdrop_path"),
+        release_date=det.get("release_date", ""),
+        adult=det.get("adult", False),
+        original_language=det.get("original_language", ""),
+        genre_ids=det.get("genres", []),
+        popularity=det.get("popularity", 0.0),
+        video=det.get("video", False),
+        vote_average=det.get("vote_average", 0.0),
+        vote_count=det.get("vote_count", 0),
+        alternative_titles=det.get("alternative_titles", {}),
+        changes=det.get("changes", {}),
+        credits=det.get("credits", {}),
+        external_ids=det.get("external_ids", {}),
+        images=det.get("images", {}),
+        keywords=det.get("keywords", {}),
+        lists=det.get("lists", {}),
+        recommendations=det.get("recommendations", {}),
+        release_dates=det.get("release_dates", {}),
+        reviews=det.get("reviews", {}),
+        similar=det.get("similar", {}),
+        translations=det.get("translations", {}),
+        videos=det.get("videos", {}),
+        watch_providers=det.get("watch/providers", {}),
+        raw=det,
+    )
+
+
+async def _match_two_phase(
+    results: List[Dict[str, Any]],
+    title: str,
+    year: Optional[int],
+) -> Optional[Dict[str, Any]]:
+    """
+    Rank search results on their own fields, then fetch full details only
+    for the winner, or for the top-k candidates when the ranking is too
+    close to call.
+    """
+    settings = get_settings()
+    query = title_match.make_query(clean_name(title), year)
+    eligible: List[Dict[str, Any]] = []
+    for r in results:
+        if not r.get("id"):
+            continue
+        rel_year = _release_year(r.get("release_date"))
+        if year is not None and rel_year is not None and rel_year != year:
+            logger.debug("[TMDB] Skipping %s (%s) — year mismatch", r.get("title"), rel_year)
+            continue
+        eligible.append(r)
+    ranked = title_match.rank(query, eligible)
+    if not ranked:
+        return None
+
+    top_score = ranked[0][0]
+    shortlist = [
+        c for c in ranked[:max(1, settings.tmdb_movie_match_top_k)]
+        if top_score - c[0] <= settings.tmdb_movie_match_margin
+    ]
+    if len(shortlist) > 1:
+        _match_stats["ambiguous"] += 1
+        logger.debug("[TMDB] %d close candidates for %r; comparing details", len(shortlist), title)
+
+    details = []
+    for _, r in shortlist:
+        det = await _get(f"/movie/{r['id']}", tmdb_fields.append_params("movie"))
+        if det:
+            details.append(det)
+    _match_stats["detail_requests"] += len(shortlist)
+    # the single-phase matcher fetched details for every search result
+    saved = sum(1 for r in results if r.get("id")) - len(shortlist)
+    _match_stats["detail_requests_saved"] += saved
+    TMDB_DETAIL_REQUESTS_SAVED.inc(saved)
+    # details add alternative titles to match against
+    winner = title_match.best(query, details)
+    return winner[1] if winner else None
+
+
 async def fetch_movie_details(
     title: Optional[str] = None,
     year: Optional[int] = None,
@@ -78,17 +261,13 @@ async def fetch_movie_details(
     settings = get_settings()
     if not settings.tmdb_api_key:
         return None
-    append_sections = [
-        "alternative_titles","changes","credits","external_ids",
-        "images","keywords","lists","recommendations",
-        "release_dates","reviews","similar","translations",
-        "videos","watch/providers",
-    ]
-    append_to = {"append_to_response": ",".join(append_sections)}
+    append_to = tmdb_fields.append_params("movie")
     try:
         if tmdb_id:
             detail = await _get(f"/movie/{tmdb_id}", append_to)
         else:
+            if await tmdb_not_found.is_known_missing("movie", title or "", year):
+                return None
             logger.info("[TMDB] Searching movie: %s (%s)", title, year)
             params: Dict[str, Any] = {"query": title or ""}
             if year:
@@ -96,122 +275,70 @@ async def fetch_movie_details(
             search_data = await _get("/search/movie", params)
             results = search_data.get("results", []) if search_data else []
             if not results:
+                if search_data is not None:
+                    await tmdb_not_found.remember("movie", title or "", year)
                 return None
+            _match_stats["searches"] += 1
 
-            candidates: List[Movie] = []
-            for r in results:
-                mid = r.get("id")
-                if not mid:
-                    continue
+            if settings.tmdb_movie_two_phase_match:
+                detail = await _match_two_phase(results, title or "", year)
+            else:
+                candidates: List[Dict[str, Any]] = []
+                for r in results:
+                    mid = r.get("id")
+                    if not mid:
+                        continue
 
-                # fetch full details
-                det = await _get(f"/movie/{mid}", append_to)
-                rel_date = det.get("release_date", "")
-                if rel_date:
-                    try:
-                        dt = datetime.fromisoformat(rel_date)       # e.g. "2022-05-13"
-                        rel_year = dt.year
-                    except ValueError:
-                        rel_year = None
-                else:
-                    rel_year = None
-
-                # skip if we asked for a year and it doesn't match
-                if year is not None and rel_year is not None and rel_year != year:
-                    logger.debug("[TMDB] Skipping %s (%s) — year mismatch", det.get("title"), rel_year)
-                    continue
+                    # fetch full details
+                    det = await _get(f"/movie/{mid}", append_to)
+                    _match_stats["detail_requests"] += 1
+                    rel_year = _release_year(det.get("release_date", ""))
 
-                candidates.append(Movie(
-                    id=det.get("id", 0),
-                    title=det.get("title", ""),
-                    original_title=det.get("original_title", ""),
-                    overview=det.get("overview", ""),
-                    poster_path=det.get("poster_path"),
-                    backdrop_path=det.get("backdrop_path"),
-                    release_date=rel_date,
-                    adult=det.get("adult", False),
-                    original_language=det.get("original_language", ""),
-                    genre_ids=det.get("genres", []),
-                    popularity=det.get("popularity", 0.0),
-                    video=det.get("video", False),
-                    vote_average=det.get("vote_average", 0.0),
-                    vote_count=det.get("vote_count", 0),
-                    alternative_titles=det.get("alternative_titles", {}),
-                    changes=det.get("changes", {}),
-                    credits=det.get("credits", {}),
-                    external_ids=det.get("external_ids", {}),
-                    images=det.get("images", {}),
-                    keywords=det.get("keywords", {}),
-                    lists=det.get("lists", {}),
-                    recommendations=det.get("recommendations", {}),
-                    release_dates=det.get("release_dates", {}),
-                    reviews=det.get("reviews", {}),
-                    similar=det.get("similar", {}),
-                    translations=det.get("translations", {}),
-                    videos=det.get("videos", {}),
-                    watch_providers=det.get("watch/providers", {}),
-                    raw=det,
-                ))
-
-            if not candidates:
-                return None
+                    # skip if we asked for a year and it doesn't match
+                    if year is not None and rel_year is not None and rel_year != year:
+                        logger.debug("[TMDB] Skipping %s (%s) — year mismatch", det.get("title"), rel_year)
+                        continue
+
+                    candidates.append(det)
 
-            # scoring / fallback
-            target = clean_name(title or "")
-            def score(m: Movie) -> float:
-                sim = SequenceMatcher(None, clean_name(m.title), target).ratio()
-                year_score = 1.0  # since we’ve already filtered mismatches
-                return 0.7 * sim + 0.3 * year_score
+                winner = title_match.best(title_match.make_query(clean_name(title or ""), year), candidates)
+                detail = winner[1] if winner else None
 
-            best: Movie = await asyncio.to_thread(max, candidates, key=score)
-            detail = best.raw
+            # a failed detail request is not a missing title
+            if not detail and _no_candidates(results, year):
+                await tmdb_not_found.remember("movie", title or "", year)
 
         if not detail:
             return None
 
         # final construction
-        return Movie(
-            id=detail.get("id", 0),
-            title=detail.get("title", ""),
-            original_title=detail.get("original_title", ""),
-            overview=detail.get("overview", ""),
-            poster_path=detail.get("poster_path", None),
-            backdrop_path=detail.get("backdrop_path", None),
-            release_date=detail.get("release_date", ""),
-            adult=detail.get("adult", False),
-            original_language=detail.get("original_language", ""),
-            genre_ids=detail.get("genres", []),
-            popularity=detail.get("popularity", 0.0),
-            video=detail.get("video", False),
-            vote_average=detail.get("vote_average", 0.0),
-            vote_count=detail.get("vote_count", 0),
-            alternative_titles=detail.get("alternative_titles", {}),
-            changes=detail.get("changes", {}),
-            credits=detail.get("credits", {}),
-            external_ids=detail.get("external_ids", {}),
-            images=detail.get("images", {}),
-            keywords=detail.get("keywords", {}),
-            lists=detail.get("lists", {}),
-            recommendations=detail.get("recommendations", {}),
-            release_dates=detail.get("release_dates", {}),
-            reviews=detail.get("reviews", {}),
-            similar=detail.get("similar", {}),
-            translations=detail.get("translations", {}),
-            videos=detail.get("videos", {}),
-            watch_providers=detail.get("watch/providers", {}),
-            raw=detail,
-        )
+        return _movie_from(detail)
     except Exception as e:
         logger.error("[TMDB] movie details failed: %s", e)
         return None
     
 
 
+# TMDb accepts at most this many append_to_response sections per request
+_MAX_APPEND = 20
+
+
+def _bulk_seasons() -> bool:
+    # seasons appended to /tv/{id} cannot carry sections of their own
+    return not tmdb_fields.append_sections("season")
+
+
 async def fetch_tv_details(
     group: str,
     query: Optional[str] = None,
-    tv_id: Optional[int] = None
+    tv_id: Optional[int] = None,
+    seasons: Iterable[int] = (),
 ) -> Optional[TVShow]:
+    """
+    Show metadata by id or by title search. Any ``seasons`` are appended
+    to the same request and kept on ``TVShow.seasons`` for
+    ``get_show_seasons``.
+    """
     settings = get_settings()
     if not settings.tmdb_api_key:
         return None
@@ -219,32 +346,29 @@ async def fetch_tv_details(
         # if not _tv_genre_map:
         #     await init_tv_genre_map()
 
-        append = {"append_to_response": "credits"}
+        sections = list(tmdb_fields.append_sections("tv"))
+        wanted = sorted(set(seasons))[:max(0, _MAX_APPEND - len(sections))] if _bulk_seasons() else []
+        sections += [f"season/{n}" for n in wanted]
+        append = {"append_to_response": ",".join(sections)} if sections else {}
 
         if tv_id:
             detail = await _get(f"/tv/{tv_id}", append)
         else:
             if not query:
                 return None
+            if await tmdb_not_found.is_known_missing("tv", query):
+                return None
 
             logger.info("[TMDB] Searching TV: %s", query)
             data = await _get("/search/tv", {"query": query})
             results = data.get("results", []) if data else []
 
-            # → FIX: use .ratio() on the SequenceMatcher
-            if results:
-                best = max(
-                    results,
-                    key=lambda r: SequenceMatcher(
-                        None,
-                        query.lower(),
-                        r.get("name", "").lower()
-                    ).ratio()
-                )
-            else:
-                best = None
+            winner = title_match.best(title_match.make_query(query), results)
+            best = winner[1] if winner else None
 
             if not best or not best.get("id"):
+                if data is not None:
+                    await tmdb_not_found.remember("tv", query)
                 return None
 
             tv_id = best["id"]
@@ -252,6 +376,10 @@ async def fetch_tv_details(
 
         if not detail:
             return None
+        season_data = {
+            n: detail[f"season/{n}"] for n in wanted if detail.get(f"season/{n}")
+        }
+        detail = tmdb_fields.project("tv", detail)
 
         return TVShow(
             id=detail.get("id", 0),
@@ -272,6 +400,7 @@ async def fetch_tv_details(
             origin_country=detail.get("origin_country", []),
             external_ids=detail.get("external_ids", {}),
             raw=detail,
+            seasons=season_data,
         )
 
     except Exception as e:
@@ -279,33 +408,11 @@ async def fetch_tv_details(
         return None
 
 async def _download_image(path_val: str, dest: Path) -> None:
-    settings = get_settings()
-    safe_mkdir(dest.parent)
-    url = f"/{settings.tmdb_image_size}{path_val}"
-    retries = 3
-    for attempt in range(1, retries+1):
-        try:
-            resp = await tmdb_image_client.get(url)
-            resp.raise_for_status()
-            async with aiofiles.open(dest, "wb") as f:
-                await f.write(resp.content)
-            logger.info("[TMDB] Downloaded image: %s", dest)
-            return
-        except PoolTimeout:
-            if attempt < retries:
-                wait = attempt
-                logger.warning("[TMDB] PoolTimeout, retry %d/%d", attempt, retries)
-                await asyncio.sleep(wait)
-                continue
-            else:
-                logger.error("[TMDB] PoolTimeout giving up on %s", url)
-        except HTTPError as exc:
-            logger.warning("[TMDB] HTTP error on %s: %s", url, exc)
-            return
-    logger.error("[TMDB] Failed to download image after retries: %s", url)
+    # downloaded once into the artwork store, then linked to each destination
+    if not await artwork.place(path_val, dest):
+        logger.error("[TMDB] Failed to download image: %s", path_val)
 
 T = TypeVar("T", Movie, TVShow, SeasonMeta, EpisodeMeta)
-_download_semaphore = asyncio.Semaphore(30)
 
 async def download_if_missing(
     log_tag: str,
@@ -320,15 +427,31 @@ async def download_if_missing(
         backdrop_url = getattr(tmdb, "backdrop_path", None)
     poster_path = stream.poster_path
     fanart_path = stream.backdrop_path
-    async with _download_semaphore:
-        if poster_url and not await asyncio.to_thread(poster_path.exists):
-            logger.info(f"{log_tag} Downloading poster %s", poster_url)
-            await _download_image(poster_url, poster_path)
-        if backdrop_url and not await asyncio.to_thread(fanart_path.exists):
-            logger.info(f"{log_tag} Downloading backdrop %s", backdrop_url)
-            await _download_image(backdrop_url, fanart_path)
+    if poster_url and not await output_manifest.exists(poster_path):
+        logger.info(f"{log_tag} Downloading poster %s", poster_url)
+        await _download_image(poster_url, poster_path)
+    if backdrop_url and not await output_manifest.exists(fanart_path):
+        logger.info(f"{log_tag} Downloading backdrop %s", backdrop_url)
+        await _download_image(backdrop_url, fanart_path)
     return True
 
+def _season_from(stream: DispatcharrStream, data: Dict[str, Any], season: int) -> SeasonMeta:
+    data = tmdb_fields.project("season", data)
+    return SeasonMeta(
+        channel_group_name=stream.channel_group_name,
+        show=stream.name,
+        id=data.get("id", 0),
+        name=data.get("name", ""),
+        overview=data.get("overview", ""),
+        air_date=data.get("air_date", ""),
+        raw_episodes=data.get("episodes", []),
+        poster_path=data.get("poster_path"),
+        season_number=data.get("season_number", season),
+        vote_average=data.get("vote_average", 0.0),
+        raw=data,
+    )
+
+
 async def get_season_meta(
     stream: DispatcharrStream,
     mshow: TVShow
@@ -337,25 +460,48 @@ async def get_season_meta(
     season = stream.season
 
     try:
-        data = await _get(f"/tv/{show_id}/season/{season}", {})
-        meta = SeasonMeta(
-            channel_group_name=stream.channel_group_name,
-            show=stream.name,
-            id=data.get("id", 0),
-            name=data.get("name", ""),
-            overview=data.get("overview", ""),
-            air_date=data.get("air_date", ""),
-            raw_episodes=data.get("episodes", []),
-            poster_path=data.get("poster_path"),
-            season_number=data.get("season_number", season),
-            vote_average=data.get("vote_average", 0.0),
-            raw=data,
-        )
-        return meta
+        data = await _get(f"/tv/{show_id}/season/{season}", tmdb_fields.append_params("season"))
+        return _season_from(stream, data, season)
     except Exception as e:
         logger.warning("[TMDB] Season lookup failed: %s", e)
         return None
 
+
+async def get_show_seasons(
+    mshow: TVShow,
+    samples: Dict[int, DispatcharrStream],
+) -> Dict[int, SeasonMeta]:
+    """
+    SeasonMeta for every season in ``samples`` (season number → one of its
+    streams). Seasons already fetched with the show are used as-is, the
+    rest are appended 20 at a time to ``/tv/{id}`` requests; a season TMDb
+    leaves out of a bulk response falls back to its own lookup.
+    """
+    data: Dict[int, Dict[str, Any]] = dict(mshow.seasons)
+    # the payloads now live on the SeasonMeta objects
+    mshow.seasons = {}
+    bulk = sorted(n for n in samples if n not in data) if _bulk_seasons() else []
+    for i in range(0, len(bulk), _MAX_APPEND):
+        batch = [f"season/{n}" for n in bulk[i:i + _MAX_APPEND]]
+        try:
+            resp = await _get(f"/tv/{mshow.id}", {"append_to_response": ",".join(batch)})
+        except Exception as e:
+            logger.warning("[TMDB] Bulk season lookup failed for %s: %s", mshow.name, e)
+            continue
+        for section in batch:
+            if resp and resp.get(section):
+                data[int(section.split("/", 1)[1])] = resp[section]
+
+    out: Dict[int, SeasonMeta] = {}
+    for n, stream in samples.items():
+        if n in data:
+            out[n] = _season_from(stream, data[n], n)
+            continue
+        meta = await get_season_meta(stream, mshow)
+        if meta:
+            out[n] = meta
+    return out
+
 async def get_episode_meta(
     stream: DispatcharrStream,
     mshow: TVShow
@@ -365,7 +511,8 @@ async def get_episode_meta(
     ep = stream.episode
 
     try:
-        data = await _get(f"/tv/{show_id}/season/{season}/episode/{ep}", {})
+        data = await _get(f"/tv/{show_id}/season/{season}/episode/{ep}", tmdb_fields.append_params("episode"))
+        data = tmdb_fields.project("episode", data)
         meta = EpisodeMeta(
             id=data.get("id", 0),
             name=data.get("name", ""),
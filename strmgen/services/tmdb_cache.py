@@ -0,0 +1,143 @@
+# strmgen/services/tmdb_cache.py
+"""
+Persistent TMDb response cache backed by the ``tmdb_cache`` table.
+
+Entries expire per endpoint kind (search, season, details). An expired
+entry keeps its ETag, so it can be revalidated with a conditional request
+instead of downloaded again. Cache failures are logged and treated as
+misses; they never fail a lookup.
+"""
+import asyncio
+import logging
+
+from collections import Counter
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+from strmgen.core.config import get_settings
+from strmgen.core.db import (
+    TMDbCacheEntry,
+    get_tmdb_cache_entry,
+    put_tmdb_cache_entry,
+    touch_tmdb_cache_entry,
+    evict_tmdb_cache,
+    tmdb_cache_counts,
+)
+from strmgen.core.metrics import TMDB_CACHE
+
+logger = logging.getLogger(__name__)
+
+# Trim the table to the configured size after this many writes
+_EVICT_EVERY = 1000
+
+_counters: Counter[str] = Counter()
+_stores_since_evict = 0
+_evicting: Optional[asyncio.Task] = None
+
+
+def cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+
+def endpoint_kind(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    if endpoint.startswith("/search/"):
+        return "search"
+    # show details with appended seasons age like seasons
+    if "/season/" in endpoint or "season/" in str((params or {}).get("append_to_response", "")):
+        return "season"
+    return "details"
+
+
+def ttl_seconds(kind: str) -> int:
+    settings = get_settings()
+    hours = {
+        "search": settings.tmdb_cache_search_ttl_hours,
+        "season": settings.tmdb_cache_season_ttl_hours,
+    }.get(kind, settings.tmdb_cache_details_ttl_hours)
+    return int(hours * 3600)
+
+
+def _count(result: str) -> None:
+    _counters[result] += 1
+    TMDB_CACHE.labels(result).inc()
+
+
+async def lookup(key: str) -> Optional[TMDbCacheEntry]:
+    """Cached entry for ``key``; check ``entry["fresh"]`` before trusting it."""
+    if not get_settings().tmdb_cache_enabled:
+        return None
+    try:
+        entry = await get_tmdb_cache_entry(key)
+    except Exception as e:
+        logger.warning("[TMDB] Cache read failed for %s: %s", key, e)
+        _count("error")
+        return None
+    _count("miss" if entry is None else "hit" if entry["fresh"] else "stale")
+    return entry
+
+
+async def store(key: str, kind: str, body: str, etag: Optional[str]) -> None:
+    """Persist a raw JSON response body of the given ``endpoint_kind``."""
+    global _stores_since_evict
+    if not get_settings().tmdb_cache_enabled:
+        return
+    try:
+        await put_tmdb_cache_entry(key, kind, body, etag, ttl_seconds(kind))
+    except Exception as e:
+        logger.warning("[TMDB] Cache write failed for %s: %s", key, e)
+        _count("error")
+        return
+    _count("store")
+    _stores_since_evict += 1
+    if _stores_since_evict >= _EVICT_EVERY:
+        _schedule_evict()
+
+
+async def revalidated(key: str, kind: str) -> None:
+    """TMDb answered 304: keep the cached body for another TTL."""
+    try:
+        await touch_tmdb_cache_entry(key, ttl_seconds(kind))
+    except Exception as e:
+        logger.warning("[TMDB] Cache refresh failed for %s: %s", key, e)
+        _count("error")
+        return
+    _count("revalidated")
+
+
+def _schedule_evict() -> None:
+    global _evicting, _stores_since_evict
+    if _evicting and not _evicting.done():
+        return
+    _stores_since_evict = 0
+    _evicting = asyncio.create_task(evict())
+
+
+async def evict() -> int:
+    """Trim the cache to ``tmdb_cache_max_entries``; returns entries removed."""
+    try:
+        removed = await evict_tmdb_cache(get_settings().tmdb_cache_max_entries)
+    except Exception as e:
+        logger.warning("[TMDB] Cache eviction failed: %s", e)
+        _count("error")
+        return 0
+    if removed:
+        logger.info("[TMDB] Evicted %d cached responses", removed)
+        _counters["evicted"] += removed
+        TMDB_CACHE.labels("evicted").inc(removed)
+    return removed
+
+
+async def stats() -> Dict[str, Any]:
+    """Hit/miss counters since startup plus the table's current contents."""
+    lookups = _counters["hit"] + _counters["stale"] + _counters["miss"]
+    try:
+        entries = await tmdb_cache_counts()
+    except Exception as e:
+        logger.warning("[TMDB] Cache stats unavailable: %s", e)
+        entries = {}
+    return {
+        "enabled":  get_settings().tmdb_cache_enabled,
+        "hit_rate": round(_counters["hit"] / lookups, 4) if lookups else None,
+        "counters": {k: _counters[k] for k in ("hit", "stale", "miss", "revalidated", "store", "evicted", "error")},
+        "entries":  entries,
+    }
@@ -0,0 +1,134 @@
+# strmgen/services/tmdb_fields.py
+"""
+TMDb field projection profiles.
+
+A profile decides which ``append_to_response`` sections are requested and
+which top-level fields survive on ``Movie``, ``TVShow``, ``SeasonMeta`` and
+``EpisodeMeta`` (including their ``raw`` dicts):
+
+* ``full``        – every section the pipeline has ever requested; nothing dropped
+* ``nfo-minimal`` – only the sections matching needs (movie ``alternative_titles``);
+  only the fields the models and NFO templates read
+* ``custom``      – ``nfo-minimal`` plus the names in ``tmdb_custom_fields``;
+  a name is requested as a section when TMDb offers one by that name,
+  otherwise kept as a plain field
+
+Projection copies; responses shared through the request cache are never
+modified.
+"""
+import logging
+
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from strmgen.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PROFILES = ("nfo-minimal", "full", "custom")
+
+# append_to_response sections available per kind, and those ``full`` asks for
+SECTIONS: Dict[str, Tuple[str, ...]] = {
+    "movie": (
+        "alternative_titles", "changes", "credits", "external_ids",
+        "images", "keywords", "lists", "recommendations",
+        "release_dates", "reviews", "similar", "translations",
+        "videos", "watch/providers",
+    ),
+    "tv": (
+        "aggregate_credits", "alternative_titles", "content_ratings", "credits",
+        "external_ids", "images", "keywords", "recommendations",
+        "similar", "translations", "videos", "watch/providers",
+    ),
+    "season": ("aggregate_credits", "credits", "external_ids", "images", "translations", "videos"),
+    "episode": ("credits", "external_ids", "images", "translations", "videos"),
+}
+_FULL_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    "movie": SECTIONS["movie"],
+    "tv": ("credits",),
+    "season": (),
+    "episode": (),
+}
+# sections every profile asks for: movie matching scores alternative titles
+_MATCH_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    "movie": ("alternative_titles",),
+    "tv": (),
+    "season": (),
+    "episode": (),
+}
+
+# fields the models and NFO templates in strmgen.core.utils read
+_NFO_FIELDS: Dict[str, FrozenSet[str]] = {
+    "movie": frozenset({
+        "id", "title", "original_title", "overview", "poster_path", "backdrop_path",
+        "release_date", "adult", "original_language", "genres", "popularity", "video",
+        "vote_average", "vote_count",
+        "runtime", "production_companies", "production_countries", "status",
+    }),
+    "tv": frozenset({
+        "id", "name", "original_name", "overview", "poster_path", "backdrop_path",
+        "media_type", "adult", "original_language", "genres", "popularity",
+        "first_air_date", "vote_average", "vote_count", "origin_country", "external_ids",
+        "status", "networks",
+    }),
+    "season": frozenset({
+        "id", "name", "overview", "air_date", "episodes", "poster_path",
+        "season_number", "vote_average",
+    }),
+    "episode": frozenset({
+        "id", "name", "overview", "air_date", "episode_number", "production_code",
+        "runtime", "season_number", "still_path", "vote_average", "vote_count",
+    }),
+}
+
+_warned_profiles: set = set()
+
+
+def _profile() -> str:
+    profile = get_settings().tmdb_field_profile or "full"
+    if profile not in PROFILES:
+        if profile not in _warned_profiles:
+            _warned_profiles.add(profile)
+            logger.warning("[TMDB] Unknown field profile %r; using 'full'", profile)
+        return "full"
+    return profile
+
+
+def _custom() -> FrozenSet[str]:
+    return frozenset(get_settings().tmdb_custom_fields or ())
+
+
+def append_sections(kind: str) -> Tuple[str, ...]:
+    """Sections to pass as ``append_to_response`` for ``kind``."""
+    profile = _profile()
+    if profile == "full":
+        return _FULL_SECTIONS[kind]
+    if profile == "custom":
+        custom = _custom()
+        return tuple(s for s in SECTIONS[kind] if s in custom or s in _MATCH_SECTIONS[kind])
+    return _MATCH_SECTIONS[kind]
+
+
+def append_params(kind: str) -> Dict[str, str]:
+    sections = append_sections(kind)
+    return {"append_to_response": ",".join(sections)} if sections else {}
+
+
+def kept_fields(kind: str) -> Optional[FrozenSet[str]]:
+    """Top-level fields kept for ``kind``; None keeps everything."""
+    profile = _profile()
+    if profile == "full":
+        return None
+    if profile == "custom":
+        return _NFO_FIELDS[kind] | _custom()
+    return _NFO_FIELDS[kind]
+
+
+def project(kind: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of ``data`` reduced to the profile's fields (``data`` itself for ``full``)."""
+    keep = kept_fields(kind)
+    if keep is None:
+        return data
+    out = {k: v for k, v in data.items() if k in keep}
+    if kind == "season" and "episodes" in out:
+        out["episodes"] = [project("episode", e) for e in out["episodes"]]
+    return out
@@ -0,0 +1,71 @@
+# strmgen/services/tmdb_not_found.py
+"""
+Negative cache for titles TMDb cannot match, backed by ``tmdb_not_found``.
+
+Entries are keyed by media type, normalized title and year, and expire
+after ``tmdb_not_found_ttl_hours`` (0 disables the cache). Only searches
+that TMDb answered are recorded; a failed request never marks a title as
+missing. Database failures are logged and treated as misses.
+"""
+import logging
+
+from collections import Counter
+from typing import Dict, Optional
+
+from strmgen.core.config import get_settings
+from strmgen.core.db import is_tmdb_not_found, put_tmdb_not_found
+from strmgen.core.metrics import TMDB_NOT_FOUND
+from strmgen.core.string_utils import clean_name
+from strmgen.core.title_match import normalize
+
+logger = logging.getLogger(__name__)
+
+_counters: Counter[str] = Counter()
+
+
+def title_key(title: str) -> str:
+    return normalize(clean_name(title))
+
+
+def _ttl_seconds() -> int:
+    return int(get_settings().tmdb_not_found_ttl_hours * 3600)
+
+
+def _count(result: str) -> None:
+    _counters[result] += 1
+    TMDB_NOT_FOUND.labels(result).inc()
+
+
+async def is_known_missing(media_type: str, title: str, year: Optional[int] = None) -> bool:
+    """True when a recent search for this title found nothing; counts the lookup avoided."""
+    if _ttl_seconds() <= 0 or not title:
+        return False
+    try:
+        missing = await is_tmdb_not_found(media_type, title_key(title), year or 0)
+    except Exception as e:
+        logger.warning("[TMDB] Not-found cache read failed for %r: %s", title, e)
+        _count("error")
+        return False
+    if missing:
+        _count("avoided")
+        logger.info("[TMDB] Skipping %s %r (%s): no match on a recent search", media_type, title, year)
+    return missing
+
+
+async def remember(media_type: str, title: str, year: Optional[int] = None) -> None:
+    """Record that TMDb had no match for this title."""
+    ttl = _ttl_seconds()
+    if ttl <= 0 or not title:
+        return
+    try:
+        await put_tmdb_not_found(media_type, title_key(title), year or 0, title, ttl)
+    except Exception as e:
+        logger.warning("[TMDB] Not-found cache write failed for %r: %s", title, e)
+        _count("error")
+        return
+    _count("recorded")
+
+
+def stats() -> Dict[str, int]:
+    """Lookups avoided and titles recorded since startup."""
+    return {k: _counters[k] for k in ("avoided", "recorded", "error")}
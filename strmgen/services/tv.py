@@ -1,27 +1,30 @@
 # strmgen/services/tv.py
 
 import asyncio
-import shutil
 import logging
 
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Optional, List
-from more_itertools import chunked
+from typing import Dict, Optional, List, Tuple
 
-from strmgen.core.db import mark_skipped, is_skipped, SkippedStream
+from strmgen.core.db import mark_skipped, is_skipped, save_stream_states, SkippedStream
 from strmgen.core.config import get_settings
-from strmgen.services.tmdb import TVShow, fetch_tv_details, get_season_meta, download_if_missing
+from strmgen.services.tmdb import TVShow, get_show_seasons, download_if_missing
+from strmgen.services.show_identity import show_identities
 from strmgen.services.subtitles import download_episode_subtitles
-from strmgen.core.utils import filter_by_threshold, write_tvshow_nfo, write_episode_nfo, safe_remove
-from strmgen.services.streams import fetch_streams
+from strmgen.core.utils import filter_by_threshold, write_tvshow_nfo, render_episode_nfo, materialize, safe_remove, WriteReport
+from strmgen.services.streams import fetch_streams_by_group_name
 from strmgen.core.control import is_running
+from strmgen.core.concurrency import run_fs
+from strmgen.core.manifest import output_manifest
+from strmgen.core.side_tasks import side_tasks
+from strmgen.core.metrics import record_stream
 from strmgen.core.models.dispatcharr import DispatcharrStream
-from strmgen.core.models.tv import SeasonMeta
+from strmgen.core.models.enums import MediaType
+from strmgen.core.models.tv import EpisodeMeta, SeasonMeta
 
 logger = logging.getLogger(__name__)
 TAG = "[TV] 🖼️"
-_skipped: set[str] = set()
 
 # Cached settings at module level (in-memory)
 settings = get_settings()
@@ -48,6 +51,19 @@ async def download_subtitles_if_enabled(
             tmdb_id=tmdb_id or (str(mshow.id) if mshow else None)
         )
 
+def _materialize_season(
+    episodes: List[Tuple[DispatcharrStream, EpisodeMeta]],
+    write_nfo: bool,
+) -> WriteReport:
+    """Render and write every .strm (and NFO) of one season; runs in a worker thread."""
+    files = []
+    for stream, ep_meta in episodes:
+        files.append((ep_meta.strm_path, stream.proxy_url))
+        if write_nfo:
+            files.append((stream.nfo_path, render_episode_nfo(stream, ep_meta)))
+    return materialize(files)
+
+
 async def process_tv(
     streams: List[DispatcharrStream],
     group: str,
@@ -62,140 +78,131 @@ async def process_tv(
     for s in streams:
         shows[s.name][s.season].append(s)
 
-    # 3) Chunk into show‑batches
+    # 3) Bound the shows in progress; upstream concurrency is decided by the
+    #    adaptive budgets in strmgen.core.concurrency
     show_items = list(shows.items())
-    show_batches = list(chunked(show_items, settings.batch_size))
+    sem_show = asyncio.Semaphore(max(1, settings.stream_workers))
 
-    async def run_show_batch(batch_idx: int, batch: List):
+    async def _process_one_show(item):
+        show_name, seasons = item
         if not is_running():
             return
 
-        logger.info(
-            f"{TAG} 🔷 Starting show‑batch {batch_idx}/{len(show_batches)}: "
-            f"{[name for name,_ in batch]}"
-        )
-        sem_show = asyncio.Semaphore(settings.concurrent_requests)
+        async with sem_show:
+            logger.info(f"{TAG} ▶️ Processing show {show_name!r}")
+
+            # a) Resolve the show once per run; other groups reuse it
+            sample = next(iter(next(iter(seasons.values()))))
+            # seasons ride along on the show request unless only show NFOs are refreshed
+            wanted = () if settings.write_nfo and settings.update_tv_series_nfo else seasons.keys()
+            mshow: Optional[TVShow] = await show_identities.resolve(
+                group, show_name, seasons=wanted, retry_missing=reprocess
+            )
+            if not is_running() or not mshow:
+                record_stream("TV", "skipped", sum(len(eps) for eps in seasons.values()))
+                return
 
-        async def _process_one_show(item):
-            show_name, seasons = item
-            if not is_running() or show_name in _skipped:
+            # b) Threshold check
+            passed = await asyncio.to_thread(filter_by_threshold, show_name, mshow)
+            if not is_running():
                 return
+            if not passed:
+                try:
+                    await mark_skipped("TV", group, mshow, sample)
+                    await save_stream_states(
+                        [s for eps in seasons.values() for s in eps], tmdb_id=mshow.id
+                    )
+                    record_stream("TV", "skipped", sum(len(eps) for eps in seasons.values()))
+                    logger.info(f"{TAG} 🚫 Threshold filter failed for: {show_name}")
+                    if await output_manifest.exists(mshow.show_folder):
+                        await run_fs(safe_remove, mshow.show_folder)
+                        logger.info(f"{TAG} ✂️ Removed path: {mshow.show_folder}")
+                except Exception as e:
+                    logger.info(f"{TAG} Exception occurred: {e}")
 
-            async with sem_show:
-                logger.info(f"{TAG} ▶️ Processing show {show_name!r}")
+                return
 
-                # a) Lookup & cache show metadata
-                sample = next(iter(next(iter(seasons.values()))))
-                mshow: Optional[TVShow] = await fetch_tv_details(group, show_name)
-                if not is_running() or not mshow:
-                    _skipped.add(show_name)
+            # c) Write show‑level NFO & artwork
+            if settings.write_nfo:
+                await run_fs(write_tvshow_nfo, sample, mshow)
+                await side_tasks.submit("artwork", download_if_missing, TAG, sample, mshow)
+                if settings.update_tv_series_nfo:
                     return
 
-                # b) Threshold check
-                passed = await asyncio.to_thread(filter_by_threshold, show_name, mshow)
-                if not is_running() or not passed:
-                    try:
-                        await mark_skipped("TV", group, mshow, sample)
-                        _skipped.add(show_name)
-                        await asyncio.to_thread(shutil.rmtree, mshow.show_folder)
-                        logger.info(f"{TAG} 🚫 Threshold filter failed for: {show_name}")
-                        if mshow.show_folder.exists():
-                            await asyncio.to_thread(safe_remove, mshow.show_folder)
-                            logger.info(f"{TAG} ✂️ Removed path: {mshow.show_folder}")
-                    except Exception as e:
-                        logger.info(f"{TAG} Exception occurred: {e}")
-
+            # d) Seasons & episodes
+            logger.info(f"{TAG} 📅 Fetch {len(seasons)} season(s) of {show_name!r}")
+            season_metas = await get_show_seasons(mshow, {n: eps[0] for n, eps in seasons.items()})
+            show_identities.remember_seasons(show_name, season_metas)
+            for season_num, eps in seasons.items():
+                if not is_running():
                     return
-
-                # c) Write show‑level NFO & artwork
-                if settings.write_nfo:
-                    await asyncio.to_thread(write_tvshow_nfo, sample, mshow)
-                    asyncio.create_task(download_if_missing(TAG, sample, mshow))
-                    if settings.update_tv_series_nfo:
-                        return
-
-                # d) Seasons & episode batches
-                for season_num, eps in seasons.items():
-                    if not is_running():
-                        return
-                    logger.info(
-                        f"{TAG} 📅 Fetch season {show_name!r} "
-                        f"S{season_num:02d} ({len(eps)} eps)"
-                    )
-                    season_meta: Optional[SeasonMeta] = await get_season_meta(eps[0], mshow)
-                    if not is_running() or not season_meta:
-                        logger.warning(f"{TAG} ❌ No metadata for {show_name!r} S{season_num:02d}")
+                season_meta: Optional[SeasonMeta] = season_metas.get(season_num)
+                if not is_running() or not season_meta:
+                    logger.warning(f"{TAG} ❌ No metadata for {show_name!r} S{season_num:02d}")
+                    continue
+
+                await side_tasks.submit("artwork", download_if_missing, TAG, eps[0], season_meta)
+
+                # e) Pick the episodes to write
+                async def _episode(stream: DispatcharrStream) -> Optional[Tuple[DispatcharrStream, EpisodeMeta]]:
+                    if not reprocess and await is_skipped(stream.stream_type.name, stream.id):
+                        record_stream(stream.stream_type.name, "skipped")
+                        return None
+                    ep_meta = season_meta.episode_map.get(stream.episode)  # type: ignore
+                    if not ep_meta:
+                        record_stream(stream.stream_type.name, "skipped")
+                        return None
+                    return stream, ep_meta
+
+                picked = [e for e in await asyncio.gather(*(_episode(s) for s in eps)) if e]
+                if not is_running() or not picked:
+                    continue
+
+                # f) Write the season's .strm and NFO files in one worker-thread job
+                logger.info(
+                    f"{TAG} 🔸 Writing {len(picked)} episodes "
+                    f"for {show_name!r} S{season_num:02d}"
+                )
+                report = await run_fs(_materialize_season, picked, bool(settings.write_nfo))
+                logger.info(
+                    f"{TAG} 💾 {show_name!r} S{season_num:02d}: {report.written} files written "
+                    f"({report.bytes} bytes), {report.unchanged} unchanged, {len(report.failed)} failed"
+                )
+                written = [s for s, ep in picked if ep.strm_path not in report.failed]
+                failed = len(picked) - len(written)
+                if failed:
+                    record_stream("TV", "failed", failed)
+                # the show folder is kept by orphan cleanup in runs that skip the show
+                await save_stream_states(
+                    written, tmdb_id=mshow.id, artifacts={"show_folder": mshow.show_folder.name}
+                )
+                record_stream("TV", "processed", len(written))
+
+                # g) Per-episode artwork & subtitles
+                for stream, ep_meta in picked:
+                    if ep_meta.strm_path in report.failed:
                         continue
-
-                    asyncio.create_task(download_if_missing(TAG, eps[0], season_meta))
-
-                    ep_batches = list(chunked(eps, settings.batch_size))
-                    for ep_idx, ep_batch in enumerate(ep_batches, start=1):
-                        if not is_running():
-                            return
-                        logger.info(
-                            f"{TAG} 🔸 Episode batch {ep_idx}/{len(ep_batches)} "
-                            f"for {show_name!r} S{season_num:02d}"
+                    if settings.write_nfo and ep_meta.still_path:
+                        await side_tasks.submit("artwork", download_if_missing, TAG, stream, ep_meta)
+                    if settings.opensubtitles_download:
+                        await side_tasks.submit(
+                            "subtitles",
+                            download_subtitles_if_enabled,
+                            show_name,
+                            season_num,
+                            stream.episode,
+                            season_meta.season_folder,
+                            mshow,
                         )
-                        sem_ep = asyncio.Semaphore(settings.concurrent_requests)
-
-                        async def _process_one_ep(stream: DispatcharrStream):
-                            if not is_running():
-                                return
-                            async with sem_ep:
-                                if not is_running():
-                                    return
-                                if not reprocess and await is_skipped(stream.stream_type.name, stream.id):
-                                    _skipped.add(stream.name)
-                                    return
-
-                                # write .strm
-                                ep_meta = season_meta.episode_map.get(stream.episode)  # type: ignore
-                                if not ep_meta:
-                                    return
-                                ep_meta.strm_path.parent.mkdir(parents=True, exist_ok=True)
-                                ep_meta.strm_path.write_text(stream.proxy_url, encoding="utf-8")
-
-                                # per‑episode NFO & artwork
-                                if settings.write_nfo:
-                                    await asyncio.to_thread(write_episode_nfo, stream, ep_meta)
-                                    if ep_meta.still_path:
-                                        asyncio.create_task(
-                                            download_if_missing(TAG, stream, ep_meta)
-                                        )
-
-                                # subtitles
-                                await download_subtitles_if_enabled(
-                                    show_name,
-                                    season_num,
-                                    stream.episode,
-                                    season_meta.season_folder,
-                                    mshow,
-                                )
-
-                        await asyncio.gather(*(_process_one_ep(s) for s in ep_batch))
-                        if not is_running():
-                            return
-                        await asyncio.sleep(settings.batch_delay_seconds)
-
-                logger.info(f"{TAG} ✅ Finished show {show_name!r}")
-
-        # launch this batch of shows
-        await asyncio.gather(*(_process_one_show(item) for item in batch))
-        if not is_running():
-            return
-        await asyncio.sleep(settings.batch_delay_seconds)
 
-    # 4) Kick off all show‑batches in parallel
-    await asyncio.gather(*(
-        run_show_batch(idx, batch)
-        for idx, batch in enumerate(show_batches, start=1)
-    ))
+            logger.info(f"{TAG} ✅ Finished show {show_name!r}")
+
+    await asyncio.gather(*(_process_one_show(item) for item in show_items))
 
 
 async def reprocess_tv(skipped: SkippedStream) -> bool:
     try:
-        streams = await fetch_streams(skipped["group"], skipped["stream_type"])
+        streams = await fetch_streams_by_group_name(skipped["group"], MediaType.TV)
         if not is_running() or not streams:
             logger.error("Cannot reprocess TV %s: no streams", skipped["name"])
             return False
@@ -1,22 +1,22 @@
 const API_BASE = "/api/v1/settings";
 const boolFields = [
-  'skip_stream_check', 'only_updated_streams', 'update_stream_link',
-  'clean_output_dir', 'process_movies_groups', 'process_tv_series_groups',
+  'skip_stream_check', 'only_updated_streams', 'incremental_runs', 'output_manifest_enabled', 'update_stream_link',
+  'clean_output_dir', 'clean_output_dry_run', 'process_movies_groups', 'process_tv_series_groups',
   'process_groups_24_7', 'tmdb_download_images', 'tmdb_create_not_found',
-  'check_tmdb_thresholds', 'write_nfo', 'write_nfo_only_if_not_exists',
+  'check_tmdb_thresholds', 'tmdb_movie_two_phase_match', 'tmdb_cache_enabled', 'write_nfo', 'write_nfo_only_if_not_exists',
   'update_tv_series_nfo', 'opensubtitles_download', 'enable_scheduled_task'
 ];
 
 const numberFields = [
-  'last_modified_days', 'batch_size', 'batch_delay_seconds',
-  'concurrent_requests', 'tmdb_rate_limit', 'minimum_year',
+  'last_modified_days', 'stream_workers', 'adaptive_latency_target_ms',
+  'tmdb_max_concurrency', 'tmdb_rate_limit', 'tmdb_image_max_concurrency', 'minimum_year',
   'minimum_tmdb_rating', 'minimum_tmdb_votes',
-  'minimum_tmdb_popularity', 'scheduled_hour', 'scheduled_minute'
+  'minimum_tmdb_popularity', 'tmdb_movie_match_top_k', 'tmdb_cache_max_entries', 'tmdb_not_found_ttl_hours', 'scheduled_hour', 'scheduled_minute'
 ];
 
 const arrayFields = [
   'movies_groups_raw', 'tv_series_groups_raw',
-  'groups_24_7_raw', 'remove_strings_raw'
+  'groups_24_7_raw', 'remove_strings_raw', 'tmdb_custom_fields_raw'
 ];
 
 function setVal(id, val) {
@@ -47,7 +47,7 @@ function populateForm(cfg) {
   [
     'api_base', 'token_url', 'access', 'refresh', 'username', 'password',
     'stream_base_url', 'output_root', 'movie_year_regex', 'tv_series_episode_regex',
-    'tmdb_api_key', 'tmdb_language', 'tmdb_image_size',
+    'tmdb_api_key', 'tmdb_language', 'tmdb_image_size', 'artwork_store_dir', 'tmdb_field_profile',
     'opensubtitles_app_name', 'opensubtitles_api_key',
     'opensubtitles_username', 'opensubtitles_password',
     'emby_api_url', 'emby_api_key', 'emby_movie_library_id'